@@ -0,0 +1,45 @@
+"""
+Create or audit the indexes SuggestionsMongoManager relies on.
+
+python indexes.py           Create any missing indexes
+python indexes.py --audit   Run explain() over every registered query shape
+"""
+
+import argparse
+import asyncio
+import logging
+
+from suggestions import constants
+from suggestions.database import SuggestionsMongoManager, IndexAudit
+
+logging.basicConfig(level=logging.INFO)
+
+
+async def main(audit: bool):
+    database = SuggestionsMongoManager(constants.MONGO_URL)
+    if not audit:
+        await database.ensure_indexes()
+        print("Ensured all required indexes exist")
+        return
+
+    results: list[IndexAudit] = await database.audit_indexes()
+    for result in results:
+        status = "COLLSCAN" if result.uses_collection_scan else "OK"
+        print(
+            "{:<9}| {:<20}| {:<35}| {}".format(
+                status,
+                result.query.collection,
+                result.query.description,
+                " <- ".join(result.winning_stages),
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--audit",
+        action="store_true",
+        help="Report which query shapes perform collection scans",
+    )
+    asyncio.run(main(parser.parse_args().audit))
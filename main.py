@@ -11,6 +11,9 @@ from suggestions import constants
 
 load_dotenv()
 
+if constants.IS_SUPERVISED_WORKER:
+    constants.load_handed_secrets()
+
 constants.configure_otel()
 logging.basicConfig(
     level=logging.INFO,
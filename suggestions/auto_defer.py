@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+from typing import AsyncIterator, Optional
+
+import commons
+import disnake
+
+from suggestions import constants
+from suggestions.low_level import acknowledge, guard_response
+from suggestions.interaction_metrics import (
+    interaction_age,
+    record_acknowledged,
+    current_interaction,
+)
+
+log = logging.getLogger(__name__)
+
+# Defer on the commands behalf once an interaction is this old
+AUTO_DEFER_AFTER: float = float(os.environ.get("INTERACTION_AUTO_DEFER_AFTER", 2))
+
+auto_defer_counter = constants.METER.create_counter(
+    "suggestions.interaction.auto_deferred",
+    description="Interactions deferred by the dispatcher rather than the command",
+)
+
+# Keys a command can set in its extras to change how the dispatcher
+# defers it. Commands which respond publicly set AUTO_DEFER_EPHEMERAL
+# to False, those which may need to send a response other than a
+# message, such as the premium required response, set AUTO_DEFER
+# to False so the interaction is left alone for them
+AUTO_DEFER = "auto_defer"
+AUTO_DEFER_EPHEMERAL = "auto_defer_ephemeral"
+
+
+async def defer(
+    interaction: disnake.Interaction,
+    *,
+    ephemeral: bool = False,
+    with_message: bool = False,
+) -> bool:
+    """Defer an interaction unless it has already been acknowledged.
+
+    Commands, the auto defer and responses sent while the
+    dispatcher is handling an interaction all share a lock, so
+    whichever gets in second waits on the first rather than
+    Discord rejecting a second acknowledgement.
+
+    Returns
+    -------
+    bool
+        True if this call deferred the interaction
+    """
+    deferred = await acknowledge(
+        interaction,
+        lambda: interaction.response.defer(
+            ephemeral=ephemeral, with_message=with_message
+        ),
+    )
+    if not deferred:
+        return False
+
+    record_acknowledged(interaction)
+    return True
+
+
+def _command_extras(interaction: disnake.Interaction) -> dict:
+    command = getattr(interaction, "application_command", None)
+    if command is None:
+        return {}
+
+    # Sub commands and groups override whatever their parent set
+    extras = dict(command.extras)
+    chain, _ = interaction.data._get_chain_and_kwargs()
+    for name in chain:
+        command = getattr(command, "children", {}).get(name)
+        if command is None:
+            break
+
+        extras.update(command.extras)
+
+    return extras
+
+
+def auto_defer_options(interaction: disnake.Interaction) -> Optional[dict[str, bool]]:
+    """How the dispatcher should defer this interaction, None if it shouldn't.
+
+    Application commands are deferred ephemerally unless
+    their extras say otherwise.
+    """
+    extras = _command_extras(interaction)
+    if not extras.get(AUTO_DEFER, True):
+        return None
+
+    return {"ephemeral": extras.get(AUTO_DEFER_EPHEMERAL, True), "with_message": True}
+
+
+@contextlib.asynccontextmanager
+async def auto_defer(
+    interaction: disnake.Interaction, *, after: float = AUTO_DEFER_AFTER
+) -> AsyncIterator[None]:
+    """Defer the interaction if it's still unacknowledged after ``after`` seconds.
+
+    This runs alongside command checks and the command itself,
+    so slow database calls made before a command gets around
+    to deferring don't fail the interaction.
+    """
+    guard_response(interaction)
+
+    async def defer_when_late():
+        await asyncio.sleep(max(0.0, after - interaction_age(interaction)))
+        # Looked up now as the command is only resolved once dispatched
+        options = auto_defer_options(interaction)
+        if options is None:
+            return
+
+        try:
+            deferred = await defer(interaction, **options)
+        except disnake.HTTPException as e:
+            log.warning(
+                "Failed to auto defer an interaction",
+                extra={
+                    "interaction.guild.id": interaction.guild_id,
+                    "error.traceback": commons.exception_as_string(e),
+                },
+            )
+            return
+
+        if deferred:
+            interaction_type, name = current_interaction.get()
+            auto_defer_counter.add(
+                1, {"interaction.type": interaction_type, "interaction.name": name}
+            )
+            log.debug(
+                "Auto deferred %s after %.2fs",
+                name,
+                interaction_age(interaction),
+                extra={"interaction.guild.id": interaction.guild_id},
+            )
+
+    task = asyncio.create_task(defer_when_late())
+    try:
+        yield
+    finally:
+        task.cancel()
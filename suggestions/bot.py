@@ -4,14 +4,14 @@ import asyncio
 import datetime
 import gc
 import io
+import itertools
 import logging
 import math
 import os
 import traceback
-from copy import deepcopy
 from pathlib import Path
 from string import Template
-from typing import Type, Optional, Union, Any
+from typing import Type, Optional, Union, Any, Awaitable, Callable
 
 import aiohttp
 import alaric
@@ -20,7 +20,6 @@ import commons
 import disnake
 import httpx
 import humanize
-import orjson
 from alaric import Cursor
 from cooldowns import CallableOnCooldown
 from disnake import (
@@ -30,12 +29,18 @@ from disnake import (
     ApplicationCommandType,
 )
 from disnake.abc import PrivateChannel, GuildChannel
+from disnake.client import SessionStartLimit
 from disnake.ext import commands, components
+from disnake.gateway import DiscordWebSocket
 from disnake.state import AutoShardedConnectionState
 from opentelemetry.trace import Status, StatusCode
+from redis.commands.core import AsyncScript
 
 from suggestions import State, Colors, Emojis, ErrorCode, constants
+from suggestions.auto_defer import auto_defer
+from suggestions.cluster_registry import CLUSTERS_KEY, ClusterRegistry
 from suggestions.database import SuggestionsMongoManager
+from suggestions.error_recorder import ErrorRecorder
 from suggestions.exceptions import (
     BetaOnly,
     MissingSuggestionsChannel,
@@ -55,16 +60,48 @@ from suggestions.exceptions import (
 )
 from suggestions.http_error_parser import try_parse_http_error
 from suggestions.interaction_handler import InteractionHandler
+from suggestions.interaction_metrics import track_interaction
+from suggestions.invalidation import InvalidationBus
+from suggestions.launch_scheduler import LaunchScheduler
+from suggestions.locale_tracking import LocaleTracker
+from suggestions import low_level
 from suggestions.low_level import PatchedConnectionState
 from suggestions.objects import Error, GuildConfig, UserConfig
+from suggestions.session_store import SessionStore, ShardSession
+from suggestions.shard_coordinator import ShardCoordinator
 from suggestions.stats import Stats, StatsEnum
 from suggestions.utility import bot_lists
 
 log = logging.getLogger(__name__)
 
+# Hash of "<cluster_id>:count" and "<cluster_id>:updated_at"
+# fields, published by each cluster within update_redis
+GUILD_COUNTS_KEY = "bot:guilds:counts"
+# Clusters publish every few minutes, so anything older
+# than this is assumed to belong to a dead cluster
+GUILD_COUNT_STALE_AFTER = datetime.timedelta(minutes=15)
+
+# Clears out a cluster's guild count, unless it has
+# published again since we saw it was stale
+#
+# KEYS[1] - GUILD_COUNTS_KEY
+# ARGV[1] - cluster id
+# ARGV[2] - updated_at as it was seen, empty if it was missing
+CLEAR_STALE_GUILD_COUNT_SCRIPT = """
+local updated_at = redis.call('HGET', KEYS[1], ARGV[1] .. ':updated_at') or ''
+if updated_at ~= ARGV[2] then
+    return 0
+end
+
+return redis.call('HDEL', KEYS[1], ARGV[1] .. ':count', ARGV[1] .. ':updated_at')
+"""
+_clear_stale_guild_count_script: Optional[AsyncScript] = None
+
 
 class SuggestionsBot(commands.AutoShardedInteractionBot):
     def __init__(self, *args, **kwargs):
+        # We reach into disnake internals which may change between releases
+        low_level.ensure_supported_disnake()
         self.version: str = "Public Release 3.31"
         self.main_guild_id: int = 601219766258106399
         self.legacy_beta_role_id: int = 995588041991274547
@@ -93,6 +130,15 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
         self.colors: Type[Colors] = Colors
         self.state: State = State(self.db, self)
         self.stats: Stats = Stats(self)
+        self.locale_tracker: LocaleTracker = LocaleTracker(self)
+        self.error_recorder: ErrorRecorder = ErrorRecorder(self)
+        self.invalidation_bus: InvalidationBus = InvalidationBus(self)
+        self.cluster_registry: ClusterRegistry = ClusterRegistry(self)
+        self.session_store: SessionStore = SessionStore(self)
+        self.launch_scheduler: LaunchScheduler = LaunchScheduler(self)
+        # Guild ids known to Redis, read at most once per launch
+        # however many of the shards being launched resume
+        self._known_guild_ids: Optional[asyncio.Task[set[int]]] = None
         self.suggestion_emojis: Emojis = Emojis(self)
         self.old_prefixed_commands: set[str] = {
             "changelog",
@@ -113,6 +159,10 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
 
         # Sharding info
         self.cluster_id: int = kwargs.pop("cluster", 0)
+        # Set when shards are assigned through leases rather than statically
+        self.shard_coordinator: Optional[ShardCoordinator] = kwargs.pop(
+            "shard_coordinator", None
+        )
         self.total_shards: int = kwargs.get("shard_count", 0)
 
         super().__init__(
@@ -148,31 +198,248 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
     async def get_accurate_guild_count() -> int:
         """Returns a count of how many guilds are present.
 
-        Notes
-        -----
-        While this doesnt block Redis, it takes
-        awhile to return results. 15-45 seconds it seems.
+        Sums the guild counts each cluster publishes to
+        GUILD_COUNTS_KEY, ignoring and clearing out any
+        cluster which hasn't published recently.
         """
+        counts: dict[bytes, bytes] = await constants.REDIS_CLIENT.hgetall(
+            GUILD_COUNTS_KEY
+        )
+        oldest_allowed: float = (
+            datetime.datetime.now(datetime.timezone.utc) - GUILD_COUNT_STALE_AFTER
+        ).timestamp()
+
         total_guilds: int = 0
-        async for _ in constants.REDIS_CLIENT.scan_iter(
-            "bot:guilds:is_in:*", count=1000
-        ):
-            total_guilds += 1
+        # cluster id -> the updated_at we saw, empty if there wasn't one
+        stale_clusters: dict[str, bytes] = {}
+        for field, value in counts.items():
+            cluster_id, _, kind = field.decode().rpartition(":")
+            if kind != "count":
+                continue
+
+            updated_at = counts.get(f"{cluster_id}:updated_at".encode())
+            if updated_at is None or float(updated_at) < oldest_allowed:
+                stale_clusters[cluster_id] = updated_at or b""
+                continue
+
+            total_guilds += int(value)
+
+        if stale_clusters:
+            log.warning(
+                "Ignoring stale guild counts from clusters %s",
+                ", ".join(sorted(stale_clusters)),
+            )
+            global _clear_stale_guild_count_script
+            if _clear_stale_guild_count_script is None:
+                _clear_stale_guild_count_script = (
+                    constants.REDIS_CLIENT.register_script(
+                        CLEAR_STALE_GUILD_COUNT_SCRIPT
+                    )
+                )
+
+            # Compared within Redis as the cluster may have
+            # published again since we read its count
+            async with constants.REDIS_CLIENT.pipeline(transaction=False) as pipe:
+                for cluster_id, updated_at in stale_clusters.items():
+                    await _clear_stale_guild_count_script(
+                        keys=[GUILD_COUNTS_KEY],
+                        args=[cluster_id, updated_at],
+                        client=pipe,
+                    )
+
+                await pipe.execute()
 
         return total_guilds
 
+    async def launch_shards(self, *, ignore_session_start_limit: bool = False) -> None:
+        # Mirrors AutoShardedClient.launch_shards, except shards
+        # are launched in parallel as max_concurrency allows
+        shard_count, gateway, session_start_limit = await self.http.get_bot_gateway(
+            encoding=self.gateway_params.encoding,
+            zlib=self.gateway_params.zlib,
+        )
+        self.session_start_limit = SessionStartLimit(session_start_limit)
+        if self.shard_count is None:
+            self.shard_count = shard_count
+
+        self._connection.shard_count = self.shard_count
+        shard_ids = (
+            self.shard_ids
+            if self.shard_ids is not None
+            else list(range(self.shard_count))
+        )
+        self._connection.shard_ids = shard_ids
+
+        if (
+            not ignore_session_start_limit
+            and self.session_start_limit.remaining < self.shard_count
+        ):
+            raise disnake.SessionStartLimitReached(
+                self.session_start_limit, requested=self.shard_count
+            )
+
+        await self._launch(
+            gateway,
+            shard_ids,
+            max_concurrency=self.session_start_limit.max_concurrency,
+        )
+        self._connection.shards_launched.set()
+        if not shard_ids:
+            # A standby cluster, with no READY to kick off the ready sequence.
+            # It still becomes ready so it heartbeats and can pick up shards
+            low_level.start_ready_sequence(self._connection)
+
+    async def _launch(self, gateway: str, shard_ids: list[int], **kwargs: Any) -> None:
+        try:
+            await self.launch_scheduler.launch(gateway, shard_ids, **kwargs)
+        finally:
+            # The next launch could be much later, so reads them again
+            self._known_guild_ids = None
+
     async def launch_shard(
         self, _gateway: str, shard_id: int, *, initial: bool = False
     ) -> None:
         # Use the proxy if set, else fall back to whatever is default
         proxy: Optional[str] = os.environ.get("GW_PROXY", _gateway)
+        session = await self.session_store.claim(shard_id)
+        if session is not None and await self._resume_shard(
+            os.environ.get("GW_PROXY", session.resume_gateway), shard_id, session
+        ):
+            return
+
         return await super().launch_shard(proxy, shard_id, initial=initial)
 
+    async def _resume_shard(
+        self, gateway: str, shard_id: int, session: ShardSession
+    ) -> bool:
+        """Attempt to RESUME a session from a previous run.
+
+        Mirrors AutoShardedClient.launch_shard but resumes
+        instead of identifying. If Discord then rejects the
+        session the shard identifies as it normally would.
+
+        Returns
+        -------
+        bool
+            False if we couldn't connect and should identify instead
+        """
+        self.session_store.attempting_resume(shard_id)
+        try:
+            ws = await asyncio.wait_for(
+                DiscordWebSocket.from_client(
+                    self,
+                    gateway=gateway,
+                    shard_id=shard_id,
+                    session=session.session_id,
+                    sequence=session.sequence,
+                    resume=True,
+                ),
+                timeout=180.0,
+            )
+        except Exception as e:
+            self.session_store.resume_failed(shard_id)
+            log.warning(
+                "Failed to resume shard %s, identifying instead",
+                shard_id,
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
+            return False
+
+        # Resumed shards don't get GUILD_CREATE's replayed. The shard
+        # may have previously been run by any cluster so check them all
+        if self._known_guild_ids is None:
+            self._known_guild_ids = asyncio.create_task(self.fetch_known_guild_ids())
+
+        known_guild_ids = self._known_guild_ids
+        try:
+            guild_ids = await asyncio.shield(known_guild_ids)
+        except Exception:
+            # Let the next shard to resume try again
+            if self._known_guild_ids is known_guild_ids:
+                self._known_guild_ids = None
+
+            raise
+
+        self.guild_ids.update(
+            guild_id
+            for guild_id in guild_ids
+            if self.get_shard_id(guild_id) == shard_id
+        )
+
+        low_level.run_shard(self, shard_id, ws)
+        # READY is what usually kicks off the ready sequence, which
+        # we won't get when resuming so start it ourselves instead
+        low_level.start_ready_sequence(self._connection)
+
+        return True
+
+    @staticmethod
+    async def fetch_known_guild_ids() -> set[int]:
+        """Every guild id any cluster has published to Redis."""
+        async with constants.REDIS_CLIENT.pipeline(transaction=False) as pipe:
+            pipe.hkeys(GUILD_COUNTS_KEY)
+            pipe.hkeys(CLUSTERS_KEY)
+            count_fields, registered_clusters = await pipe.execute()
+
+        cluster_ids: set[str] = {
+            field.decode().rpartition(":")[0] for field in count_fields
+        }
+        cluster_ids.update(field.decode() for field in registered_clusters)
+        if not cluster_ids:
+            return set()
+
+        return {
+            int(guild_id)
+            for guild_id in await constants.REDIS_CLIENT.sunion(
+                [
+                    SuggestionsBot.guilds_key_for(cluster_id)
+                    for cluster_id in cluster_ids
+                ]
+            )
+        }
+
+    async def add_shards(self, shard_ids: list[int]) -> None:
+        """Start running more shards on this cluster."""
+        gateway: Optional[str] = os.environ.get("GW_PROXY")
+        if gateway is None:
+            gateway = await self.http.get_gateway(
+                encoding=self.gateway_params.encoding, zlib=self.gateway_params.zlib
+            )
+
+        for shard_id in shard_ids:
+            if shard_id not in self.shard_ids:
+                self.shard_ids.append(shard_id)
+
+        self.shard_ids.sort()
+        await self._launch(gateway, shard_ids)
+        log.info("Now running shards %s", self.shard_ids)
+
+    async def drop_shards(self, shard_ids: list[int]) -> None:
+        """Stop running these shards, leaving their sessions resumable."""
+        await self.session_store.close_resumable(shard_ids)
+        for shard_id in shard_ids:
+            low_level.forget_shard(self, shard_id)
+            if shard_id in self.shard_ids:
+                self.shard_ids.remove(shard_id)
+
+        dropped = set(shard_ids)
+        self.guild_ids.difference_update(
+            [
+                guild_id
+                for guild_id in self.guild_ids
+                if self.get_shard_id(guild_id) in dropped
+            ]
+        )
+        log.info("Now running shards %s", self.shard_ids)
+
     async def before_identify_hook(
-        self, _shard_id: int | None, *, initial: bool = False  # noqa: ARG002
+        self, shard_id: int | None, *, initial: bool = False  # noqa: ARG002
     ) -> None:
-        # gateway-proxy
-        return
+        if shard_id is None or os.environ.get("GW_PROXY") is not None:
+            # gateway-proxy does the real identifies so handles the limits itself
+            return
+
+        await self.launch_scheduler.acquire_identify_slot(shard_id)
 
     async def get_or_fetch_channel(
         self, channel_id: int
@@ -180,7 +447,7 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
         try:
             channel = self.get_channel(channel_id)
             if channel is None:
-                channel = await self.fetch_channel(channel_id)
+                channel = await self.state.fetch_channel(channel_id)
 
             return channel
         except disnake.NotFound as e:
@@ -196,7 +463,6 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
         log.info("Startup took: %s", self.get_uptime())
         print("Suggestions main: Ready")
         print(f"Startup took: {self.get_uptime()}")
-        await self.suggestion_emojis.populate_emojis()
 
     @property
     def uptime(self) -> datetime.datetime:
@@ -280,7 +546,16 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
         self,
         error: Exception,
         interaction: disnake.ApplicationCommandInteraction | disnake.MessageInteraction,
+        *,
+        has_been_fixed: bool = False,
+        formatted_traceback: Optional[str] = None,
     ) -> Error:
+        """Record an error, returning it so its id can be shown to the user.
+
+        The error id is written before returning, the traceback is
+        written in the background by the error recorder.
+        Pass formatted_traceback if the caller has already formatted it.
+        """
         if isinstance(interaction, disnake.MessageInteraction):
             cmd_name = interaction.data.custom_id
         else:
@@ -288,7 +563,11 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
 
         error = Error(
             _id=self.state.get_new_error_id(),
-            traceback="".join(traceback.format_exception(error)),
+            traceback=(
+                formatted_traceback
+                if formatted_traceback is not None
+                else "".join(traceback.format_exception(error))
+            ),
             error=error.__class__.__name__,
             cluster_id=self.cluster_id,
             shard_id=self.get_shard_id(interaction.guild_id),
@@ -296,8 +575,9 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
             created_at=self.state.now,
             guild_id=interaction.guild_id,
             user_id=interaction.author.id,
+            has_been_fixed=has_been_fixed,
         )
-        await self.db.error_tracking.insert(error)
+        await self.error_recorder.record(error)
         return error
 
     async def on_user_command_error(self, interaction, exception) -> None:
@@ -317,7 +597,14 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
 
         with constants.TRACER.start_as_current_span("error handler") as child:
             await self._push_slash_error_stats(interaction)
-            error: Error = await self.persist_error(exception, interaction)
+            attempt_code: Optional[ErrorCode] = try_parse_http_error(exception)
+            # Errors we can map to a code are considered handled
+            error: Error = await self.persist_error(
+                exception,
+                interaction,
+                has_been_fixed=attempt_code is not None,
+                formatted_traceback="".join(traceback.format_exception(exception)),
+            )
             child.set_attribute("error.id", error.id)
             child.set_attribute("error.name", error.error)
 
@@ -358,7 +645,7 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
                         "error.id": error.id,
                         "interaction.author.id": error.user_id,
                         "interaction.guild.id": error.guild_id,
-                        "error.traceback": commons.exception_as_string(exception),
+                        "error.traceback": error.traceback,
                         "error.code": ErrorCode.UNHANDLED_ERROR.value,
                     },
                 )
@@ -372,13 +659,6 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
                     ephemeral=True,
                 )
 
-            attempt_code: Optional[ErrorCode] = try_parse_http_error(
-                "".join(traceback.format_exception(exception))
-            )
-            if attempt_code:
-                error.has_been_fixed = True
-                await self.db.error_tracking.update(error, error)
-
             if (
                 attempt_code
                 == ErrorCode.MISSING_FETCH_PERMISSIONS_IN_SUGGESTIONS_CHANNEL
@@ -953,8 +1233,16 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
 
     async def load(self):
         self.i18n.load(Path("suggestions/locales"))
+        await self.db.ensure_indexes()
         await self.state.load()
         await self.stats.load()
+        await self.locale_tracker.load()
+        await self.error_recorder.load()
+        await self.invalidation_bus.load()
+        await self.cluster_registry.load()
+        await self.session_store.load()
+        await self.launch_scheduler.load()
+        await self.suggestion_emojis.load()
         await self.update_bot_listings()
         await self.update_redis()
         await self.load_cogs()
@@ -966,11 +1254,45 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
         """
         log.debug("Attempting to shutdown")
         self.state.notify_shutdown()
-        await asyncio.gather(*self.state.background_tasks)
-        # TODO Re-enable premium features at later date
-        # await self.redis.aclose()
-        log.info("Shutting down")
-        await self.close()
+        await asyncio.gather(*self.state.background_tasks, return_exceptions=True)
+        try:
+            # Anything logged after the background tasks exited
+            await self._shutdown_step(
+                "flush member stats", self.stats.flush_member_stats
+            )
+            await self._shutdown_step(
+                "flush locale tracking", self.locale_tracker.flush
+            )
+            await self._shutdown_step("flush errors", self.error_recorder.flush)
+            await self._shutdown_step(
+                "deregister this cluster", self.cluster_registry.deregister
+            )
+            # TODO Re-enable premium features at later date
+            # await self.redis.aclose()
+            log.info("Shutting down")
+            await self._shutdown_step(
+                "save shard sessions", self.session_store.close_resumable
+            )
+            if self.shard_coordinator is not None:
+                await self._shutdown_step(
+                    "release shard leases", self.shard_coordinator.release_all
+                )
+        finally:
+            await self.close()
+
+    @staticmethod
+    async def _shutdown_step(
+        description: str, step: Callable[[], Awaitable[Any]]
+    ) -> None:
+        # One step failing shouldn't stop the rest from running
+        try:
+            await step()
+        except Exception as e:
+            log.error(
+                "Failed to %s while shutting down",
+                description,
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
 
     async def update_bot_listings(self) -> None:
         """Updates the bot lists with current stats."""
@@ -1023,35 +1345,89 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
         state.add_background_task(task_1)
         log.info("Setup bot list updates")
 
+    @property
+    def redis_guilds_key(self) -> str:
+        """The Redis set holding the guild ids this cluster is in."""
+        return self.guilds_key_for(self.cluster_id)
+
+    @staticmethod
+    def guilds_key_for(cluster_id: Union[int, str]) -> str:
+        return f"bot:guilds:cluster:{cluster_id}"
+
+    async def sync_guilds(
+        self, synced_guild_ids: set[int], *, reconcile: bool = False
+    ) -> set[int]:
+        """Bring this cluster's guild set in Redis up to date.
+
+        Only guilds added or removed since ``synced_guild_ids``
+        are sent, unless reconciling which rewrites the set in
+        case it drifted or expired out from under us.
+
+        Returns
+        -------
+        set[int]
+            The guild ids now in Redis
+        """
+        # This is set to 15 minutes to handle
+        # bot restarts and the fact thats about how
+        # long it takes to get the bot running and repopulate redis
+        #
+        # We also don't mind if edits occur in a short period
+        # after the bot leaves as thats basically a noop
+        time_to_cache = datetime.timedelta(minutes=15)
+        key = self.redis_guilds_key
+        local_guild_ids = set(self.guild_ids)
+        async with constants.REDIS_CLIENT.pipeline(transaction=True) as pipe:
+            if reconcile:
+                pipe.delete(key)
+                added, removed = local_guild_ids, set()
+            else:
+                added = local_guild_ids - synced_guild_ids
+                removed = synced_guild_ids - local_guild_ids
+
+            for chunk in itertools.batched(added, 10_000):
+                pipe.sadd(key, *chunk)
+            for chunk in itertools.batched(removed, 10_000):
+                pipe.srem(key, *chunk)
+
+            pipe.expire(key, int(time_to_cache.total_seconds()))
+            pipe.hset(
+                GUILD_COUNTS_KEY,
+                mapping={
+                    f"{self.cluster_id}:count": len(local_guild_ids),
+                    f"{self.cluster_id}:updated_at": self.state.now.timestamp(),
+                },
+            )
+            await pipe.execute()
+
+        log.debug(
+            "Updated redis with current guilds for cluster %s, +%s -%s",
+            self.cluster_id,
+            len(added),
+            len(removed),
+        )
+        return local_guild_ids
+
     async def update_redis(self) -> None:
         """Updates redis with bot specific info such as guilds"""
         state: State = self.state
         time_between_updates: datetime.timedelta = datetime.timedelta(
             minutes=2, seconds=30
         )
+        time_between_reconciles: datetime.timedelta = datetime.timedelta(minutes=30)
 
         async def process_update():
             await self.wait_until_ready()
-
-            # This is set to 15 minutes to handle
-            # bot restarts and the fact thats about how
-            # long it takes to get the bot running and repopulate redis
-            #
-            # We also don't mind if edits occur in a short period
-            # after the bot leaves as thats basically a noop
-            time_to_cache = datetime.timedelta(minutes=15)
+            synced_guild_ids: set[int] = set()
+            next_reconcile: datetime.datetime = state.now
 
             while not state.is_closing:
-                local_guild_ids = deepcopy(self.guild_ids)
-                for guild_id in local_guild_ids:
-                    await constants.REDIS_CLIENT.set(
-                        f"bot:guilds:is_in:{guild_id}",
-                        orjson.dumps(guild_id),
-                        ex=int(time_to_cache.total_seconds()),
-                    )
+                reconcile = state.now >= next_reconcile
+                if reconcile:
+                    next_reconcile = state.now + time_between_reconciles
 
-                log.debug(
-                    "Updated redis with current guilds for cluster %s", self.cluster_id
+                synced_guild_ids = await self.sync_guilds(
+                    synced_guild_ids, reconcile=reconcile
                 )
                 await commons.sleep_with_condition(
                     time_between_updates.total_seconds(),
@@ -1163,13 +1539,7 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
     async def on_application_command(
         self, interaction: disnake.ApplicationCommandInteraction
     ):
-        await self.db.locale_tracking.insert(
-            {
-                "locale": str(interaction.locale),
-                "user_id": interaction.user.id,
-                "interaction.guild.id": interaction.guild_id,
-            }
-        )
+        self.locale_tracker.track(str(interaction.locale), interaction.guild_id)
         trace_name = self.get_qualified_name(interaction)
         with constants.TRACER.start_as_current_span(trace_name) as span:
             span.set_attribute("bot.cluster.id", self.cluster_id)
@@ -1185,10 +1555,10 @@ class SuggestionsBot(commands.AutoShardedInteractionBot):
             if interaction.guild_id:
                 span.set_attribute("interaction.guild.id", interaction.guild_id)
 
-            span.set_attribute(
-                "interaction.command.name", self.get_qualified_name(interaction)
-            )
-            await self.process_application_commands(interaction)
+            span.set_attribute("interaction.command.name", trace_name)
+            with track_interaction(interaction, "application_command", trace_name):
+                async with auto_defer(interaction):
+                    await self.process_application_commands(interaction)
 
     @staticmethod
     def get_qualified_name(inter: disnake.ApplicationCommandInteraction) -> str:
@@ -11,6 +11,7 @@ from opentelemetry.trace import Status, StatusCode
 
 from suggestions.clunk2 import update_suggestion_message
 from suggestions.interaction_handler import InteractionHandler
+from suggestions.interaction_metrics import track_interaction
 from suggestions.objects import Suggestion, QueuedSuggestion
 from suggestions.objects.suggestion import SuggestionState
 from suggestions.utility import wrap_with_error_handler
@@ -78,7 +79,9 @@ async def wrapper(
         )
         if inter.guild_id:
             span.set_attribute("interaction.guild.id", inter.guild_id)
-        yield
+
+        with track_interaction(inter, "component", btn_name):
+            yield
 
 
 @manager.register(identifier="suggestion_up_vote")
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import math
+import resource
+import time
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+import commons
+import orjson
+
+from suggestions import constants
+
+if TYPE_CHECKING:
+    from suggestions import SuggestionsBot
+
+log = logging.getLogger(__name__)
+
+# Hash of cluster_id -> latest heartbeat
+CLUSTERS_KEY = "bot:clusters"
+
+
+def current_rss() -> int:
+    """The resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # Not Linux, fall back to the peak which is in KiB
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ClusterHeartbeat(NamedTuple):
+    cluster_id: int
+    shard_ids: list[int]
+    guild_count: int
+    # shard_id -> latency in seconds, None if not connected
+    shard_latencies: dict[int, Optional[float]]
+    loop_lag: float
+    rss: int
+    interactions_per_second: float
+    updated_at: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since this heartbeat was published."""
+        return time.time() - self.updated_at
+
+    @property
+    def average_latency(self) -> Optional[float]:
+        latencies = [x for x in self.shard_latencies.values() if x is not None]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    def as_json(self) -> bytes:
+        return orjson.dumps(
+            {
+                **self._asdict(),
+                "shard_latencies": {str(k): v for k, v in self.shard_latencies.items()},
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: bytes) -> ClusterHeartbeat:
+        raw = orjson.loads(data)
+        raw["shard_latencies"] = {int(k): v for k, v in raw["shard_latencies"].items()}
+        return cls(**raw)
+
+
+class ClusterRegistry:
+    """Every cluster's latest heartbeat, kept in Redis.
+
+    Each cluster publishes its own heartbeat every
+    ``interval`` and anyone can read all of them back
+    with a single HGETALL. Heartbeats older than
+    ``stale_after`` are considered unhealthy, those older
+    than ``forget_after`` are removed from the registry.
+    """
+
+    def __init__(
+        self,
+        bot: SuggestionsBot,
+        *,
+        interval: datetime.timedelta = datetime.timedelta(seconds=5),
+        stale_after: datetime.timedelta = datetime.timedelta(seconds=30),
+        forget_after: datetime.timedelta = datetime.timedelta(minutes=15),
+    ):
+        self.bot: SuggestionsBot = bot
+        self.interval: datetime.timedelta = interval
+        self.stale_after: datetime.timedelta = stale_after
+        self.forget_after: datetime.timedelta = forget_after
+        self._last_interactions: tuple[float, int] = (time.monotonic(), 0)
+
+    def _total_interactions(self) -> int:
+        gateway_events = self.bot.stats.gateway_events
+        return sum(
+            gateway_events.count(shard_id, "INTERACTION_CREATE")
+            for shard_id in self.bot.shards.keys()
+        )
+
+    async def build_heartbeat(self) -> ClusterHeartbeat:
+        start = time.perf_counter()
+        await asyncio.sleep(0)
+        loop_lag = time.perf_counter() - start
+
+        now = time.monotonic()
+        total_interactions = self._total_interactions()
+        last_time, last_total = self._last_interactions
+        self._last_interactions = (now, total_interactions)
+        elapsed = now - last_time
+
+        return ClusterHeartbeat(
+            cluster_id=self.bot.cluster_id,
+            shard_ids=sorted(self.bot.shards.keys()),
+            guild_count=len(self.bot.guild_ids),
+            shard_latencies={
+                shard_id: latency if math.isfinite(latency) else None
+                for shard_id, latency in self.bot.latencies
+            },
+            loop_lag=loop_lag,
+            rss=current_rss(),
+            interactions_per_second=(
+                (total_interactions - last_total) / elapsed if elapsed > 0 else 0
+            ),
+            updated_at=time.time(),
+        )
+
+    async def publish(self) -> None:
+        heartbeat = await self.build_heartbeat()
+        await constants.REDIS_CLIENT.hset(
+            CLUSTERS_KEY, str(heartbeat.cluster_id), heartbeat.as_json()
+        )
+
+    async def deregister(self) -> None:
+        """Remove this cluster from the registry, used on shutdown."""
+        await constants.REDIS_CLIENT.hdel(CLUSTERS_KEY, str(self.bot.cluster_id))
+
+    async def fetch_clusters(self) -> list[ClusterHeartbeat]:
+        """Every cluster's latest heartbeat, ordered by cluster id.
+
+        This includes stale clusters, check :meth:`is_healthy`.
+        """
+        raw: dict[bytes, bytes] = await constants.REDIS_CLIENT.hgetall(CLUSTERS_KEY)
+        heartbeats: list[ClusterHeartbeat] = []
+        forgotten: list[bytes] = []
+        for field, value in raw.items():
+            heartbeat = ClusterHeartbeat.from_json(value)
+            if heartbeat.age > self.forget_after.total_seconds():
+                forgotten.append(field)
+                continue
+
+            heartbeats.append(heartbeat)
+
+        if forgotten:
+            log.warning(
+                "Removing clusters %s from the registry as they stopped heartbeating",
+                b", ".join(forgotten).decode(),
+            )
+            await constants.REDIS_CLIENT.hdel(CLUSTERS_KEY, *forgotten)
+
+        return sorted(heartbeats, key=lambda h: h.cluster_id)
+
+    def is_healthy(self, heartbeat: ClusterHeartbeat) -> bool:
+        return heartbeat.age <= self.stale_after.total_seconds()
+
+    async def find_cluster_for_guild(
+        self, guild_id: int
+    ) -> tuple[int, Optional[ClusterHeartbeat]]:
+        """Which shard a guild is on, and the cluster currently running it.
+
+        Returns
+        -------
+        tuple[int, Optional[ClusterHeartbeat]]
+            The shard id and the owning cluster, if any
+            cluster currently reports running that shard.
+        """
+        shard_id = self.bot.get_shard_id(guild_id)
+        for heartbeat in await self.fetch_clusters():
+            if shard_id in heartbeat.shard_ids and self.is_healthy(heartbeat):
+                return shard_id, heartbeat
+
+        return shard_id, None
+
+    async def load(self) -> None:
+        self.bot.state.add_background_task(asyncio.create_task(self.push_heartbeats()))
+
+    async def push_heartbeats(self) -> None:
+        await self.bot.wait_until_ready()
+        state = self.bot.state
+        while not state.is_closing:
+            try:
+                await self.publish()
+            except Exception as e:
+                log.error(
+                    "Failed to publish cluster heartbeat",
+                    extra={"error.traceback": commons.exception_as_string(e)},
+                )
+
+            await commons.sleep_with_condition(
+                self.interval.total_seconds(),
+                lambda: state.is_closing,
+                interval=1,
+            )
@@ -7,6 +7,8 @@ import disnake
 from commons.caching import NonExistentEntry
 from disnake.ext import commands
 
+from suggestions.auto_defer import defer
+from suggestions.invalidation import InvalidationEntity
 from suggestions.objects import GuildConfig, Suggestion
 
 if TYPE_CHECKING:
@@ -42,7 +44,7 @@ class BlacklistCog(commands.Cog):
         ----------
         suggestion_id: str {{SUGGESTION_ID}}
         """
-        await interaction.response.defer(ephemeral=True)
+        await defer(interaction, ephemeral=True)
         suggestion: Suggestion = await Suggestion.from_id(
             suggestion_id, interaction.guild_id, self.state
         )
@@ -57,6 +59,9 @@ class BlacklistCog(commands.Cog):
 
         guild_config.blocked_users.add(suggestion.suggestion_author_id)
         await self.bot.db.guild_configs.upsert(guild_config, guild_config)
+        await self.bot.invalidation_bus.publish(
+            InvalidationEntity.BLOCKLIST, guild_config.guild_id
+        )
         await interaction.send(
             "I have added that user to the blocklist. "
             "They will be unable to create suggestions in the future.",
@@ -93,7 +98,7 @@ class BlacklistCog(commands.Cog):
         suggestion_id: str {{SUGGESTION_ID}}
         user_id: str {{USER_ID}}
         """
-        await interaction.response.defer(ephemeral=True)
+        await defer(interaction, ephemeral=True)
         if suggestion_id and user_id:
             return await interaction.send(
                 "Providing suggestion_id and user_id at the same time is not supported.",
@@ -123,6 +128,9 @@ class BlacklistCog(commands.Cog):
         )
         guild_config.blocked_users.discard(user_id)
         await self.bot.db.guild_configs.upsert(guild_config, guild_config)
+        await self.bot.invalidation_bus.publish(
+            InvalidationEntity.BLOCKLIST, guild_config.guild_id
+        )
         await interaction.send("I have un-blocklisted that user for you.")
         logger.debug(
             "User %s removed %s from the blocklist for guild %s",
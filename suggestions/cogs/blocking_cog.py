@@ -9,6 +9,8 @@ import concurrent.futures
 import disnake
 from disnake.ext import commands
 
+from suggestions.auto_defer import AUTO_DEFER_EPHEMERAL
+
 log = logging.getLogger(__name__)
 
 
@@ -25,6 +27,7 @@ class BlockingMonitor(commands.Cog):
     @commands.slash_command(
         default_member_permissions=disnake.Permissions(kick_members=True),
         guild_ids=[601219766258106399, 737166408525283348],
+        extras={AUTO_DEFER_EPHEMERAL: False},
     )
     @commands.contexts(guild=True)
     async def bmon(self, inter): ...
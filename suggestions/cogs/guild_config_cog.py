@@ -4,15 +4,16 @@ import logging
 from datetime import timedelta
 from typing import TYPE_CHECKING
 
-import cooldowns
 import disnake
 from disnake.ext import commands
 from humanize import precisedelta, intcomma
 
 from suggestions import Stats
 from suggestions.cooldown_bucket import InteractionBucket
+from suggestions.redis_cooldown import cooldown
 from suggestions.exceptions import InvalidGuildConfigOption, MessageTooLong
 from suggestions.interaction_handler import InteractionHandler
+from suggestions.invalidation import InvalidationEntity
 from suggestions.objects import GuildConfig
 from suggestions.objects.premium_guild_config import CooldownPeriod, PremiumGuildConfig
 from suggestions.stats import StatsEnum
@@ -33,7 +34,7 @@ class GuildConfigCog(commands.Cog):
         default_member_permissions=disnake.Permissions(manage_guild=True),
     )
     @commands.contexts(guild=True)
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     async def config(self, interaction: disnake.GuildCommandInteraction):
         """Configure the bot for your guild."""
         pass
@@ -51,6 +52,9 @@ class GuildConfigCog(commands.Cog):
         guild_config.suggestions_channel_id = channel.id
         self.state.refresh_guild_config(guild_config)
         await self.state.guild_config_db.upsert(guild_config, guild_config)
+        await self.bot.invalidation_bus.publish(
+            InvalidationEntity.GUILD_CONFIG, guild_config.guild_id
+        )
         await interaction.send(
             self.bot.get_locale(
                 "CONFIG_CHANNEL_INNER_MESSAGE", interaction.locale
@@ -91,6 +95,9 @@ class GuildConfigCog(commands.Cog):
         guild_config.log_channel_id = channel.id
         self.state.refresh_guild_config(guild_config)
         await self.state.guild_config_db.upsert(guild_config, guild_config)
+        await self.bot.invalidation_bus.publish(
+            InvalidationEntity.GUILD_CONFIG, guild_config.guild_id
+        )
         await interaction.send(
             self.bot.get_locale("CONFIG_LOGS_INNER_MESSAGE", interaction.locale).format(
                 channel.mention
@@ -142,6 +149,9 @@ class GuildConfigCog(commands.Cog):
         guild_config.queued_channel_id = channel.id
         self.state.refresh_guild_config(guild_config)
         await self.state.guild_config_db.upsert(guild_config, guild_config)
+        await self.bot.invalidation_bus.publish(
+            InvalidationEntity.GUILD_CONFIG, guild_config.guild_id
+        )
         await ih.send(
             self.bot.get_localized_string(
                 "CONFIG_QUEUE_CHANNEL_INNER_MESSAGE",
@@ -184,6 +194,9 @@ class GuildConfigCog(commands.Cog):
         guild_config.queued_log_channel_id = channel.id if channel else None
         self.state.refresh_guild_config(guild_config)
         await self.state.guild_config_db.upsert(guild_config, guild_config)
+        await self.bot.invalidation_bus.publish(
+            InvalidationEntity.GUILD_CONFIG, guild_config.guild_id
+        )
         key = (
             "CONFIG_QUEUE_CHANNEL_INNER_MESSAGE_REMOVED"
             if channel is None
@@ -1104,6 +1117,9 @@ class GuildConfigCog(commands.Cog):
         )
         setattr(guild_config, field, new_value)
         await self.bot.db.guild_configs.upsert(guild_config, guild_config)
+        await self.bot.invalidation_bus.publish(
+            InvalidationEntity.GUILD_CONFIG, guild_config.guild_id
+        )
         await interaction.send(
             user_message,
             ephemeral=True,
@@ -10,7 +10,7 @@ from alaric import AQ
 from alaric.comparison import EQ
 from disnake.ext import commands
 from disnake.utils import format_dt
-from humanize import naturaldate
+from humanize import naturaldate, naturalsize, intcomma
 
 from suggestions import ErrorCode
 from suggestions.objects import Error
@@ -26,10 +26,6 @@ class HelpGuildCog(commands.Cog):
         self.bot: SuggestionsBot = bot
         self.state: State = self.bot.state
 
-    @commands.Cog.listener()
-    async def on_socket_event_type(self, event_type: str) -> None:
-        self.bot.stats.increment_event_type(event_type)
-
     @commands.slash_command(
         default_member_permissions=disnake.Permissions(kick_members=True),
         guild_ids=[601219766258106399, 737166408525283348],
@@ -68,33 +64,60 @@ class HelpGuildCog(commands.Cog):
             description="The ID of the guild you want info on."
         ),
     ):
-        """Retrieve information about what instance a given guild sees. This is currently wrong."""
-        await interaction.send(
-            ephemeral=True, content="This command currently does not work correctly."
-        )
-        return
-
+        """Retrieve information about what instance a given guild sees."""
         guild_id = int(guild_id)
-        shard_id = self.bot.get_shard_id(guild_id)
-        cluster_id = (
-            1
-            if shard_id < 10
-            else (
-                2
-                if shard_id < 20
-                else (
-                    3
-                    if shard_id < 30
-                    else 4 if shard_id < 40 else 5 if shard_id < 50 else 6
-                )
-            )
+        shard_id, cluster = await self.bot.cluster_registry.find_cluster_for_guild(
+            guild_id
         )
+        if cluster is None:
+            return await interaction.send(
+                f"Guild `{guild_id}` should be on shard `{shard_id}`, "
+                f"however no healthy cluster currently reports running it",
+                ephemeral=True,
+            )
 
         await interaction.send(
-            f"Guild `{guild_id}` should be in cluster `{cluster_id}` with the specific shard `{shard_id}`",
+            f"Guild `{guild_id}` should be in cluster `{cluster.cluster_id}` with the specific shard `{shard_id}`",
             ephemeral=True,
         )
 
+    @commands.slash_command(
+        default_member_permissions=disnake.Permissions(kick_members=True),
+        guild_ids=[601219766258106399, 737166408525283348],
+    )
+    @commands.contexts(guild=True)
+    @commands.is_owner()
+    async def cluster_info(self, interaction: disnake.GuildCommandInteraction):
+        """View the latest heartbeat from every cluster."""
+        registry = self.bot.cluster_registry
+        clusters = await registry.fetch_clusters()
+        if not clusters:
+            return await interaction.send(
+                "No clusters are currently registered.", ephemeral=True
+            )
+
+        lines: list[str] = []
+        for cluster in clusters:
+            latency = cluster.average_latency
+            shards = (
+                f"{cluster.shard_ids[0]}-{cluster.shard_ids[-1]}"
+                if cluster.shard_ids
+                else "none"
+            )
+            lines.append(
+                f"{'' if registry.is_healthy(cluster) else '(stale) '}"
+                f"**Cluster {cluster.cluster_id}** - "
+                f"shards `{shards}` | "
+                f"`{intcomma(cluster.guild_count)}` guilds | "
+                f"latency `{'N/A' if latency is None else f'{latency * 1000:.0f}ms'}` | "
+                f"loop lag `{cluster.loop_lag * 1000:.1f}ms` | "
+                f"RSS `{naturalsize(cluster.rss, binary=True)}` | "
+                f"`{cluster.interactions_per_second:.1f}` interactions/s | "
+                f"seen `{cluster.age:.0f}s` ago"
+            )
+
+        await interaction.send("\n".join(lines), ephemeral=True)
+
     @commands.slash_command(
         default_member_permissions=disnake.Permissions(kick_members=True),
         guild_ids=[601219766258106399, 737166408525283348],
@@ -114,6 +137,10 @@ class HelpGuildCog(commands.Cog):
                 "No error exists with that ID.", ephemeral=True
             )
 
+        traceback_str = await self.bot.error_recorder.fetch_traceback(error)
+        if traceback_str is None:
+            traceback_str = "This errors traceback could not be found."
+
         embed = disnake.Embed(
             colour=self.bot.colors.embed_color,
             timestamp=self.bot.state.now,
@@ -127,7 +154,7 @@ class HelpGuildCog(commands.Cog):
         await interaction.send(
             embed=embed,
             ephemeral=True,
-            file=disnake.File(io.StringIO(error.traceback), filename="traceback.txt"),
+            file=disnake.File(io.StringIO(traceback_str), filename="traceback.txt"),
         )
 
 
@@ -1,19 +1,17 @@
 from __future__ import annotations
 
-import datetime
 import logging
 from typing import TYPE_CHECKING, Optional
 
-import cooldowns
 import disnake
-import orjson
 from commons.caching import NonExistentEntry
-from cooldowns import Cooldown
 from disnake import ButtonStyle
 from disnake.ext import commands
 
-from suggestions import checks, Stats, buttons, constants
+from suggestions import checks, Stats, buttons
+from suggestions.auto_defer import defer
 from suggestions.cooldown_bucket import InteractionBucket
+from suggestions.redis_cooldown import cooldown, SlidingWindowCooldown
 from suggestions.core import SuggestionsQueue, SuggestionsResolutionCore
 from suggestions.exceptions import (
     MessageTooLong,
@@ -38,10 +36,6 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-async def user_cooldown_bucket(inter: disnake.Interaction) -> tuple[int, int]:
-    return inter.author.id, inter.guild_id
-
-
 class SuggestionsCog(commands.Cog):
     def __init__(self, bot: SuggestionsBot):
         self.bot: SuggestionsBot = bot
@@ -62,31 +56,18 @@ class SuggestionsCog(commands.Cog):
         ):
             return True
 
-        bot: SuggestionsBot = ih.bot
-        redis_state = await constants.REDIS_CLIENT.get(f"PREMIUM_COOLDOWN:{ih.interaction.guild_id}")
-        cooldown = Cooldown(
+        cooldown = SlidingWindowCooldown(
             premium_guild_config.cooldown_amount,
             premium_guild_config.cooldown_period.as_timedelta(),
-            bucket=user_cooldown_bucket,
         )
-        if redis_state is not None and redis_state:
-            cooldown.load_from_state(orjson.loads(redis_state))
-
-        await cooldown.increment(ih.interaction)
-
-        await constants.REDIS_CLIENT.set(
-            f"PREMIUM_COOLDOWN:{ih.interaction.guild_id}",
-            orjson.dumps(cooldown.get_state()),
-            # Expire after two months as we support up to
-            # a month so this will keep it clean
-            ex=int(datetime.timedelta(days=60).total_seconds()),
+        await cooldown.increment(
+            f"PREMIUM_COOLDOWN:{ih.interaction.guild_id}:{ih.interaction.author.id}"
         )
-        del cooldown
         return None
 
     @commands.slash_command()
     @commands.contexts(guild=True)
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     @checks.ensure_user_is_not_blocklisted()
     @checks.ensure_guild_has_suggestions_channel()
     async def suggest(
@@ -109,6 +90,9 @@ class SuggestionsCog(commands.Cog):
             raise MessageTooLong(suggestion)
 
         ih: InteractionHandler = await InteractionHandler.new_handler(interaction)
+        # We already have the author, so save a
+        # fetch later on when rendering the suggestion
+        self.state.user_profiles.add_user(interaction.author)
         # TODO Re-enable premium features at later date
         # if ih.has_premium:
         #     # Premium, handle custom cooldowns
@@ -261,7 +245,7 @@ class SuggestionsCog(commands.Cog):
         default_member_permissions=disnake.Permissions(manage_guild=True),
     )
     @commands.contexts(guild=True)
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     @checks.ensure_guild_has_logs_channel_or_keep_logs()
     async def approve(
         self,
@@ -291,7 +275,7 @@ class SuggestionsCog(commands.Cog):
         default_member_permissions=disnake.Permissions(manage_guild=True),
     )
     @commands.contexts(guild=True)
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     @checks.ensure_guild_has_logs_channel_or_keep_logs()
     async def reject(
         self,
@@ -321,7 +305,7 @@ class SuggestionsCog(commands.Cog):
         default_member_permissions=disnake.Permissions(manage_guild=True),
     )
     @commands.contexts(guild=True)
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     async def clear(
         self,
         interaction: disnake.GuildCommandInteraction,
@@ -339,7 +323,7 @@ class SuggestionsCog(commands.Cog):
         suggestion_id: str {{CLEAR_ARG_SUGGESTION_ID}}
         response: str {{CLEAR_ARG_RESPONSE}}
         """
-        await interaction.response.defer(ephemeral=True)
+        await defer(interaction, ephemeral=True)
         try:
             suggestion_type = "suggestion"
             suggestion: Suggestion = await Suggestion.from_id(
@@ -1,11 +1,11 @@
 import logging
 
-import cooldowns
 import disnake
 from commons.caching import NonExistentEntry
 from disnake.ext import commands
 
 from suggestions.cooldown_bucket import InteractionBucket
+from suggestions.redis_cooldown import cooldown
 from suggestions.core import SuggestionsNotesCore
 from suggestions.interaction_handler import InteractionHandler
 
@@ -22,7 +22,7 @@ class SuggestionNotesCog(commands.Cog):
         default_member_permissions=disnake.Permissions(manage_guild=True),
     )
     @commands.contexts(guild=True)
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     async def notes(self, interaction: disnake.GuildCommandInteraction):
         """{{NOTES}}"""
         pass
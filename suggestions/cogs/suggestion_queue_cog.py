@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import logging
 
-import cooldowns
 import disnake
 from disnake.ext import commands, components
 
 from suggestions import checks
 from suggestions.cooldown_bucket import InteractionBucket
+from suggestions.redis_cooldown import cooldown
 from suggestions.core import SuggestionsQueue
 from suggestions.interaction_handler import InteractionHandler
 
@@ -24,7 +24,7 @@ class SuggestionsQueueCog(commands.Cog):
         default_member_permissions=disnake.Permissions(manage_guild=True),
     )
     @commands.contexts(guild=True)
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     @checks.ensure_guild_has_suggestions_channel()
     async def queue(self, interaction: disnake.GuildCommandInteraction):
         pass
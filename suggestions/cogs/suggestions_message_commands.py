@@ -3,12 +3,13 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-import cooldowns
 import disnake
 from disnake.ext import commands
 
 from suggestions import checks
+from suggestions.auto_defer import defer
 from suggestions.cooldown_bucket import InteractionBucket
+from suggestions.redis_cooldown import cooldown
 from suggestions.objects import Suggestion, GuildConfig
 from suggestions.objects.suggestion import SuggestionState
 
@@ -32,11 +33,11 @@ class SuggestionsMessageCommands(commands.Cog):
         default_member_permissions=disnake.Permissions(manage_guild=True),
     )
     @commands.contexts(guild=True)
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     @checks.ensure_guild_has_logs_channel_or_keep_logs()
     async def approve_suggestion(self, interaction: disnake.GuildCommandInteraction):
         """Approve this suggestion"""
-        await interaction.response.defer(ephemeral=True, with_message=True)
+        await defer(interaction, ephemeral=True, with_message=True)
         suggestion: Suggestion = await Suggestion.from_message_id(
             message_id=interaction.target.id,
             channel_id=interaction.channel_id,
@@ -85,11 +86,11 @@ class SuggestionsMessageCommands(commands.Cog):
         default_member_permissions=disnake.Permissions(manage_guild=True),
     )
     @commands.contexts(guild=True)
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     @checks.ensure_guild_has_logs_channel_or_keep_logs()
     async def reject_suggestion(self, interaction: disnake.GuildCommandInteraction):
         """Reject this suggestion"""
-        await interaction.response.defer(ephemeral=True, with_message=True)
+        await defer(interaction, ephemeral=True, with_message=True)
         suggestion: Suggestion = await Suggestion.from_message_id(
             message_id=interaction.target.id,
             channel_id=interaction.channel_id,
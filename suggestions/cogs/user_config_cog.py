@@ -3,11 +3,12 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-import cooldowns
 import disnake
 from disnake.ext import commands
 
 from suggestions.cooldown_bucket import InteractionBucket
+from suggestions.redis_cooldown import cooldown
+from suggestions.invalidation import InvalidationEntity
 from suggestions.objects import UserConfig
 
 if TYPE_CHECKING:
@@ -23,7 +24,7 @@ class UserConfigCog(commands.Cog):
         self.stats: Stats = self.bot.stats
 
     @commands.slash_command()
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     async def dm(self, interaction: disnake.CommandInteraction):
         pass
 
@@ -35,6 +36,9 @@ class UserConfigCog(commands.Cog):
         )
         user_config.dm_messages_disabled = False
         await self.bot.db.user_configs.upsert(user_config, user_config)
+        await self.bot.invalidation_bus.publish(
+            InvalidationEntity.USER_CONFIG, user_config.user_id
+        )
         await interaction.send("I have enabled DM messages for you.", ephemeral=True)
         log.debug(
             "Enabled DM messages for member %s",
@@ -62,6 +66,9 @@ class UserConfigCog(commands.Cog):
         )
         user_config.dm_messages_disabled = True
         await self.bot.db.user_configs.upsert(user_config, user_config)
+        await self.bot.invalidation_bus.publish(
+            InvalidationEntity.USER_CONFIG, user_config.user_id
+        )
         await interaction.send("I have disabled DM messages for you.", ephemeral=True)
         log.debug(
             "Disabled DM messages for member %s",
@@ -110,7 +117,7 @@ class UserConfigCog(commands.Cog):
         )
 
     @commands.slash_command()
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     async def user_config(self, interaction: disnake.CommandInteraction):
         pass
 
@@ -128,6 +135,9 @@ class UserConfigCog(commands.Cog):
         )
         user_config.ping_on_thread_creation = True
         await self.bot.db.user_configs.upsert(user_config, user_config)
+        await self.bot.invalidation_bus.publish(
+            InvalidationEntity.USER_CONFIG, user_config.user_id
+        )
         await interaction.send(
             "I have enabled pings on thread creation for you.", ephemeral=True
         )
@@ -159,6 +169,9 @@ class UserConfigCog(commands.Cog):
         )
         user_config.ping_on_thread_creation = False
         await self.bot.db.user_configs.upsert(user_config, user_config)
+        await self.bot.invalidation_bus.publish(
+            InvalidationEntity.USER_CONFIG, user_config.user_id
+        )
         await interaction.send(
             "I have disabled pings on thread creation for you.", ephemeral=True
         )
@@ -3,13 +3,14 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, Type
 
-import cooldowns
 import disnake
 from commons.caching import NonExistentEntry
 from disnake.ext import commands
 
 from suggestions import Colors
+from suggestions.auto_defer import defer
 from suggestions.cooldown_bucket import InteractionBucket
+from suggestions.redis_cooldown import cooldown
 from suggestions.interaction_handler import InteractionHandler
 from suggestions.objects import Suggestion
 from suggestions.objects.suggestion import SuggestionState
@@ -104,12 +105,12 @@ class ViewVotersCog(commands.Cog):
         )
 
     @commands.message_command(name="View voters")
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     async def view_suggestion_voters(
         self, interaction: disnake.GuildCommandInteraction
     ):
         """View everyone who voted on this suggestion."""
-        await interaction.response.defer(ephemeral=True, with_message=True)
+        await defer(interaction, ephemeral=True, with_message=True)
         suggestion: Suggestion = await Suggestion.from_message_id(
             message_id=interaction.target.id,
             channel_id=interaction.channel_id,
@@ -123,8 +124,12 @@ class ViewVotersCog(commands.Cog):
                 ephemeral=True,
             )
 
-        up_vote: disnake.Emoji = await self.bot.suggestion_emojis.default_up_vote()
-        down_vote: disnake.Emoji = await self.bot.suggestion_emojis.default_down_vote()
+        up_vote: disnake.PartialEmoji = self.bot.suggestion_emojis.up_vote_for(
+            suggestion.guild_id
+        )
+        down_vote: disnake.PartialEmoji = self.bot.suggestion_emojis.down_vote_for(
+            suggestion.guild_id
+        )
         data = []
         for voter in suggestion.up_voted_by:
             data.append(f"{up_vote} <@{voter}>")
@@ -142,12 +147,12 @@ class ViewVotersCog(commands.Cog):
         )
 
     @commands.message_command(name="View up voters")
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     async def view_suggestion_up_voters(
         self, interaction: disnake.GuildCommandInteraction
     ):
         """View everyone who up voted on this suggestion."""
-        await interaction.response.defer(ephemeral=True, with_message=True)
+        await defer(interaction, ephemeral=True, with_message=True)
         suggestion: Suggestion = await Suggestion.from_message_id(
             message_id=interaction.target.id,
             channel_id=interaction.channel_id,
@@ -175,12 +180,12 @@ class ViewVotersCog(commands.Cog):
         )
 
     @commands.message_command(name="View down voters")
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     async def view_suggestion_down_voters(
         self, interaction: disnake.GuildCommandInteraction
     ):
         """View everyone who down voted on this suggestion."""
-        await interaction.response.defer(ephemeral=True, with_message=True)
+        await defer(interaction, ephemeral=True, with_message=True)
         suggestion: Suggestion = await Suggestion.from_message_id(
             message_id=interaction.target.id,
             channel_id=interaction.channel_id,
@@ -208,7 +213,7 @@ class ViewVotersCog(commands.Cog):
         )
 
     @commands.slash_command(name="view")
-    @cooldowns.cooldown(1, 3, bucket=InteractionBucket.author)
+    @cooldown(1, 3, bucket=InteractionBucket.author)
     async def view_voters_parent(self, interaction: disnake.GuildCommandInteraction):
         pass
 
@@ -226,7 +231,7 @@ class ViewVotersCog(commands.Cog):
         ),
     ):
         """View the voters on a given suggestion"""
-        await interaction.response.defer(ephemeral=True, with_message=True)
+        await defer(interaction, ephemeral=True, with_message=True)
         suggestion: Suggestion = await Suggestion.from_id(
             suggestion_id=suggestion_id,
             guild_id=interaction.guild_id,
@@ -241,8 +246,12 @@ class ViewVotersCog(commands.Cog):
             )
 
         data = []
-        up_vote: disnake.Emoji = await self.bot.suggestion_emojis.default_up_vote()
-        down_vote: disnake.Emoji = await self.bot.suggestion_emojis.default_down_vote()
+        up_vote: disnake.PartialEmoji = self.bot.suggestion_emojis.up_vote_for(
+            suggestion.guild_id
+        )
+        down_vote: disnake.PartialEmoji = self.bot.suggestion_emojis.down_vote_for(
+            suggestion.guild_id
+        )
         if filter in ("All voters", "Up voters"):
             for voter in suggestion.up_voted_by:
                 data.append(f"{up_vote} <@{voter}>")
@@ -1,7 +1,9 @@
 import logging
 import os
-from typing import Literal, cast
+import sys
+from typing import BinaryIO, Literal, Optional, cast
 
+import orjson
 from dotenv import load_dotenv
 from infisical_sdk import InfisicalSDKClient
 from opentelemetry import trace, metrics
@@ -24,11 +26,20 @@ from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from redis import asyncio as aioredis
 
 load_dotenv()
-infisical_client = InfisicalSDKClient(host="https://secrets.skelmis.co.nz")
-infisical_client.auth.universal_auth.login(
-    client_id=os.environ["INFISICAL_ID"],
-    client_secret=os.environ["INFISICAL_SECRET"],
-)
+# Workers started by the supervisor are handed the secrets it
+# already fetched over stdin rather than each fetching them,
+# they must call load_handed_secrets before using any secret
+IS_SUPERVISED_WORKER: bool = bool(os.environ.get("SUPERVISED_WORKER"))
+_handed_secrets: dict[str, str] = {}
+_fetched_secrets: dict[str, str] = {}
+
+infisical_client: Optional[InfisicalSDKClient] = None
+if not IS_SUPERVISED_WORKER:
+    infisical_client = InfisicalSDKClient(host="https://secrets.skelmis.co.nz")
+    infisical_client.auth.universal_auth.login(
+        client_id=os.environ["INFISICAL_ID"],
+        client_secret=os.environ["INFISICAL_SECRET"],
+    )
 
 
 def configure_otel():
@@ -81,33 +92,86 @@ def configure_otel():
     logging.getLogger().setLevel(logging.INFO)
 
 
-def get_secret(secret_name: str, infisical_client: InfisicalSDKClient) -> str:
-    return infisical_client.secrets.get_secret_by_name(
-        secret_name=secret_name,
-        project_id=os.environ["INFISICAL_PROJECT_ID"],
-        environment_slug=os.environ["INFISICAL_SLUG"],
-        secret_path="/",
-        view_secret_value=True,
-    ).secretValue
+def get_secret(secret_name: str, infisical_client: Optional[InfisicalSDKClient]) -> str:
+    if IS_SUPERVISED_WORKER:
+        if secret_name not in _handed_secrets:
+            raise KeyError(f"The supervisor did not hand over {secret_name}")
+
+        value = _handed_secrets[secret_name]
+    else:
+        value = infisical_client.secrets.get_secret_by_name(
+            secret_name=secret_name,
+            project_id=os.environ["INFISICAL_PROJECT_ID"],
+            environment_slug=os.environ["INFISICAL_SLUG"],
+            secret_path="/",
+            view_secret_value=True,
+        ).secretValue
+
+    _fetched_secrets[secret_name] = value
+    return value
+
+
+def fetched_secrets() -> dict[str, str]:
+    """Every secret fetched so far, for handing to supervised workers."""
+    return dict(_fetched_secrets)
 
 
 TRACER = trace.get_tracer(__name__)
-CF_R2_ACCESS_KEY = get_secret("CF_R2_ACCESS_KEY", infisical_client)
-CF_R2_SECRET_ACCESS_KEY = get_secret("CF_R2_SECRET_ACCESS_KEY", infisical_client)
-CF_R2_BUCKET = get_secret("CF_R2_BUCKET", infisical_client)
-CF_R2_URL = get_secret("CF_R2_URL", infisical_client)
-BOT_TOKEN = get_secret("BOT_TOKEN", infisical_client)
-MONGO_URL = get_secret("MONGO_URL", infisical_client)
-REDIS_CLIENT = aioredis.from_url(get_secret("REDIS_URL", infisical_client))
-
-# Lists
-LISTS_TOP_GG_API_KEY = get_secret("LISTS_TOP_GG_API_KEY", infisical_client)
-LISTS_DISCORDS_DOT_COM_API_KEY = get_secret(
-    "LISTS_DISCORDS_DOT_COM_API_KEY", infisical_client
-)
-LISTS_DISCORDBOTLIST_API_KEY = get_secret(
-    "LISTS_DISCORDBOTLIST_API_KEY", infisical_client
-)
-LISTS_DISCORD_BOTS_GG_API_KEY = get_secret(
-    "LISTS_DISCORD_BOTS_GG_API_KEY", infisical_client
-)
+METER = metrics.get_meter(__name__)
+CF_R2_ACCESS_KEY: str
+CF_R2_SECRET_ACCESS_KEY: str
+CF_R2_BUCKET: str
+CF_R2_URL: str
+BOT_TOKEN: str
+MONGO_URL: str
+REDIS_CLIENT: aioredis.Redis
+LISTS_TOP_GG_API_KEY: str
+LISTS_DISCORDS_DOT_COM_API_KEY: str
+LISTS_DISCORDBOTLIST_API_KEY: str
+LISTS_DISCORD_BOTS_GG_API_KEY: str
+
+
+def _load_secrets() -> None:
+    global CF_R2_ACCESS_KEY, CF_R2_SECRET_ACCESS_KEY, CF_R2_BUCKET, CF_R2_URL
+    global BOT_TOKEN, MONGO_URL, REDIS_CLIENT, LISTS_TOP_GG_API_KEY
+    global LISTS_DISCORDS_DOT_COM_API_KEY, LISTS_DISCORDBOTLIST_API_KEY
+    global LISTS_DISCORD_BOTS_GG_API_KEY
+    CF_R2_ACCESS_KEY = get_secret("CF_R2_ACCESS_KEY", infisical_client)
+    CF_R2_SECRET_ACCESS_KEY = get_secret("CF_R2_SECRET_ACCESS_KEY", infisical_client)
+    CF_R2_BUCKET = get_secret("CF_R2_BUCKET", infisical_client)
+    CF_R2_URL = get_secret("CF_R2_URL", infisical_client)
+    BOT_TOKEN = get_secret("BOT_TOKEN", infisical_client)
+    MONGO_URL = get_secret("MONGO_URL", infisical_client)
+    # Without these a stalled connection blocks callers indefinitely
+    REDIS_CLIENT = aioredis.from_url(
+        get_secret("REDIS_URL", infisical_client),
+        socket_connect_timeout=5,
+        socket_timeout=5,
+    )
+
+    # Lists
+    LISTS_TOP_GG_API_KEY = get_secret("LISTS_TOP_GG_API_KEY", infisical_client)
+    LISTS_DISCORDS_DOT_COM_API_KEY = get_secret(
+        "LISTS_DISCORDS_DOT_COM_API_KEY", infisical_client
+    )
+    LISTS_DISCORDBOTLIST_API_KEY = get_secret(
+        "LISTS_DISCORDBOTLIST_API_KEY", infisical_client
+    )
+    LISTS_DISCORD_BOTS_GG_API_KEY = get_secret(
+        "LISTS_DISCORD_BOTS_GG_API_KEY", infisical_client
+    )
+
+
+def load_handed_secrets(stream: Optional[BinaryIO] = None) -> None:
+    """Read the secrets our supervisor wrote to ``stream``, stdin by default.
+
+    Supervised workers must call this before anything
+    else, as secrets are otherwise left unset.
+    """
+    stream = sys.stdin.buffer if stream is None else stream
+    _handed_secrets.update(orjson.loads(stream.readline()))
+    _load_secrets()
+
+
+if not IS_SUPERVISED_WORKER:
+    _load_secrets()
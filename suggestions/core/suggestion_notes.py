@@ -1,6 +1,5 @@
 import logging
 
-import disnake
 from disnake import Embed
 
 from suggestions import Colors
@@ -93,5 +92,4 @@ class SuggestionsNotesCore(BaseCore):
         icon_url = await self.bot.try_fetch_icon_url(ih.interaction.guild_id)
         guild = ih.bot.state.guild_cache.get_entry(ih.interaction.guild_id)
         embed.set_author(name=guild.name, icon_url=icon_url)
-        user: disnake.User = await ih.bot.fetch_user(suggestion_author_id)
-        await user.send(embed=embed)
+        await ih.bot.state.user_profiles.send_dm(suggestion_author_id, embed=embed)
@@ -144,9 +144,6 @@ class SuggestionsQueue:
                         raise MissingQueueLogsChannel from e
 
                 # message the user the outcome
-                user = await self.bot.state.fetch_user(
-                    queued_suggestion.suggestion_author_id
-                )
                 user_config: UserConfig = await UserConfig.from_id(
                     queued_suggestion.suggestion_author_id, self.bot.state
                 )
@@ -169,8 +166,9 @@ class SuggestionsQueue:
                         icon_url=icon_url,
                     )
                     embed.set_footer(text=f"Guild ID {guild_id}")
-                    await user.send(
-                        embeds=[embed, await queued_suggestion.as_embed(self.bot)]
+                    await self.state.user_profiles.send_dm(
+                        queued_suggestion.suggestion_author_id,
+                        embeds=[embed, await queued_suggestion.as_embed(self.bot)],
                     )
         except:
             # Don't remove from queue on failure
@@ -301,11 +299,11 @@ class SuggestionsQueue:
                 ),
                 disnake.ui.ActionRow(
                     await buttons.VirtualApproveButton(
-                        emoji=await self.bot.suggestion_emojis.default_up_vote(),
+                        emoji=self.bot.suggestion_emojis.up_vote_for(guild_id),
                         pid=pid,
                     ).as_ui_component(),
                     await buttons.VirtualRejectButton(
-                        emoji=await self.bot.suggestion_emojis.default_down_vote(),
+                        emoji=self.bot.suggestion_emojis.down_vote_for(guild_id),
                         pid=pid,
                     ).as_ui_component(),
                 ),
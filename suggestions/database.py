@@ -1,6 +1,17 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import NamedTuple, Any, Iterator
+
+import commons
 from alaric import Document
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import IndexModel, ASCENDING
+from pymongo.errors import OperationFailure
+from pymongo.results import BulkWriteResult
 
+from suggestions import constants
 from suggestions.objects import (
     Suggestion,
     GuildConfig,
@@ -11,6 +22,303 @@ from suggestions.objects import (
 )
 from suggestions.objects.stats import MemberStats
 
+log = logging.getLogger(__name__)
+
+SLOW_QUERY_THRESHOLD: float = (
+    float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", 100)) / 1000
+)
+operation_duration = constants.METER.create_histogram(
+    "db.client.operation.duration",
+    unit="s",
+    description="Duration of mongo operations by collection and operation",
+)
+
+
+def filter_shape(value: Any) -> Any:
+    """Strip the values out of a filter, leaving only its structure.
+
+    {"guild_id": 123, "state": {"$ne": "cleared"}} becomes
+    {"guild_id": "int", "state": {"$ne": "str"}}
+    """
+    if isinstance(value, dict):
+        return {k: filter_shape(v) for k, v in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [filter_shape(v) for v in value]
+
+    return type(value).__name__
+
+
+class InstrumentedDocument(Document):
+    """A Document which records how long each operation takes.
+
+    Every operation is wrapped in a child span of the current
+    command span and timed into a histogram keyed by collection
+    and operation. Slow queries are logged along with the
+    shape of their filter so they can be matched to an index.
+    """
+
+    @contextmanager
+    def _instrument(self, operation: str, filter_dict: Any = None) -> Iterator[None]:
+        attributes = {
+            "db.system": "mongodb",
+            "db.collection.name": self.collection_name,
+            "db.operation.name": operation,
+        }
+        with constants.TRACER.start_as_current_span(
+            f"{operation} {self.collection_name}", attributes=attributes
+        ):
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                duration = time.perf_counter() - start
+                operation_duration.record(duration, attributes)
+                if duration >= SLOW_QUERY_THRESHOLD:
+                    shape = (
+                        filter_shape(self._ensure_built(filter_dict))
+                        if filter_dict is not None
+                        else None
+                    )
+                    log.warning(
+                        "Slow %s on %s took %.0fms",
+                        operation,
+                        self.collection_name,
+                        duration * 1000,
+                        extra={
+                            **attributes,
+                            "db.query.shape": str(shape),
+                            "db.operation.duration_ms": duration * 1000,
+                        },
+                    )
+
+    async def find(self, filter_dict, projections=None, *, try_convert=True):
+        with self._instrument("find", filter_dict):
+            return await super().find(filter_dict, projections, try_convert=try_convert)
+
+    async def find_many(self, filter_dict, projections=None, *, try_convert=True):
+        with self._instrument("find_many", filter_dict):
+            return await super().find_many(
+                filter_dict, projections, try_convert=try_convert
+            )
+
+    async def insert(self, data):
+        with self._instrument("insert"):
+            return await super().insert(data)
+
+    async def bulk_insert(self, data):
+        with self._instrument("bulk_insert"):
+            return await super().bulk_insert(data)
+
+    async def update(self, filter_dict, update_data, option="set", *args, **kwargs):
+        with self._instrument("update", filter_dict):
+            return await super().update(
+                filter_dict, update_data, option, *args, **kwargs
+            )
+
+    async def upsert(self, filter_dict, update_data, option="set", *args, **kwargs):
+        # Go straight to Document.update so this isn't also timed as an update
+        with self._instrument("upsert", filter_dict):
+            return await super().update(
+                filter_dict, update_data, option, upsert=True, *args, **kwargs
+            )
+
+    async def delete(self, filter_dict):
+        with self._instrument("delete", filter_dict):
+            return await super().delete(filter_dict)
+
+    async def count(self, filter_dict):
+        with self._instrument("count", filter_dict):
+            return await super().count(filter_dict)
+
+    async def bulk_write(
+        self, requests: list[Any], *, ordered: bool = True
+    ) -> BulkWriteResult:
+        """Run a batch of pymongo write operations in one round trip."""
+        with self._instrument("bulk_write"):
+            return await self.raw_collection.bulk_write(requests, ordered=ordered)
+
+    async def aggregate(self, pipeline: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Run an aggregation pipeline and return all results."""
+        with self._instrument("aggregate"):
+            return await self._document.aggregate(pipeline).to_list(length=None)
+
+
+class QueryShape(NamedTuple):
+    """A hot query we expect to be served by an index."""
+
+    collection: str
+    filter: dict[str, Any]
+    description: str
+
+
+class IndexAudit(NamedTuple):
+    query: QueryShape
+    winning_stages: list[str]
+
+    @property
+    def uses_collection_scan(self) -> bool:
+        return "COLLSCAN" in self.winning_stages
+
+
+# Codes mongo raises when an index already exists on the same
+# keys but under a different name or with different options
+INDEX_CONFLICT_CODES = (85, 86)
+
+# The compound indexes our hot queries rely on. These use
+# mongo's default names so any existing index on the same keys
+# created by hand is treated as the same index
+REQUIRED_INDEXES: dict[str, list[IndexModel]] = {
+    "suggestions": [
+        IndexModel([("message_id", ASCENDING), ("channel_id", ASCENDING)]),
+        IndexModel([("guild_id", ASCENDING), ("state", ASCENDING)]),
+    ],
+    "queued_suggestions": [
+        IndexModel(
+            [
+                ("guild_id", ASCENDING),
+                ("still_in_queue", ASCENDING),
+                ("message_id", ASCENDING),
+            ]
+        ),
+    ],
+    "member_stats": [
+        IndexModel([("member_id", ASCENDING), ("guild_id", ASCENDING)]),
+    ],
+    "locale_usage": [
+        IndexModel(
+            [("day", ASCENDING), ("locale", ASCENDING), ("guild_id", ASCENDING)]
+        ),
+    ],
+    "stats_rollups": [
+        IndexModel(
+            [
+                ("guild_id", ASCENDING),
+                ("stat", ASCENDING),
+                ("granularity", ASCENDING),
+                ("bucket", ASCENDING),
+            ],
+            partialFilterExpression={"guild_id": {"$exists": True}},
+        ),
+        IndexModel(
+            [
+                ("cluster", ASCENDING),
+                ("stat", ASCENDING),
+                ("granularity", ASCENDING),
+                ("bucket", ASCENDING),
+            ],
+            partialFilterExpression={"cluster": {"$exists": True}},
+        ),
+    ],
+}
+
+# Mirrors of the filters used throughout the codebase, these are
+# what we run explain() against when auditing index usage
+QUERY_SHAPES: list[QueryShape] = [
+    QueryShape(
+        "suggestions",
+        {"message_id": 1, "channel_id": 1},
+        "Suggestion.from_message_id",
+    ),
+    QueryShape(
+        "suggestions",
+        {"guild_id": 1, "state": "pending"},
+        "State.populate_sid_cache",
+    ),
+    QueryShape(
+        "queued_suggestions",
+        {"guild_id": 1, "resolved_at": {"$exists": False}},
+        "State.populate_sid_cache (queue)",
+    ),
+    QueryShape(
+        "queued_suggestions",
+        {"guild_id": 1, "still_in_queue": True, "message_id": {"$exists": True}},
+        "SuggestionsQueue.info",
+    ),
+    QueryShape(
+        "queued_suggestions",
+        {"guild_id": 1, "still_in_queue": True},
+        "SuggestionsQueue.view",
+    ),
+    QueryShape(
+        "member_stats",
+        {"member_id": 1, "guild_id": 1},
+        "MemberStats.from_id",
+    ),
+    QueryShape(
+        "stats_rollups",
+        {
+            "guild_id": 1,
+            "stat": "approve",
+            "granularity": "day",
+            "bucket": {"$gte": 0, "$lt": 1},
+        },
+        "Stats.fetch_rollups",
+    ),
+]
+
+
+def _collect_stages(plan: dict[str, Any]) -> list[str]:
+    stages: list[str] = [plan["stage"]] if "stage" in plan else []
+    if "inputStage" in plan:
+        stages.extend(_collect_stages(plan["inputStage"]))
+
+    for child in plan.get("inputStages", []):
+        stages.extend(_collect_stages(child))
+
+    return stages
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Create all required indexes.
+
+    This is idempotent, mongo treats re-creating
+    an identical index as a noop. An existing index which
+    conflicts with ours is logged and left alone rather than
+    stopping the bot from starting.
+    """
+    for collection, indexes in REQUIRED_INDEXES.items():
+        for index in indexes:
+            try:
+                created = await db[collection].create_indexes([index])
+            except OperationFailure as e:
+                if e.code not in INDEX_CONFLICT_CODES:
+                    raise
+
+                log.warning(
+                    "Index %s on %s conflicts with an existing index, leaving it as is",
+                    index.document["name"],
+                    collection,
+                    extra={"error.traceback": commons.exception_as_string(e)},
+                )
+                continue
+
+            log.debug("Ensured indexes %s on %s", created, collection)
+
+
+async def audit_indexes(db: AsyncIOMotorDatabase) -> list[IndexAudit]:
+    """Run explain() over every registered query shape.
+
+    Any query which would perform a collection scan is logged.
+    """
+    results: list[IndexAudit] = []
+    for query in QUERY_SHAPES:
+        explanation = await db[query.collection].find(query.filter).explain()
+        winning_plan = explanation["queryPlanner"]["winningPlan"]
+        # Newer mongo versions nest the plan under queryPlan
+        winning_plan = winning_plan.get("queryPlan", winning_plan)
+        audit = IndexAudit(query, _collect_stages(winning_plan))
+        if audit.uses_collection_scan:
+            log.warning(
+                "Query %s on %s performs a collection scan",
+                query.description,
+                query.collection,
+            )
+
+        results.append(audit)
+
+    return results
+
 
 class SuggestionsMongoManager:
     def __init__(self, connection_url):
@@ -19,33 +327,51 @@ class SuggestionsMongoManager:
         self.__mongo = AsyncIOMotorClient(connection_url)
         self.db = self.__mongo[self.database_name]
 
-        self.suggestions: Document = Document(
+        self.suggestions: Document = InstrumentedDocument(
             self.db, "suggestions", converter=Suggestion
         )
-        self.guild_configs: Document = Document(
+        self.guild_configs: Document = InstrumentedDocument(
             self.db, "guild_configs", converter=GuildConfig
         )
-        self.premium_guild_configs: Document = Document(
+        self.premium_guild_configs: Document = InstrumentedDocument(
             self.db, "premium_guild_configs", converter=PremiumGuildConfig
         )
-        self.user_configs: Document = Document(
+        self.user_configs: Document = InstrumentedDocument(
             self.db, "user_configs", converter=UserConfig
         )
-        self.beta_links: Document = Document(self.db, "beta_links")
-        self.cluster_guild_counts: Document = Document(self.db, "cluster_guild_counts")
-        self.cluster_shutdown_requests: Document = Document(
+        self.beta_links: Document = InstrumentedDocument(self.db, "beta_links")
+        self.cluster_guild_counts: Document = InstrumentedDocument(
+            self.db, "cluster_guild_counts"
+        )
+        self.cluster_shutdown_requests: Document = InstrumentedDocument(
             self.db, "cluster_shutdown_requests"
         )
-        self.member_stats: Document = Document(
+        self.member_stats: Document = InstrumentedDocument(
             self.db, "member_stats", converter=MemberStats
         )
-        self.locale_tracking: Document = Document(self.db, "locale_tracking")
-        self.error_tracking: Document = Document(
+        self.locale_tracking: Document = InstrumentedDocument(
+            self.db, "locale_tracking"
+        )
+        self.locale_usage: Document = InstrumentedDocument(self.db, "locale_usage")
+        self.stats_rollups: Document = InstrumentedDocument(self.db, "stats_rollups")
+        self.guild_vote_emojis: Document = InstrumentedDocument(
+            self.db, "guild_vote_emojis"
+        )
+        self.error_tracking: Document = InstrumentedDocument(
             self.db, "error_tracking", converter=Error
         )
-        self.queued_suggestions: Document = Document(
+        self.error_fingerprints: Document = InstrumentedDocument(
+            self.db, "error_fingerprints"
+        )
+        self.queued_suggestions: Document = InstrumentedDocument(
             self.db, "queued_suggestions", converter=QueuedSuggestion
         )
-        self.interaction_events: Document = Document(
+        self.interaction_events: Document = InstrumentedDocument(
             self.db, "interaction_create_stats"
         )
+
+    async def ensure_indexes(self) -> None:
+        await ensure_indexes(self.db)
+
+    async def audit_indexes(self) -> list[IndexAudit]:
+        return await audit_indexes(self.db)
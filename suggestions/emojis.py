@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Mapping, Any
+
+from alaric.meta import All
+from disnake import PartialEmoji
 
 if TYPE_CHECKING:
     from suggestions import SuggestionsBot
@@ -10,14 +13,16 @@ log = logging.getLogger(__name__)
 
 
 class Emojis:
-    """A class to put all emojis in one place."""
+    """A class to put all emojis in one place.
+
+    Everything here is built from known ids, so rendering
+    embeds or buttons never needs to touch the network.
+    """
 
     thumbs_up = "👍"
     thumbs_down = "👎"
     _tick = 605265580416565269  # "<:nerdSuccess:605265580416565269>"
     _cross = 605265598343020545  # "<:nerdError:605265598343020545>"
-    tick = None
-    cross = None
 
     def __init__(self, bot: SuggestionsBot):
         self.bot: SuggestionsBot = bot
@@ -27,21 +32,67 @@ class Emojis:
             self._tick = 756633653668479117
             self._cross = 756633653286797443
 
-    async def populate_emojis(self):
-        guild_id = self.bot.main_guild_id if self.bot.is_prod else 737166408525283348
-        guild = await self.bot.fetch_guild(guild_id)
-        self.tick = await guild.fetch_emoji(self._tick)
-        self.cross = await guild.fetch_emoji(self._cross)
-        log.info("Populated default emojis")
+        self.tick: PartialEmoji = PartialEmoji(name="nerdSuccess", id=self._tick)
+        self.cross: PartialEmoji = PartialEmoji(name="nerdError", id=self._cross)
 
-    async def default_up_vote(self):
-        if not self.tick:
-            await self.populate_emojis()
+        # guild_id -> (up vote, down vote)
+        self.guild_vote_emojis: dict[int, tuple[PartialEmoji, PartialEmoji]] = {}
 
+    def default_up_vote(self) -> PartialEmoji:
         return self.tick
 
-    async def default_down_vote(self):
-        if not self.cross:
-            await self.populate_emojis()
-
+    def default_down_vote(self) -> PartialEmoji:
         return self.cross
+
+    def up_vote_for(self, guild_id: int | None) -> PartialEmoji:
+        """The up vote emoji to use within the given guild."""
+        try:
+            return self.guild_vote_emojis[guild_id][0]  # type: ignore
+        except KeyError:
+            return self.tick
+
+    def down_vote_for(self, guild_id: int | None) -> PartialEmoji:
+        """The down vote emoji to use within the given guild."""
+        try:
+            return self.guild_vote_emojis[guild_id][1]  # type: ignore
+        except KeyError:
+            return self.cross
+
+    def register_guild_vote_emojis(
+        self, guild_id: int, up_vote: str, down_vote: str
+    ) -> None:
+        """Register custom vote emojis for a guild.
+
+        Parameters
+        ----------
+        guild_id: int
+            The guild these emojis are for
+        up_vote: str
+            Either a unicode emoji or the ``<:name:id>`` form
+        down_vote: str
+            Either a unicode emoji or the ``<:name:id>`` form
+        """
+        self.guild_vote_emojis[guild_id] = (
+            PartialEmoji.from_str(up_vote),
+            PartialEmoji.from_str(down_vote),
+        )
+
+    def load_guild_vote_emojis(self, data: Iterable[Mapping[str, Any]]) -> int:
+        """Bulk register custom vote emojis.
+
+        Each entry should contain ``_id``, ``up_vote``
+        and ``down_vote`` keys. Returns how many were loaded.
+        """
+        count = 0
+        for entry in data:
+            self.register_guild_vote_emojis(
+                entry["_id"], entry["up_vote"], entry["down_vote"]
+            )
+            count += 1
+
+        return count
+
+    async def load(self):
+        data = await self.bot.db.guild_vote_emojis.find_many(All(), try_convert=False)
+        count = self.load_guild_vote_emojis(data)
+        log.info("Loaded custom vote emojis for %s guilds", count)
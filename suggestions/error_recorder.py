@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+import commons
+from commons.caching import TimedCache
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from suggestions.objects import Error
+
+if TYPE_CHECKING:
+    from suggestions import SuggestionsBot
+
+log = logging.getLogger(__name__)
+
+
+class ErrorRecorder:
+    """Persists errors, deduplicated by fingerprint.
+
+    Each occurrence is written to error_tracking as it is
+    recorded, just without the traceback, so an error id is
+    resolvable as soon as it is shown to a user. The full
+    traceback is stored once per fingerprint within
+    error_fingerprints alongside a running count, which is
+    batched in the background.
+    """
+
+    def __init__(
+        self,
+        bot: SuggestionsBot,
+        *,
+        flush_interval: datetime.timedelta = datetime.timedelta(seconds=5),
+        max_pending: int = 500,
+        max_buffered: int = 5000,
+    ):
+        self.bot: SuggestionsBot = bot
+        self.flush_interval: datetime.timedelta = flush_interval
+        self.max_pending: int = max_pending
+        # Errors from failed flushes are kept until
+        # we are holding this many, then dropped
+        self.max_buffered: int = max_buffered
+        self._pending: list[Error] = []
+        # Errors which failed to be written to error_tracking
+        self._untracked: list[Error] = []
+        # Fingerprints we know have their traceback stored
+        self._known_fingerprints: TimedCache[str, None] = TimedCache(
+            global_ttl=datetime.timedelta(hours=1),
+            lazy_eviction=False,
+            ttl_from_last_access=True,
+        )
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self._untracked)
+
+    async def record(self, error: Error) -> None:
+        """Write an error to error_tracking and queue its fingerprint.
+
+        Failing to write the error queues it to be retried
+        by the background flush rather than raising.
+        """
+        self._pending.append(error)
+        try:
+            await self.bot.db.error_tracking.insert(self._as_tracked(error))
+        except DuplicateKeyError:
+            return
+        except Exception as e:
+            log.error(
+                "Failed to persist error %s, retrying next flush",
+                error.id,
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
+            self._untracked = self._requeue(self._untracked, [error])
+
+    @staticmethod
+    def _as_tracked(error: Error) -> dict[str, Any]:
+        return {**error.as_dict(), "traceback": None}
+
+    def _requeue(self, queue: list[Error], errors: list[Error]) -> list[Error]:
+        """Put errors from a failed flush back in front of ``queue``."""
+        errors = errors + queue
+        dropped = len(self) + len(errors) - len(queue) - self.max_buffered
+        if dropped > 0:
+            log.warning("Dropping %s errors which could not be persisted", dropped)
+            # Keep the newest errors
+            errors = errors[dropped:]
+
+        return errors
+
+    async def flush(self) -> None:
+        await self._flush_fingerprints()
+        await self._flush_tracking()
+
+    async def _flush_fingerprints(self) -> None:
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = []
+
+        # fingerprint -> (first occurrence, count, last seen)
+        fingerprints: dict[str, tuple[Error, int, datetime.datetime]] = {}
+        for error in pending:
+            first, count, _ = fingerprints.get(
+                error.fingerprint, (error, 0, error.created_at)
+            )
+            fingerprints[error.fingerprint] = (first, count + 1, error.created_at)
+
+        fingerprint_requests: list[UpdateOne] = []
+        for fingerprint, (error, count, last_seen_at) in fingerprints.items():
+            update: dict[str, Any] = {
+                "$inc": {"count": count},
+                "$set": {"last_seen_at": last_seen_at},
+            }
+            if fingerprint not in self._known_fingerprints:
+                update["$setOnInsert"] = {
+                    "error": error.error,
+                    "command_name": error.command_name,
+                    "traceback": error.traceback,
+                    "first_seen_at": error.created_at,
+                }
+            fingerprint_requests.append(
+                UpdateOne({"_id": fingerprint}, update, upsert=True)
+            )
+
+        try:
+            await self.bot.db.error_fingerprints.bulk_write(
+                fingerprint_requests, ordered=False
+            )
+        except Exception as e:
+            log.error(
+                "Failed to persist %s errors, retrying next flush",
+                len(pending),
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
+            self._pending = self._requeue(self._pending, pending)
+            return
+
+        for fingerprint in fingerprints.keys():
+            self._known_fingerprints.add_entry(fingerprint, None, override=True)
+
+    async def _flush_tracking(self) -> None:
+        if not self._untracked:
+            return
+
+        # Kept apart from the fingerprints so a retry
+        # here doesn't count these errors a second time
+        untracked = self._untracked
+        self._untracked = []
+        try:
+            await self.bot.db.error_tracking.bulk_write(
+                [InsertOne(self._as_tracked(error)) for error in untracked],
+                ordered=False,
+            )
+        except Exception as e:
+            log.error(
+                "Failed to persist %s error ids, retrying next flush",
+                len(untracked),
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
+            self._untracked = self._requeue(self._untracked, untracked)
+
+    async def fetch_traceback(self, error: Error) -> Optional[str]:
+        """Fetch the traceback for an error, wherever it is stored."""
+        if error.traceback is not None:
+            return error.traceback
+
+        data = await self.bot.db.error_fingerprints.find(
+            {"_id": error.fingerprint}, try_convert=False
+        )
+        return data["traceback"] if data else None
+
+    async def load(self) -> None:
+        self.bot.state.add_background_task(asyncio.create_task(self.push_errors()))
+
+    async def push_errors(self) -> None:
+        state = self.bot.state
+        while not state.is_closing:
+            await commons.sleep_with_condition(
+                self.flush_interval.total_seconds(),
+                lambda: state.is_closing or len(self) >= self.max_pending,
+                interval=1,
+            )
+            await self.flush()
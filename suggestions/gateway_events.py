@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import time
+from typing import Iterable, Optional
+
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from suggestions import constants
+
+
+class GatewayEventCounts:
+    """Counts of every gateway event received, per shard.
+
+    Each shard gets a fixed size table with a slot per known
+    event type so counting is a single list increment. Counts
+    and per shard event rates are read by OTel observable
+    instruments whenever the metric reader collects, so the
+    export interval is controlled by OTEL_METRIC_EXPORT_INTERVAL.
+    """
+
+    UNKNOWN = "UNKNOWN"
+
+    def __init__(
+        self, event_types: Iterable[str], shard_ids: Optional[Iterable[int]] = None
+    ):
+        self.event_types: list[str] = [*sorted(set(event_types)), self.UNKNOWN]
+        self._index: dict[str, int] = {
+            event_type: i for i, event_type in enumerate(self.event_types)
+        }
+        self._unknown_index: int = self._index[self.UNKNOWN]
+        self._counts: dict[int, list[int]] = {}
+        # shard_id -> (monotonic time, total) at the last rate observation
+        self._last_observed: dict[int, tuple[float, int]] = {}
+
+        for shard_id in shard_ids or []:
+            self.register_shard(shard_id)
+
+        constants.METER.create_observable_counter(
+            "suggestions.gateway.events",
+            callbacks=[self.observe_counts],
+            unit="{event}",
+            description="Gateway events received by shard and event type",
+        )
+        constants.METER.create_observable_gauge(
+            "suggestions.gateway.event_rate",
+            callbacks=[self.observe_rates],
+            unit="{event}/s",
+            description="Gateway events per second by shard",
+        )
+
+    def register_shard(self, shard_id: int) -> list[int]:
+        counts = self._counts.get(shard_id)
+        if counts is None:
+            counts = self._counts[shard_id] = [0] * len(self.event_types)
+            self._last_observed[shard_id] = (time.monotonic(), 0)
+
+        return counts
+
+    def increment(self, shard_id: int, event_type: str) -> None:
+        counts = self._counts.get(shard_id)
+        if counts is None:
+            counts = self.register_shard(shard_id)
+
+        counts[self._index.get(event_type, self._unknown_index)] += 1
+
+    def count(self, shard_id: int, event_type: str) -> int:
+        counts = self._counts.get(shard_id)
+        if counts is None:
+            return 0
+
+        return counts[self._index.get(event_type, self._unknown_index)]
+
+    def total(self, shard_id: int) -> int:
+        return sum(self._counts.get(shard_id, ()))
+
+    def observe_counts(self, options: CallbackOptions) -> Iterable[Observation]:
+        for shard_id, counts in self._counts.items():
+            for event_type, count in zip(self.event_types, counts):
+                if count:
+                    yield Observation(
+                        count, {"shard.id": shard_id, "event.type": event_type}
+                    )
+
+    def observe_rates(self, options: CallbackOptions) -> Iterable[Observation]:
+        now = time.monotonic()
+        for shard_id in self._counts.keys():
+            total = self.total(shard_id)
+            last_time, last_total = self._last_observed[shard_id]
+            self._last_observed[shard_id] = (now, total)
+            elapsed = now - last_time
+            if elapsed > 0:
+                yield Observation(
+                    (total - last_total) / elapsed, {"shard.id": shard_id}
+                )
@@ -1,34 +1,63 @@
-import re
-from typing import Optional
+from __future__ import annotations
+
+from types import FrameType
+from typing import Iterator, Optional
 
 from suggestions import ErrorCode
 
-failed_suggestion_channel_fetch = re.compile(
-    r".*File \"/bot/suggestions/cogs/suggestion_cog\.py\", line \d+, in suggest"
-    r".*\n {4}channel: WrappedChannel = await self\.bot\.get_or_fetch_channel\("
-)
-failed_suggestion_channel_send = re.compile(
-    r'.*File "/bot/suggestions/cogs/suggestion_cog\.py", line \d+, in suggest.*\n'
-    r" {4}message: disnake\.Message = await channel\.send\("
-)
-failed_log_channel_fetch = re.compile(
-    r'.*File "/bot/suggestions/cogs/suggestion_cog\.py", line \d+, in (reject|approve).*\n'
-    r' {4}await suggestion\.resolve\(\n {2}File "/bot/suggestions/objects/suggestion\.py", '
-    r"line \d+, in resolve\n {4}await self\.edit_message_after_finalization\(\n {2}File "
-    r'"/bot/suggestions/objects/suggestion\.py", line \d+, in edit_message_after_finalization\n'
-    r" {4}channel: WrappedChannel = await bot\.get_or_fetch_channel\(\n"
-)
-
-
-def try_parse_http_error(traceback: str) -> Optional[ErrorCode]:
-    """Given an HTTP error try narrow down what caused it."""
-    if failed_suggestion_channel_fetch.search(traceback):
-        return ErrorCode.MISSING_FETCH_PERMISSIONS_IN_SUGGESTIONS_CHANNEL
-
-    elif failed_log_channel_fetch.search(traceback):
-        return ErrorCode.MISSING_FETCH_PERMISSIONS_IN_LOGS_CHANNEL
-
-    elif failed_suggestion_channel_send.search(traceback):
-        return ErrorCode.MISSING_SEND_PERMISSIONS_IN_SUGGESTION_CHANNEL
+# (caller, callee) -> error code
+#
+# Matched against the qualified names of adjacent frames
+# in the traceback, so these keep working as lines move
+CALL_SITE_ERROR_CODES: dict[tuple[str, str], ErrorCode] = {
+    (
+        "Suggestion.setup_initial_messages",
+        "SuggestionsBot.get_or_fetch_channel",
+    ): ErrorCode.MISSING_FETCH_PERMISSIONS_IN_SUGGESTIONS_CHANNEL,
+    (
+        "Suggestion.edit_message_after_finalization",
+        "SuggestionsBot.get_or_fetch_channel",
+    ): ErrorCode.MISSING_FETCH_PERMISSIONS_IN_SUGGESTIONS_CHANNEL,
+    (
+        "Suggestion._fetch_log_channel",
+        "SuggestionsBot.get_or_fetch_channel",
+    ): ErrorCode.MISSING_FETCH_PERMISSIONS_IN_LOGS_CHANNEL,
+    (
+        "Suggestion.setup_initial_messages",
+        "Messageable.send",
+    ): ErrorCode.MISSING_SEND_PERMISSIONS_IN_SUGGESTION_CHANNEL,
+}
+
+
+def _iter_tracebacks(exception: BaseException) -> Iterator[list[FrameType]]:
+    """The frames of each exception in the chain, outermost frame first."""
+    seen: set[int] = set()
+    current: Optional[BaseException] = exception
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        frames: list[FrameType] = []
+        tb = current.__traceback__
+        while tb is not None:
+            frames.append(tb.tb_frame)
+            tb = tb.tb_next
+
+        yield frames
+        current = current.__cause__ or current.__context__
+
+
+def try_parse_http_error(exception: BaseException) -> Optional[ErrorCode]:
+    """Given an HTTP error try narrow down what caused it.
+
+    This walks the traceback frames looking for a known
+    call site rather than formatting and searching the
+    traceback text.
+    """
+    for frames in _iter_tracebacks(exception):
+        for caller, callee in zip(frames, frames[1:]):
+            error_code = CALL_SITE_ERROR_CODES.get(
+                (caller.f_code.co_qualname, callee.f_code.co_qualname)
+            )
+            if error_code is not None:
+                return error_code
 
     return None
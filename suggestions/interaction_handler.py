@@ -6,6 +6,8 @@ import disnake
 from commons.caching import NonExistentEntry
 
 from suggestions.exceptions import ConflictingHandlerInformation, ErrorHandled
+from suggestions.auto_defer import defer
+from suggestions.interaction_metrics import record_first_response
 
 if TYPE_CHECKING:
     from suggestions import SuggestionsBot
@@ -87,6 +89,9 @@ class InteractionHandler:
             raise ValueError("Expected at-least one value to send.")
 
         value = await self.interaction.send(ephemeral=self.ephemeral, **data)
+        if not self.has_sent_something:
+            record_first_response(self.interaction)
+
         self.has_sent_something = True
         return value
 
@@ -100,7 +105,12 @@ class InteractionHandler:
         i_just_want_an_instance: bool = False,
         requires_premium: bool = False,
     ) -> InteractionHandler:
-        """Generate a new instance and defer the interaction."""
+        """Generate a new instance and defer the interaction.
+
+        Commands using ``requires_premium`` must set ``AUTO_DEFER``
+        to False in their extras, the premium response can't be
+        sent once the dispatcher has deferred the interaction.
+        """
         instance = cls(interaction, ephemeral, with_message)
 
         if requires_premium and not instance.has_premium:
@@ -109,9 +119,9 @@ class InteractionHandler:
 
         if not i_just_want_an_instance:
             # TODO Remove this once BT-10 is resolved
-            await interaction.response.defer(
-                ephemeral=ephemeral, with_message=with_message
-            )
+            # The dispatcher may have already deferred this for
+            # us if checks were slow, either way it's deferred now
+            await defer(interaction, ephemeral=ephemeral, with_message=with_message)
             instance.is_deferred = True
 
         # Register this on the bot instance so other areas can
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import time
+from contextvars import ContextVar
+from typing import Iterator
+
+import disnake
+
+from suggestions import constants
+
+# Discord fails an interaction which isn't acknowledged within this
+ACK_DEADLINE: float = 3
+# Acknowledgements later than this are counted as near misses
+ACK_NEAR_MISS: float = float(os.environ.get("INTERACTION_ACK_NEAR_MISS", 2.5))
+
+# What the interaction currently being handled is, for example
+# "/suggest" or the component name. Set by the command and
+# component dispatchers so handlers can attribute their timings.
+current_interaction: ContextVar[tuple[str, str]] = ContextVar(
+    "current_interaction", default=("unknown", "unknown")
+)
+
+end_to_end_latency = constants.METER.create_histogram(
+    "suggestions.interaction.duration",
+    unit="s",
+    description="Time from an interaction being created until we finished handling it",
+)
+time_to_first_response = constants.METER.create_histogram(
+    "suggestions.interaction.time_to_first_response",
+    unit="s",
+    description="Time from an interaction being created until we first sent a message",
+)
+time_to_defer = constants.METER.create_histogram(
+    "suggestions.interaction.time_to_defer",
+    unit="s",
+    description="Time from an interaction being created until it was deferred",
+)
+ack_near_misses = constants.METER.create_counter(
+    "suggestions.interaction.ack_near_misses",
+    description="Interactions acknowledged close to or after the 3 second deadline",
+)
+
+
+def interaction_age(interaction: disnake.Interaction) -> float:
+    """How many seconds ago Discord created this interaction."""
+    return time.time() - disnake.utils.snowflake_time(interaction.id).timestamp()
+
+
+def _attributes() -> dict[str, str]:
+    interaction_type, name = current_interaction.get()
+    return {"interaction.type": interaction_type, "interaction.name": name}
+
+
+@contextlib.contextmanager
+def track_interaction(
+    interaction: disnake.Interaction, interaction_type: str, name: str
+) -> Iterator[None]:
+    """Attribute timings within this block to the given interaction.
+
+    Records the end to end latency once the block exits.
+    """
+    token = current_interaction.set((interaction_type, name))
+    try:
+        yield
+    finally:
+        end_to_end_latency.record(interaction_age(interaction), _attributes())
+        current_interaction.reset(token)
+
+
+def record_acknowledged(interaction: disnake.Interaction) -> None:
+    """Record how long it took to defer, counting near misses."""
+    age = interaction_age(interaction)
+    attributes = _attributes()
+    time_to_defer.record(age, attributes)
+    if age >= ACK_DEADLINE:
+        ack_near_misses.add(1, {**attributes, "ack.result": "missed"})
+    elif age >= ACK_NEAR_MISS:
+        ack_near_misses.add(1, {**attributes, "ack.result": "near_miss"})
+
+
+def record_first_response(interaction: disnake.Interaction) -> None:
+    time_to_first_response.record(interaction_age(interaction), _attributes())
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from enum import Enum
+from typing import TYPE_CHECKING
+
+import commons
+
+from suggestions import constants
+
+if TYPE_CHECKING:
+    from suggestions import SuggestionsBot
+
+log = logging.getLogger(__name__)
+
+invalidations_counter = constants.METER.create_counter(
+    "suggestions.cache.invalidations",
+    description="Cache invalidations published to or received from other clusters",
+)
+
+
+class InvalidationEntity(str, Enum):
+    GUILD_CONFIG = "gc"
+    USER_CONFIG = "uc"
+    BLOCKLIST = "bl"
+
+
+class InvalidationBus:
+    """Tells every other cluster when cached state has changed.
+
+    Messages are ``entity:id:written_at:cluster_id`` where written_at
+    is the writer's time in nanoseconds. On receipt the relevant
+    cache entry is evicted so the next lookup goes back to the
+    database. Evicting is idempotent, so duplicated or out of
+    order messages are harmless and are not filtered out. Clocks
+    differ between hosts, which makes written_at unsafe to order by.
+
+    If the subscription drops we may have missed messages, so
+    all affected caches are cleared before resubscribing.
+    """
+
+    CHANNEL = "suggestions:invalidations"
+
+    def __init__(self, bot: SuggestionsBot):
+        self.bot: SuggestionsBot = bot
+
+    async def publish(self, entity: InvalidationEntity, entity_id: int) -> None:
+        """Tell other clusters ``entity_id`` changed.
+
+        Failing to publish is logged rather than raised as the
+        write itself has already succeeded, other clusters will
+        pick the change up once their cache entry expires.
+        """
+        message = f"{entity.value}:{entity_id}:{time.time_ns()}:{self.bot.cluster_id}"
+        try:
+            await constants.REDIS_CLIENT.publish(self.CHANNEL, message)
+        except Exception as e:
+            log.warning(
+                "Failed to publish invalidation %s",
+                message,
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
+            return
+
+        invalidations_counter.add(
+            1, {"invalidation.entity": entity.name, "invalidation.direction": "sent"}
+        )
+
+    def evict(self, entity: InvalidationEntity, entity_id: int) -> None:
+        state = self.bot.state
+        if entity in (InvalidationEntity.GUILD_CONFIG, InvalidationEntity.BLOCKLIST):
+            state.guild_configs.delete_entry(entity_id)
+        elif entity is InvalidationEntity.USER_CONFIG:
+            state.user_configs.delete_entry(entity_id)
+
+    def evict_all(self) -> None:
+        state = self.bot.state
+        for cache in (state.guild_configs, state.user_configs):
+            for key in list(cache.cache.keys()):
+                cache.delete_entry(key)
+
+    def handle_message(self, raw_message: bytes) -> None:
+        try:
+            entity, entity_id, _, cluster_id = raw_message.decode().split(":")
+            entity = InvalidationEntity(entity)
+            entity_id, cluster_id = int(entity_id), int(cluster_id)
+        except ValueError:
+            log.warning("Received malformed invalidation %r", raw_message)
+            return
+
+        if cluster_id == self.bot.cluster_id:
+            # We already updated our own cache when writing
+            return
+
+        self.evict(entity, entity_id)
+        invalidations_counter.add(
+            1,
+            {"invalidation.entity": entity.name, "invalidation.direction": "received"},
+        )
+
+    async def load(self) -> None:
+        self.bot.state.add_background_task(asyncio.create_task(self.listen()))
+
+    async def listen(self) -> None:
+        state = self.bot.state
+        while not state.is_closing:
+            try:
+                async with constants.REDIS_CLIENT.pubsub() as pubsub:
+                    await pubsub.subscribe(self.CHANNEL)
+                    # Anything could have changed while we weren't listening
+                    self.evict_all()
+                    while not state.is_closing:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=1
+                        )
+                        if message is not None:
+                            self.handle_message(message["data"])
+
+            except Exception as e:
+                log.error(
+                    "Cache invalidation subscription failed, resubscribing",
+                    extra={"error.traceback": commons.exception_as_string(e)},
+                )
+                await commons.sleep_with_condition(5, lambda: state.is_closing)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import time
+from typing import TYPE_CHECKING, Optional
+
+import commons
+
+from suggestions import constants
+
+if TYPE_CHECKING:
+    from suggestions import SuggestionsBot
+
+log = logging.getLogger(__name__)
+
+identify_wait = constants.METER.create_histogram(
+    "suggestions.gateway.identify_wait",
+    unit="s",
+    description="Time shards spent waiting for an identify slot",
+)
+shard_ready_duration = constants.METER.create_histogram(
+    "suggestions.gateway.shard_ready_duration",
+    unit="s",
+    description="Time from a shard being launched until it received READY or RESUMED",
+)
+
+
+class LaunchScheduler:
+    """Launches shards as quickly as Discord's identify limits allow.
+
+    Discord lets each rate limit bucket, ``shard_id % max_concurrency``,
+    identify once every ``identify_interval``. Every bucket is
+    launched in parallel while shards within a bucket are
+    launched one after another.
+
+    Identify slots are claimed in Redis as every cluster shares
+    the same limit. Should Redis be unavailable we fall back
+    to only pacing our own identifies.
+    """
+
+    def __init__(
+        self,
+        bot: SuggestionsBot,
+        *,
+        identify_interval: datetime.timedelta = datetime.timedelta(seconds=5),
+    ):
+        self.bot: SuggestionsBot = bot
+        self.identify_interval: datetime.timedelta = identify_interval
+        self.max_concurrency: int = 1
+        # shard_id -> perf_counter of when it was launched,
+        # removed once the shard is ready
+        self._launch_started: dict[int, float] = {}
+        # bucket -> monotonic time our last identify was sent
+        self._last_identify: dict[int, float] = {}
+        # shard_id -> seconds it took to become ready
+        self.ready_timings: dict[int, float] = {}
+
+    @staticmethod
+    def key_for(bucket: int) -> str:
+        return f"bot:identify_slot:{bucket}"
+
+    def bucket_for(self, shard_id: int) -> int:
+        return shard_id % self.max_concurrency
+
+    @property
+    def _interval_ms(self) -> int:
+        return int(self.identify_interval.total_seconds() * 1000)
+
+    async def _wait_locally(self, bucket: int) -> None:
+        last = self._last_identify.get(bucket)
+        if last is not None:
+            remaining = last + self.identify_interval.total_seconds()
+            await asyncio.sleep(max(0.0, remaining - time.monotonic()))
+
+    async def acquire_identify_slot(self, shard_id: int) -> None:
+        """Wait until this shard is allowed to identify."""
+        bucket = self.bucket_for(shard_id)
+        start = time.perf_counter()
+        while True:
+            try:
+                acquired = await constants.REDIS_CLIENT.set(
+                    self.key_for(bucket),
+                    f"{self.bot.cluster_id}:{shard_id}",
+                    nx=True,
+                    px=self._interval_ms,
+                )
+                if acquired:
+                    break
+
+                # -2 if the slot just freed up, -1 should never happen
+                wait_ms = await constants.REDIS_CLIENT.pttl(self.key_for(bucket))
+            except Exception as e:
+                log.warning(
+                    "Failed to claim an identify slot for shard %s, pacing locally",
+                    shard_id,
+                    extra={"error.traceback": commons.exception_as_string(e)},
+                )
+                await self._wait_locally(bucket)
+                break
+
+            await asyncio.sleep(max(wait_ms, 50) / 1000)
+
+        self._last_identify[bucket] = time.monotonic()
+        waited = time.perf_counter() - start
+        identify_wait.record(waited)
+        log.debug("Shard %s waited %.2fs to identify", shard_id, waited)
+
+    async def _launch_bucket(
+        self, gateway: str, shard_ids: list[int], initial_shard: int
+    ) -> None:
+        for shard_id in shard_ids:
+            self._launch_started[shard_id] = time.perf_counter()
+            await self.bot.launch_shard(
+                gateway, shard_id, initial=shard_id == initial_shard
+            )
+
+    async def launch(
+        self,
+        gateway: str,
+        shard_ids: list[int],
+        *,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        """Launch these shards, one task per rate limit bucket.
+
+        Parameters
+        ----------
+        gateway: str
+            The gateway to connect to
+        shard_ids: list[int]
+            The shards to launch
+        max_concurrency: Optional[int]
+            From the session start limit, defaults to
+            whatever it was when we last launched shards
+        """
+        if max_concurrency is not None:
+            self.max_concurrency = max(1, max_concurrency)
+
+        buckets: dict[int, list[int]] = {}
+        for shard_id in shard_ids:
+            buckets.setdefault(self.bucket_for(shard_id), []).append(shard_id)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                self._launch_bucket(gateway, bucket_shards, shard_ids[0])
+                for bucket_shards in buckets.values()
+            )
+        )
+        log.info(
+            "Launched %s shards across %s identify buckets in %.2fs",
+            len(shard_ids),
+            len(buckets),
+            time.perf_counter() - start,
+        )
+
+    def _shard_ready(self, shard_id: int, connect: str) -> None:
+        started = self._launch_started.pop(shard_id, None)
+        if started is None:
+            # A reconnect rather than a launch
+            return
+
+        duration = time.perf_counter() - started
+        self.ready_timings[shard_id] = duration
+        shard_ready_duration.record(
+            duration, {"shard.id": shard_id, "shard.connect": connect}
+        )
+        log.info("Shard %s %s after %.2fs", shard_id, connect, duration)
+
+        if not self._launch_started:
+            slowest = max(self.ready_timings, key=self.ready_timings.__getitem__)
+            log.info(
+                "All %s launched shards are ready, slowest was shard %s at %.2fs",
+                len(self.ready_timings),
+                slowest,
+                self.ready_timings[slowest],
+            )
+
+    async def on_shard_connect(self, shard_id: int) -> None:
+        self._shard_ready(shard_id, "identified")
+
+    async def on_shard_resumed(self, shard_id: int) -> None:
+        self._shard_ready(shard_id, "resumed")
+
+    async def load(self) -> None:
+        self.bot.add_listener(self.on_shard_connect, "on_shard_connect")
+        self.bot.add_listener(self.on_shard_resumed, "on_shard_resumed")
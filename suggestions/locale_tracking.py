@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from typing import TYPE_CHECKING, Optional
+
+import commons
+from pymongo import UpdateOne
+
+from suggestions import constants
+
+if TYPE_CHECKING:
+    from suggestions import SuggestionsBot
+
+log = logging.getLogger(__name__)
+
+dropped_counter = constants.METER.create_counter(
+    "suggestions.locale_tracking.dropped",
+    description="Locale tracking events dropped because the buffer was full",
+)
+
+
+class LocaleTracker:
+    """Buffers locale usage and writes it in bulk.
+
+    Counts are aggregated per (locale, guild_id) so a
+    busy guild costs a single upsert per flush rather
+    than an insert per command.
+
+    These are kept per UTC day in ``locale_usage``, apart
+    from the per event documents in ``locale_tracking``,
+    so reports can cover any window of days.
+    """
+
+    def __init__(
+        self,
+        bot: SuggestionsBot,
+        *,
+        max_pending: int = 10_000,
+        flush_interval: datetime.timedelta = datetime.timedelta(minutes=1),
+    ):
+        self.bot: SuggestionsBot = bot
+        self.max_pending: int = max_pending
+        self.flush_interval: datetime.timedelta = flush_interval
+        self._pending: dict[tuple[str, Optional[int]], int] = {}
+        self.dropped: int = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def track(self, locale: str, guild_id: Optional[int]) -> None:
+        key = (locale, guild_id)
+        count = self._pending.get(key)
+        if count is not None:
+            self._pending[key] = count + 1
+            return
+
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            dropped_counter.add(1)
+            return
+
+        self._pending[key] = 1
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = {}
+        now = self.bot.state.now
+        day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        try:
+            await self.bot.db.locale_usage.bulk_write(
+                [
+                    UpdateOne(
+                        {"day": day, "locale": locale, "guild_id": guild_id},
+                        {"$inc": {"count": count}, "$set": {"last_seen_at": now}},
+                        upsert=True,
+                    )
+                    for (locale, guild_id), count in pending.items()
+                ],
+                ordered=False,
+            )
+        except Exception as e:
+            log.error(
+                "Failed to flush %s locale tracking entries",
+                len(pending),
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
+            self._requeue(pending)
+
+    def _requeue(self, pending: dict[tuple[str, Optional[int]], int]) -> None:
+        """Merge counts from a failed flush back into the buffer."""
+        for key, count in pending.items():
+            current = self._pending.get(key)
+            if current is not None:
+                self._pending[key] = current + count
+            elif len(self._pending) < self.max_pending:
+                self._pending[key] = count
+            else:
+                self.dropped += count
+                dropped_counter.add(count)
+
+    async def load(self) -> None:
+        self.bot.state.add_background_task(asyncio.create_task(self.push_locales()))
+
+    async def push_locales(self) -> None:
+        state = self.bot.state
+        while not state.is_closing:
+            await commons.sleep_with_condition(
+                self.flush_interval.total_seconds(),
+                lambda: state.is_closing,
+            )
+            await self.flush()
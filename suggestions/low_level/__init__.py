@@ -1,2 +1,11 @@
 from .message_editing import MessageEditing
 from .disnake_state import PatchedConnectionState
+from .interaction_response import acknowledge, guard_response
+from .disnake_version import SUPPORTED_DISNAKE_VERSION, ensure_supported_disnake
+from .shards import (
+    forget_shard,
+    run_shard,
+    shard_websocket,
+    start_ready_sequence,
+    stop_reading,
+)
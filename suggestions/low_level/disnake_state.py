@@ -5,7 +5,9 @@ import typing
 import disnake.state
 
 if typing.TYPE_CHECKING:
+    from disnake.gateway import DiscordWebSocket
     from disnake.types import gateway
+    from suggestions import SuggestionsBot
 
 
 class PatchedConnectionState(disnake.state.AutoShardedConnectionState):
@@ -20,6 +22,27 @@ class PatchedConnectionState(disnake.state.AutoShardedConnectionState):
         super().__init__(*args, **kwargs)
         self.guild_ids: set[int] = set()
 
+    @classmethod
+    def event_types(cls) -> list[str]:
+        """Every gateway event type we have a parser for."""
+        return [attr[6:].upper() for attr in dir(cls) if attr.startswith("parse_")]
+
+    def _update_references(self, ws: DiscordWebSocket) -> None:
+        super()._update_references(ws)
+        # socket_event_type doesn't say which shard it came from,
+        # so count events here where we still know which socket it was
+        bot: SuggestionsBot = self._get_client()  # type: ignore
+        shard_id: int = ws.shard_id or 0
+        dispatch = ws._dispatch
+
+        def counting_dispatch(event: str, *args: typing.Any) -> None:
+            if event == "socket_event_type":
+                bot.stats.increment_event_type(args[0], shard_id)
+
+            dispatch(event, *args)
+
+        ws._dispatch = counting_dispatch
+
     def parse_guild_create(self, data: gateway.GuildCreateEvent) -> None:
         self.guild_ids.add(int(data["id"]))
 
@@ -29,6 +52,26 @@ class PatchedConnectionState(disnake.state.AutoShardedConnectionState):
     def parse_guild_update(self, data: gateway.GuildUpdateEvent) -> None:
         return
 
+    def _evict_channel(self, channel_id: int) -> None:
+        bot: SuggestionsBot = self._get_client()  # type: ignore
+        bot.state.evict_channel(channel_id)
+
+    def parse_channel_update(self, data: gateway.ChannelUpdateEvent) -> None:
+        self._evict_channel(int(data["id"]))
+        super().parse_channel_update(data)
+
+    def parse_channel_delete(self, data: gateway.ChannelDeleteEvent) -> None:
+        self._evict_channel(int(data["id"]))
+        super().parse_channel_delete(data)
+
+    def parse_thread_update(self, data: gateway.ThreadUpdateEvent) -> None:
+        self._evict_channel(int(data["id"]))
+        super().parse_thread_update(data)
+
+    def parse_thread_delete(self, data: gateway.ThreadDeleteEvent) -> None:
+        self._evict_channel(int(data["id"]))
+        super().parse_thread_delete(data)
+
     def parse_guild_role_create(self, data: gateway.GuildRoleCreateEvent) -> None:
         return
 
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import disnake
+
+# The disnake release whose private internals low_level was
+# written against. Bump it only after checking them again
+SUPPORTED_DISNAKE_VERSION = "2.10.1"
+
+
+def ensure_supported_disnake() -> None:
+    """Refuse to start against a disnake low_level wasn't written for.
+
+    Raises
+    ------
+    RuntimeError
+        A different version of disnake is installed
+    """
+    if disnake.__version__ != SUPPORTED_DISNAKE_VERSION:
+        raise RuntimeError(
+            f"suggestions.low_level relies on the internals of disnake "
+            f"{SUPPORTED_DISNAKE_VERSION}, however disnake {disnake.__version__} "
+            f"is installed"
+        )
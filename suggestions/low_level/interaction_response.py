@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import typing
+
+import disnake
+
+# interaction id -> first response currently in flight
+_in_flight: dict[int, asyncio.Task] = {}
+
+
+def _forget(interaction_id: int, task: asyncio.Task) -> None:
+    if _in_flight.get(interaction_id) is task:
+        del _in_flight[interaction_id]
+
+
+async def acknowledge(
+    interaction: disnake.Interaction,
+    respond: typing.Callable[[], typing.Awaitable[typing.Any]],
+) -> bool:
+    """Make ``respond`` the interaction's first response unless it already has one.
+
+    Anything acknowledging an interaction goes through here so
+    whichever gets in second waits on the first rather than
+    Discord rejecting a second acknowledgement.
+
+    Returns
+    -------
+    bool
+        True if ``respond`` was used to acknowledge the interaction
+    """
+    in_flight = _in_flight.get(interaction.id)
+    while in_flight is not None and not in_flight.done():
+        # Doesn't raise, failures are surfaced to whoever made the response
+        await asyncio.wait([in_flight])
+        in_flight = _in_flight.get(interaction.id)
+
+    if interaction.response.is_done():
+        return False
+
+    task = asyncio.create_task(respond())
+    _in_flight[interaction.id] = task
+    task.add_done_callback(lambda _: _forget(interaction.id, task))
+    # Shielded as being cancelled mid request would leave
+    # anyone waiting not knowing if Discord got it or not
+    await asyncio.shield(task)
+    return True
+
+
+class GuardedInteractionResponse(disnake.InteractionResponse):
+    """An interaction response which waits on anything else acknowledging it.
+
+    ``Interaction.send`` picks between responding and a followup
+    before awaiting anything, so a command sending while a defer
+    is in flight would otherwise respond twice.
+    """
+
+    __slots__ = ()
+
+    async def send_message(self, *args, **kwargs) -> None:
+        parent = self._parent
+        sent = await acknowledge(
+            parent,
+            lambda: super(GuardedInteractionResponse, self).send_message(
+                *args, **kwargs
+            ),
+        )
+        if not sent:
+            # Deferred while we waited, so this fills in the deferred message
+            await parent.followup.send(*args, **kwargs)
+
+
+def guard_response(interaction: disnake.Interaction) -> None:
+    """Swap in a response which sends through ``acknowledge``."""
+    response = GuardedInteractionResponse(interaction)
+    response._response_type = interaction.response._response_type
+    # Where disnake caches Interaction.response
+    interaction._cs_response = response  # type: ignore
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+import typing
+
+from disnake.shard import Shard
+
+if typing.TYPE_CHECKING:
+    from disnake import AutoShardedClient, ShardInfo
+    from disnake.gateway import DiscordWebSocket
+    from disnake.state import AutoShardedConnectionState
+
+
+def run_shard(client: AutoShardedClient, shard_id: int, ws: DiscordWebSocket) -> None:
+    """Run an already connected websocket as one of the client's shards.
+
+    This is what AutoShardedClient.launch_shard does once it
+    has connected, for sockets we connect ourselves.
+    """
+    shard = Shard(ws, client, client._AutoShardedClient__queue.put_nowait)
+    client._AutoShardedClient__shards[shard_id] = shard
+    shard.launch()
+
+
+def forget_shard(client: AutoShardedClient, shard_id: int) -> None:
+    """Stop the client tracking a shard whose websocket is already closed."""
+    client._AutoShardedClient__shards.pop(shard_id, None)
+
+
+def start_ready_sequence(state: AutoShardedConnectionState) -> None:
+    """Start waiting on guilds as READY does, unless that's already underway."""
+    if not hasattr(state, "_ready_state"):
+        state._ready_state = asyncio.Queue()
+    if state._ready_task is None:
+        state._ready_task = asyncio.create_task(state._delay_ready())
+
+
+def shard_websocket(shard: ShardInfo) -> DiscordWebSocket:
+    return shard._parent.ws
+
+
+def stop_reading(shard: ShardInfo) -> None:
+    """Stop reading from a shard's websocket, leaving it open."""
+    shard._parent._cancel_task()
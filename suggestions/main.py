@@ -9,14 +9,16 @@ import sys
 import textwrap
 from traceback import format_exception
 
-import cooldowns
 import disnake
 from disnake import Locale
 from disnake.ext import commands
 
 from suggestions import SuggestionsBot
+from suggestions.auto_defer import AUTO_DEFER_EPHEMERAL, defer
 from suggestions.cooldown_bucket import InteractionBucket
+from suggestions.redis_cooldown import cooldown
 from suggestions.interaction_handler import InteractionHandler
+from suggestions.shard_coordinator import ShardCoordinator
 from suggestions.utility import DisnakePaginator
 
 
@@ -31,19 +33,30 @@ async def create_bot(database_wrapper=None) -> SuggestionsBot:
         cluster_id = int(os.environ["CLUSTER"])
         offset = cluster_id - 1
         number_of_shards_per_cluster = int(os.environ["SHARDS_PER_CLUSTER"])
-        shard_ids = [
-            i
-            for i in range(
-                offset * number_of_shards_per_cluster,
-                (offset * number_of_shards_per_cluster) + number_of_shards_per_cluster,
+        if os.environ.get("SHARD_COORDINATOR"):
+            # Shards are leased from redis instead, see ShardCoordinator
+            shard_coordinator = ShardCoordinator(
+                total_shards=total_shards,
+                shards_per_range=number_of_shards_per_cluster,
             )
-            if i < total_shards
-        ]
+            shard_ids = await shard_coordinator.acquire_initial()
+        else:
+            shard_coordinator = None
+            shard_ids = [
+                i
+                for i in range(
+                    offset * number_of_shards_per_cluster,
+                    (offset * number_of_shards_per_cluster)
+                    + number_of_shards_per_cluster,
+                )
+                if i < total_shards
+            ]
 
         cluster_kwargs = {
             "shard_count": total_shards,
             "cluster": cluster_id,
             "shard_ids": shard_ids,
+            "shard_coordinator": shard_coordinator,
         }
         log.info("Cluster %s - Handling shards %s", cluster_id, shard_ids)
     else:
@@ -59,6 +72,11 @@ async def create_bot(database_wrapper=None) -> SuggestionsBot:
     if not bot.is_prod:
         bot._test_guilds = [737166408525283348]
 
+    if bot.shard_coordinator is not None:
+        # Start renewing the leases straight away
+        # as loading the bot can take a while
+        await bot.shard_coordinator.load(bot)
+
     # TODO Re-enable premium features at later date
     # bot.redis = await redis.from_url(f"{os.environ['REDIS_URL']}?decode_responses=True")
 
@@ -76,8 +94,8 @@ async def create_bot(database_wrapper=None) -> SuggestionsBot:
         """Shows the bots color palette."""
         await bot.colors.show_colors(interaction)
 
-    @bot.slash_command()
-    @cooldowns.cooldown(1, 1, bucket=InteractionBucket.author)
+    @bot.slash_command(extras={AUTO_DEFER_EPHEMERAL: False})
+    @cooldown(1, 1, bucket=InteractionBucket.author)
     async def stats(interaction: disnake.GuildCommandInteraction):
         """Get bot stats!"""
         if bot.is_prod:
@@ -92,7 +110,7 @@ async def create_bot(database_wrapper=None) -> SuggestionsBot:
         )
         if interaction.user.id == 271612318947868673:
             # I want accurate stats
-            await interaction.response.defer(with_message=True)
+            await defer(interaction, with_message=True)
             guilds: int = await bot.get_accurate_guild_count()
         else:
             guilds: int = await bot.stats.fetch_approximate_global_guild_count()
@@ -113,8 +131,8 @@ async def create_bot(database_wrapper=None) -> SuggestionsBot:
             bot.stats.type.STATS,
         )
 
-    @bot.slash_command()
-    @cooldowns.cooldown(1, 1, bucket=InteractionBucket.author)
+    @bot.slash_command(extras={AUTO_DEFER_EPHEMERAL: False})
+    @cooldown(1, 1, bucket=InteractionBucket.author)
     async def info(
         interaction: disnake.CommandInteraction,
         support: bool = commands.Param(
@@ -128,7 +146,7 @@ async def create_bot(database_wrapper=None) -> SuggestionsBot:
         ----------
         support: {{INFO_ARG_SUPPORT}}
         """
-        await interaction.response.defer()
+        await defer(interaction)
         if support and bot.is_prod and interaction.guild_id:
             shard_id = bot.get_shard_id(interaction.guild_id)
             shard = bot.get_shard(shard_id)
@@ -174,8 +192,8 @@ async def create_bot(database_wrapper=None) -> SuggestionsBot:
 
         await interaction.send(embed=embed)
 
-    @bot.slash_command()
-    @cooldowns.cooldown(1, 1, bucket=InteractionBucket.author)
+    @bot.slash_command(extras={AUTO_DEFER_EPHEMERAL: False})
+    @cooldown(1, 1, bucket=InteractionBucket.author)
     async def ping(interaction: disnake.CommandInteraction):
         """
         {{PING}}
@@ -211,7 +229,7 @@ async def create_bot(database_wrapper=None) -> SuggestionsBot:
         """
         Evaluates given code.
         """
-        await ctx.response.defer(ephemeral=True)
+        await defer(ctx, ephemeral=True)
         code = clean_code(code)
 
         # remove protections on string parsing to allow
@@ -1,4 +1,6 @@
 import datetime
+import hashlib
+from typing import Optional
 
 
 class Error:
@@ -13,12 +15,13 @@ class Error:
         "shard_id",
         "created_at",
         "has_been_fixed",
+        "fingerprint",
     ]
 
     def __init__(
         self,
         _id: str,
-        traceback: str,
+        traceback: Optional[str],
         error: str,
         user_id: int,
         guild_id: int,
@@ -27,13 +30,16 @@ class Error:
         shard_id: int,
         created_at: datetime.datetime,
         has_been_fixed: bool = False,
+        fingerprint: Optional[str] = None,
     ):
         self._id: str = _id
         self.error: str = error
         self.user_id: int = user_id
         self.guild_id: int = guild_id
         self.shard_id: int = shard_id
-        self.traceback: str = traceback
+        # Newer records store their traceback once per fingerprint
+        # in error_fingerprints rather than on every occurrence
+        self.traceback: Optional[str] = traceback
         self.cluster_id: int = cluster_id
         self.command_name: str = command_name
         self.created_at: datetime.datetime = created_at
@@ -42,6 +48,20 @@ class Error:
         # as we don't want to delete the error objects but
         # we also don't want to 'fix' already fixed errors
         self.has_been_fixed: bool = has_been_fixed
+        self.fingerprint: str = (
+            fingerprint
+            if fingerprint is not None
+            else self.build_fingerprint(error, traceback, command_name)
+        )
+
+    @staticmethod
+    def build_fingerprint(
+        error: str, traceback: Optional[str], command_name: str
+    ) -> str:
+        """A stable version of __hash__ which is consistent across processes."""
+        return hashlib.sha1(
+            "\0".join((error, traceback or "", command_name or "")).encode()
+        ).hexdigest()
 
     @property
     def id(self) -> str:
@@ -62,6 +82,7 @@ class Error:
             "command_name": self.command_name,
             "created_at": self.created_at,
             "has_been_fixed": self.has_been_fixed,
+            "fingerprint": self.fingerprint,
         }
 
     def __hash__(self):
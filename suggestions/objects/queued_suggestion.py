@@ -18,6 +18,7 @@ from suggestions.objects import Suggestion
 
 if TYPE_CHECKING:
     from suggestions import State, SuggestionsBot
+    from suggestions.objects.user_profile import UserProfile
 
 logger = logging.getLogger(__name__)
 
@@ -269,7 +270,9 @@ class QueuedSuggestion:
         return data
 
     async def as_embed(self, bot: SuggestionsBot) -> Embed:
-        user = await bot.get_or_fetch_user(self.suggestion_author_id)
+        user: UserProfile = await bot.state.user_profiles.fetch(
+            self.suggestion_author_id
+        )
         if self.is_anonymous:
             submitter = "Anonymous"
         else:
@@ -288,7 +291,7 @@ class QueuedSuggestion:
                 # and shouldn't be considered for this purpose
                 id_section = f" ID: {self._id}"
 
-            embed.set_thumbnail(user.display_avatar)
+            embed.set_thumbnail(user.avatar_url)
             embed.set_footer(
                 text=f"Queued suggestion{id_section} | Submitter ID: {self.suggestion_author_id}"
             )
@@ -3,7 +3,13 @@ from typing import List, Dict
 
 
 class MemberCommandStats:
-    __slots__ = ("command_name", "completed_at", "failed_at")
+    __slots__ = (
+        "command_name",
+        "completed_at",
+        "failed_at",
+        "completed_by_day",
+        "failed_by_day",
+    )
 
     def __init__(
         self,
@@ -11,21 +17,36 @@ class MemberCommandStats:
         *,
         completed_at: List[datetime] = None,
         failed_at: List[datetime] = None,
+        completed_by_day: Dict[str, int] = None,
+        failed_by_day: Dict[str, int] = None,
     ):
         self.command_name: str = command_name
         self.completed_at: List[datetime] = completed_at if completed_at else []
         self.failed_at: List[datetime] = failed_at if failed_at else []
+        # Compacted counts for timestamps which have been
+        # folded into daily buckets, keyed by YYYY-MM-DD
+        self.completed_by_day: Dict[str, int] = (
+            completed_by_day if completed_by_day else {}
+        )
+        self.failed_by_day: Dict[str, int] = failed_by_day if failed_by_day else {}
 
     @property
     def success_count(self) -> int:
-        return len(self.completed_at)
+        return len(self.completed_at) + sum(self.completed_by_day.values())
 
     @property
     def failure_count(self) -> int:
-        return len(self.failed_at)
+        return len(self.failed_at) + sum(self.failed_by_day.values())
 
     def as_data_dict(self) -> Dict:
-        return {"completed_at": self.completed_at, "failed_at": self.failed_at}
+        data = {"completed_at": self.completed_at, "failed_at": self.failed_at}
+        if self.completed_by_day:
+            data["completed_by_day"] = self.completed_by_day
+
+        if self.failed_by_day:
+            data["failed_by_day"] = self.failed_by_day
+
+        return data
 
     def __repr__(self):
         return (
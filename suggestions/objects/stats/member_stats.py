@@ -18,6 +18,38 @@ logger = logging.getLogger(__name__)
 
 
 class MemberStats:
+    command_fields: List[str] = [
+        "suggest",
+        "approve",
+        "reject",
+        "clear",
+        "member_dm_view",
+        "member_dm_enable",
+        "member_dm_disable",
+        "guild_config_log_channel",
+        "guild_config_suggest_channel",
+        "guild_config_get",
+        "guild_dm_enable",
+        "guild_dm_disable",
+        "guild_thread_enable",
+        "guild_thread_disable",
+        "guild_keeplogs_enable",
+        "guild_keeplogs_disable",
+        "guild_auto_archive_threads_enable",
+        "guild_auto_archive_threads_disable",
+        "guild_suggestions_queue_enable",
+        "guild_suggestions_queue_disable",
+        "activate_beta",
+        "stats",
+        "approve_by_message_command",
+        "reject_by_message_command",
+        "guild_anonymous_enable",
+        "guild_anonymous_disable",
+        "view_up_voters",
+        "view_down_voters",
+        "view_voters",
+    ]
+
     def __init__(
         self,
         member_id: int,
@@ -27,43 +59,14 @@ class MemberStats:
     ):
         self.member_id: int = member_id
         self.guild_id: int = guild_id
-        self._fields: List[str] = [
-            "suggest",
-            "approve",
-            "reject",
-            "clear",
-            "member_dm_view",
-            "member_dm_enable",
-            "member_dm_disable",
-            "guild_config_log_channel",
-            "guild_config_suggest_channel",
-            "guild_config_get",
-            "guild_dm_enable",
-            "guild_dm_disable",
-            "guild_thread_enable",
-            "guild_thread_disable",
-            "guild_keeplogs_enable",
-            "guild_keeplogs_disable",
-            "guild_auto_archive_threads_enable",
-            "guild_auto_archive_threads_disable",
-            "guild_suggestions_queue_enable",
-            "guild_suggestions_queue_disable",
-            "activate_beta",
-            "stats",
-            "approve_by_message_command",
-            "reject_by_message_command",
-            "guild_anonymous_enable",
-            "guild_anonymous_disable",
-            "view_up_voters",
-            "view_down_voters",
-            "view_voters",
-        ]
+        self._fields: List[str] = self.command_fields
 
+        # Documents are created by partial upserts, so only
+        # the commands someone has actually used will be present
+        self._build_default_commands_dict()
         if commands:
             for k, v in commands.items():
                 setattr(self, k, MemberCommandStats(k, **v))
-        else:
-            self._build_default_commands_dict()
 
         if TYPE_CHECKING:
             self.suggest: MemberCommandStats = ...
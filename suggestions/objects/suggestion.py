@@ -23,6 +23,7 @@ from suggestions.exceptions import (
 from suggestions.interaction_handler import InteractionHandler
 from suggestions.low_level import MessageEditing
 from suggestions.objects import UserConfig, GuildConfig
+from suggestions.objects.user_profile import UserProfile
 
 if TYPE_CHECKING:
     from suggestions import SuggestionsBot, State, Colors
@@ -448,7 +449,9 @@ class Suggestion:
         return data
 
     async def as_embed(self, bot: SuggestionsBot) -> Embed:
-        user = await bot.get_or_fetch_user(self.suggestion_author_id, strict=True)
+        user: UserProfile = await bot.state.user_profiles.fetch(
+            self.suggestion_author_id
+        )
 
         if self.resolved_by:
             return await self._as_resolved_embed(bot, user)
@@ -465,7 +468,7 @@ class Suggestion:
             timestamp=bot.state.now,
         )
         if not self.is_anonymous:
-            embed.set_thumbnail(user.display_avatar)
+            embed.set_thumbnail(user.avatar_url)
             embed.set_footer(
                 text=f"User ID: {self.suggestion_author_id} | sID: {self.suggestion_id}"
             )
@@ -482,19 +485,17 @@ class Suggestion:
 
         if self.uses_views_for_votes:
             results = (
-                f"**Results so far**\n{await bot.suggestion_emojis.default_up_vote()}: **{self.total_up_votes}**\n"
-                f"{await bot.suggestion_emojis.default_down_vote()}: **{self.total_down_votes}**"
+                f"**Results so far**\n{bot.suggestion_emojis.up_vote_for(self.guild_id)}: **{self.total_up_votes}**\n"
+                f"{bot.suggestion_emojis.down_vote_for(self.guild_id)}: **{self.total_down_votes}**"
             )
             embed.description += f"\n\n{results}"
 
         return embed
 
-    async def _as_resolved_embed(
-        self, bot: SuggestionsBot, user: disnake.User
-    ) -> Embed:
+    async def _as_resolved_embed(self, bot: SuggestionsBot, user: UserProfile) -> Embed:
         results = (
-            f"**Results**\n{await bot.suggestion_emojis.default_up_vote()}: **{self.total_up_votes}**\n"
-            f"{await bot.suggestion_emojis.default_down_vote()}: **{self.total_down_votes}**"
+            f"**Results**\n{bot.suggestion_emojis.up_vote_for(self.guild_id)}: **{self.total_up_votes}**\n"
+            f"{bot.suggestion_emojis.down_vote_for(self.guild_id)}: **{self.total_down_votes}**"
         )
 
         if self.is_anonymous:
@@ -515,7 +516,7 @@ class Suggestion:
         )
 
         if not self.is_anonymous:
-            embed.set_thumbnail(user.display_avatar)
+            embed.set_thumbnail(user.avatar_url)
             embed.set_footer(
                 text=f"User ID: {self.suggestion_author_id} | sID: {self.suggestion_id}"
             )
@@ -671,13 +672,15 @@ class Suggestion:
 
         # We need to store results
         # -1 As the bot shouldn't count
-        default_up_vote = await bot.suggestion_emojis.default_up_vote()
-        default_down_vote = await bot.suggestion_emojis.default_down_vote()
+        # Compare on id as the emoji names are not known locally
+        default_up_vote = bot.suggestion_emojis.default_up_vote()
+        default_down_vote = bot.suggestion_emojis.default_down_vote()
         for reaction in message.reactions:
-            if str(reaction.emoji) == str(default_up_vote):
+            reaction_id = getattr(reaction.emoji, "id", None)
+            if reaction_id == default_up_vote.id:
                 self._total_up_votes = reaction.count - 1
 
-            elif str(reaction.emoji) == str(default_down_vote):
+            elif reaction_id == default_down_vote.id:
                 self._total_down_votes = reaction.count - 1
 
         if self.total_up_votes is None or self.total_down_votes is None:
@@ -720,7 +723,9 @@ class Suggestion:
             )
             return
 
-        user = await bot.get_or_fetch_user(self.suggestion_author_id)
+        user: UserProfile = await bot.state.user_profiles.fetch(
+            self.suggestion_author_id
+        )
         icon_url = await bot.try_fetch_icon_url(self.guild_id)
         guild = bot.state.guild_cache.get_entry(self.guild_id)
         text = "approved" if self.state == SuggestionState.approved else "rejected"
@@ -746,14 +751,14 @@ class Suggestion:
         )
 
         try:
-            await user.send(embed=embed)
+            await bot.state.user_profiles.send_dm(user.user_id, embed=embed)
         except disnake.HTTPException:
             logger.debug(
                 "Failed to dm %s to tell them about their suggestion",
-                user.id,
+                user.user_id,
                 extra={
                     "suggestion.id": self.suggestion_id,
-                    "interaction.author.id": user.id,
+                    "interaction.author.id": user.user_id,
                 },
             )
 
@@ -870,7 +875,7 @@ class Suggestion:
         else:
             # Move the suggestion to the logs channel
             await self.save_reaction_results(bot, interaction)
-            channel = await bot.get_or_fetch_channel(guild_config.log_channel_id)
+            channel = await self._fetch_log_channel(guild_config=guild_config, bot=bot)
             try:
                 message: disnake.Message = await channel.send(
                     embed=await self.as_embed(bot)
@@ -890,6 +895,14 @@ class Suggestion:
             self.channel_id = channel.id
             await state.suggestions_db.upsert(self, self)
 
+    @staticmethod
+    async def _fetch_log_channel(
+        *, guild_config: GuildConfig, bot: SuggestionsBot
+    ) -> disnake.TextChannel:
+        # Its own frame so http_error_parser can tell this
+        # apart from fetching the suggestions channel
+        return await bot.get_or_fetch_channel(guild_config.log_channel_id)
+
     async def archive_thread_if_required(
         self, *, guild_config: GuildConfig, bot: SuggestionsBot, locale: disnake.Locale
     ):
@@ -1060,11 +1073,11 @@ class Suggestion:
         components_to_send = [
             await buttons.SuggestionUpVote(
                 suggestion_id=self.suggestion_id,
-                emoji=await bot.suggestion_emojis.default_up_vote(),
+                emoji=bot.suggestion_emojis.up_vote_for(self.guild_id),
             ).as_ui_component(),
             await buttons.SuggestionDownVote(
                 suggestion_id=self.suggestion_id,
-                emoji=await bot.suggestion_emojis.default_down_vote(),
+                emoji=bot.suggestion_emojis.down_vote_for(self.guild_id),
             ).as_ui_component(),
         ]
 
@@ -1210,8 +1223,9 @@ class Suggestion:
                     )
                     return
 
-                user = await bot.get_or_fetch_user(self.suggestion_author_id)
-                await user.send(embed=embed)
+                await bot.state.user_profiles.send_dm(
+                    self.suggestion_author_id, embed=embed
+                )
 
             else:
                 # Send everything to author as it is their suggestion
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import disnake
+
+
+class UserProfile:
+    """The slim subset of a user we need for rendering and DMs.
+
+    Holding this instead of a full disnake.User keeps the
+    user profile cache small even across many users.
+    """
+
+    __slots__ = ["user_id", "display_name", "avatar_url", "dm_channel_id"]
+
+    def __init__(
+        self,
+        user_id: int,
+        display_name: str,
+        avatar_url: str,
+        dm_channel_id: Optional[int] = None,
+    ):
+        self.user_id: int = user_id
+        self.display_name: str = display_name
+        self.avatar_url: str = avatar_url
+        self.dm_channel_id: Optional[int] = dm_channel_id
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.user_id}>"
+
+    @classmethod
+    def from_user(cls, user: disnake.User | disnake.Member) -> UserProfile:
+        # Members have guild specific names and avatars, we
+        # always want the global ones regardless of where we got it
+        dm_channel = getattr(user, "dm_channel", None)
+        return cls(
+            user_id=user.id,
+            display_name=user.global_name or user.name,
+            avatar_url=(user.avatar or user.default_avatar).url,
+            dm_channel_id=dm_channel.id if dm_channel is not None else None,
+        )
+
+    def __repr__(self):
+        return f"UserProfile(user_id={self.user_id}, display_name={self.display_name})"
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import functools
+import logging
+import time
+from typing import Any, Callable, Optional, Union
+
+import commons
+from cooldowns import CallableOnCooldown
+from cooldowns.date_util import _utc_from_timestamp
+from cooldowns.utils import maybe_coro
+from redis.commands.core import AsyncScript
+
+from suggestions import constants
+
+log = logging.getLogger(__name__)
+
+# GCRA, otherwise known as a token bucket which only has to
+# store the theoretical arrival time of the next call.
+#
+# KEYS[1] = bucket key
+# ARGV[1] = milliseconds each call costs, time period / limit
+# ARGV[2] = time period in milliseconds
+# ARGV[3] = the most calls to take at once
+#
+# Returns {taken, wait} where taken is how many calls were
+# taken, up to ARGV[3] if the bucket has them spare, and wait
+# is how many milliseconds until the next call would be
+# allowed, 0 if one would be now
+GCRA_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+
+local available = math.floor((now + period - tat) / emission)
+if available < 1 then
+    return {0, math.ceil(tat + emission - period - now)}
+end
+
+local taken = math.min(available, tonumber(ARGV[3]))
+local new_tat = tat + emission * taken
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now))
+return {taken, math.max(0, math.ceil(new_tat + emission - period - now))}
+"""
+
+
+# Sliding window counter, weighting the previous fixed
+# window by how much of it still overlaps the sliding one.
+#
+# KEYS[1] = counter key
+# ARGV[1] = limit
+# ARGV[2] = window in milliseconds
+#
+# Returns {allowed, retry_after} in milliseconds
+SLIDING_WINDOW_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local current_start = now - (now % window)
+
+local state = redis.call('HMGET', KEYS[1], 'start', 'current', 'previous')
+local start = tonumber(state[1])
+local current = tonumber(state[2]) or 0
+local previous = tonumber(state[3]) or 0
+if start ~= current_start then
+    if start == current_start - window then
+        previous = current
+    else
+        previous = 0
+    end
+    current = 0
+end
+
+local weight = 1 - (now - current_start) / window
+if previous * weight + current + 1 <= limit then
+    redis.call('HSET', KEYS[1], 'start', current_start, 'current', current + 1, 'previous', previous)
+    redis.call('PEXPIRE', KEYS[1], window * 2)
+    return {1, 0}
+end
+
+local retry_after
+if current + 1 <= limit then
+    retry_after = current_start + window * (1 - (limit - 1 - current) / previous) - now
+else
+    retry_after = current_start + window * (2 - (limit - 1) / current) - now
+end
+return {0, math.ceil(retry_after)}
+"""
+
+
+class RedisCooldown:
+    """A cooldown whose buckets live in Redis and are shared across clusters.
+
+    Buckets are resolved the same way as :class:`cooldowns.Cooldown`,
+    so ``InteractionBucket`` works unchanged, and being limited
+    raises ``CallableOnCooldown`` just like the in memory version.
+
+    Buckets with calls to spare take up to ``max_reserved`` extra
+    calls from Redis, a quarter of the limit by default, which
+    repeat calls then use without a round trip. Calls held like
+    this can't be used by other clusters, hence only a fraction
+    of the limit is taken.
+
+    Locally we also remember which buckets are currently limited.
+    Repeat calls from those are rejected without going to Redis,
+    and the same cache is used as a per cluster fallback if
+    Redis is unavailable or slower than ``redis_timeout``.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        time_period: Union[float, datetime.timedelta],
+        bucket: Any,
+        func: Optional[Callable] = None,
+        *,
+        max_local_buckets: int = 10_000,
+        max_reserved: Optional[int] = None,
+        redis_timeout: float = 0.05,
+    ):
+        self.limit: int = limit
+        self.time_period: float = (
+            time_period
+            if isinstance(time_period, (float, int))
+            else time_period.total_seconds()
+        )
+        self.max_local_buckets: int = max_local_buckets
+        self.max_reserved: int = (
+            max_reserved if max_reserved is not None else limit // 4
+        )
+        # Commands wait on this, so Redis being slow
+        # shouldn't make every command slow as well
+        self.redis_timeout: float = redis_timeout
+        self._bucket = bucket
+        self._func: Optional[Callable] = func
+        # bucket -> unix time it is limited until
+        self._limited_until: dict[Any, float] = {}
+        # bucket -> calls taken from Redis which haven't been used
+        self._reserved: dict[Any, int] = {}
+        self._script: Optional[AsyncScript] = None
+
+    @property
+    def name(self) -> str:
+        return self._func.__qualname__ if self._func else "unknown"
+
+    async def get_bucket(self, *args, **kwargs) -> Any:
+        bucket_method = getattr(self._bucket, "process", self._bucket)
+        return await maybe_coro(bucket_method, *args, **kwargs)
+
+    def _limit_locally(self, bucket: Any, until: float) -> None:
+        if len(self._limited_until) >= self.max_local_buckets:
+            now = time.time()
+            self._limited_until = {
+                k: v for k, v in self._limited_until.items() if v > now
+            }
+
+        self._limited_until[bucket] = until
+
+    def _reserve(self, bucket: Any, calls: int) -> None:
+        if len(self._reserved) >= self.max_local_buckets:
+            # Calls dropped here are simply never used
+            del self._reserved[next(iter(self._reserved))]
+
+        self._reserved[bucket] = calls
+
+    async def _acquire_from_redis(self, bucket: Any) -> tuple[int, float]:
+        if self._script is None:
+            self._script = constants.REDIS_CLIENT.register_script(GCRA_SCRIPT)
+
+        period_ms = self.time_period * 1000
+        taken, wait_ms = await self._script(
+            keys=[f"cooldown:{self.name}:{bucket}"],
+            args=[period_ms / self.limit, period_ms, self.max_reserved + 1],
+        )
+        return taken, wait_ms / 1000
+
+    async def acquire(self, *args, **kwargs) -> None:
+        """Use a call from the bucket these arguments belong to.
+
+        Raises
+        ------
+        CallableOnCooldown
+            This bucket has no calls remaining
+        """
+        bucket = await self.get_bucket(*args, **kwargs)
+        reserved = self._reserved.pop(bucket, 0)
+        if reserved:
+            if reserved > 1:
+                self._reserved[bucket] = reserved - 1
+
+            return
+
+        now = time.time()
+        limited_until = self._limited_until.get(bucket)
+        if limited_until is not None:
+            if limited_until > now:
+                raise CallableOnCooldown(
+                    self._func, self, _utc_from_timestamp(limited_until)
+                )
+
+            del self._limited_until[bucket]
+
+        try:
+            taken, wait = await asyncio.wait_for(
+                self._acquire_from_redis(bucket), self.redis_timeout
+            )
+        except Exception as e:
+            log.warning(
+                "Falling back to local cooldowns for %s",
+                self.name,
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
+            taken, wait = 1, self.time_period / self.limit
+
+        if taken > 1:
+            self._reserve(bucket, taken - 1)
+
+        if wait > 0:
+            self._limit_locally(bucket, now + wait)
+
+        if not taken:
+            raise CallableOnCooldown(self._func, self, _utc_from_timestamp(now + wait))
+
+
+class SlidingWindowCooldown:
+    """A sliding window counter per key, kept in Redis.
+
+    Each call is a single script round trip touching
+    one small hash, regardless of how many keys exist.
+    """
+
+    def __init__(self, limit: int, time_period: datetime.timedelta):
+        self.limit: int = limit
+        self.time_period: float = time_period.total_seconds()
+
+    async def increment(self, key: str) -> None:
+        """Count a call against ``key``.
+
+        Raises
+        ------
+        CallableOnCooldown
+            ``key`` has already used its limit within the window
+        """
+        global _sliding_window_script
+        if _sliding_window_script is None:
+            _sliding_window_script = constants.REDIS_CLIENT.register_script(
+                SLIDING_WINDOW_SCRIPT
+            )
+
+        allowed, retry_after_ms = await _sliding_window_script(
+            keys=[key], args=[self.limit, int(self.time_period * 1000)]
+        )
+        if not allowed:
+            raise CallableOnCooldown(
+                None, self, _utc_from_timestamp(time.time() + retry_after_ms / 1000)
+            )
+
+
+_sliding_window_script: Optional[AsyncScript] = None
+
+
+def cooldown(
+    limit: int,
+    time_period: Union[float, datetime.timedelta],
+    bucket: Any,
+):
+    """A drop in replacement for ``cooldowns.cooldown`` backed by Redis.
+
+    Parameters
+    ----------
+    limit: int
+        How many calls can be made within ``time_period``
+    time_period: Union[float, datetime.timedelta]
+        The time period in seconds
+    bucket
+        How to split calls into buckets, for example
+        ``InteractionBucket.author``
+    """
+
+    def decorator(func: Callable) -> Callable:
+        _cooldown = RedisCooldown(limit, time_period, bucket, func)
+
+        @functools.wraps(func)
+        async def inner(*args, **kwargs):
+            await _cooldown.acquire(*args, **kwargs)
+            return await func(*args, **kwargs)
+
+        return inner
+
+    return decorator
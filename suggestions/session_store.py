@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
+
+import commons
+import orjson
+
+from suggestions import constants, low_level
+
+if TYPE_CHECKING:
+    from disnake.gateway import DiscordWebSocket
+    from suggestions import SuggestionsBot
+
+log = logging.getLogger(__name__)
+
+resume_counter = constants.METER.create_counter(
+    "suggestions.gateway.resumes",
+    description="Shard startups by whether a stored session was resumed",
+)
+
+
+class ShardSession(NamedTuple):
+    session_id: str
+    sequence: int
+    resume_gateway: str
+
+    @classmethod
+    def from_websocket(cls, ws: DiscordWebSocket) -> Optional[ShardSession]:
+        if ws.session_id is None or ws.sequence is None:
+            return None
+
+        return cls(ws.session_id, ws.sequence, ws.resume_gateway)
+
+
+class SessionStore:
+    """Keeps shard gateway sessions in Redis so restarts can RESUME.
+
+    Sessions are saved periodically and on graceful shutdown,
+    each under its own key which expires after ``max_age``
+    as Discord won't let us resume a session much older than
+    that. Starting a shard claims its session with GETDEL so
+    a session is only ever resumed once.
+
+    Should a RESUME be rejected disnake falls back to
+    identifying as usual, we just count that it happened.
+    """
+
+    def __init__(
+        self,
+        bot: SuggestionsBot,
+        *,
+        save_interval: datetime.timedelta = datetime.timedelta(seconds=30),
+        max_age: datetime.timedelta = datetime.timedelta(minutes=3),
+    ):
+        self.bot: SuggestionsBot = bot
+        self.save_interval: datetime.timedelta = save_interval
+        self.max_age: datetime.timedelta = max_age
+        # Shards we attempted to resume which haven't resumed yet
+        self._resuming: set[int] = set()
+
+    @staticmethod
+    def key_for(shard_id: int) -> str:
+        return f"bot:shard_session:{shard_id}"
+
+    def _record(self, result: str) -> None:
+        resume_counter.add(1, {"resume.result": result})
+
+    async def claim(self, shard_id: int) -> Optional[ShardSession]:
+        """Take the stored session for this shard, if there is one."""
+        try:
+            raw = await constants.REDIS_CLIENT.getdel(self.key_for(shard_id))
+        except Exception as e:
+            log.warning(
+                "Failed to fetch the stored session for shard %s",
+                shard_id,
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
+            raw = None
+
+        if raw is None:
+            self._record("no_session")
+            return None
+
+        return ShardSession(*orjson.loads(raw))
+
+    def attempting_resume(self, shard_id: int) -> None:
+        self._resuming.add(shard_id)
+
+    def resume_failed(self, shard_id: int) -> None:
+        """The RESUME couldn't be sent, we're identifying instead."""
+        self._resuming.discard(shard_id)
+        self._record("connect_failed")
+
+    async def on_shard_resumed(self, shard_id: int) -> None:
+        if shard_id in self._resuming:
+            self._resuming.discard(shard_id)
+            self._record("resumed")
+            log.info("Shard %s resumed its previous session", shard_id)
+
+    async def on_shard_connect(self, shard_id: int) -> None:
+        # READY only arrives after an IDENTIFY, so Discord
+        # must have invalidated the session we tried
+        if shard_id in self._resuming:
+            self._resuming.discard(shard_id)
+            self._record("invalidated")
+            log.info("Shard %s could not resume and identified instead", shard_id)
+
+    async def save(self, shard_ids: Optional[Iterable[int]] = None) -> None:
+        shards = self.bot.shards
+        if shard_ids is not None:
+            shards = {i: shards[i] for i in shard_ids if i in shards}
+
+        sessions: dict[int, ShardSession] = {}
+        for shard_id, shard in shards.items():
+            session = ShardSession.from_websocket(low_level.shard_websocket(shard))
+            if session is not None:
+                sessions[shard_id] = session
+
+        if not sessions:
+            return
+
+        async with constants.REDIS_CLIENT.pipeline(transaction=False) as pipe:
+            for shard_id, session in sessions.items():
+                pipe.set(
+                    self.key_for(shard_id),
+                    orjson.dumps(tuple(session)),
+                    ex=int(self.max_age.total_seconds()),
+                )
+            await pipe.execute()
+
+        log.debug("Saved sessions for %s shards", len(sessions))
+
+    async def close_resumable(self, shard_ids: Optional[Iterable[int]] = None) -> None:
+        """Save sessions, then disconnect without invalidating them.
+
+        Closing with 1000 tells Discord the session is finished,
+        any other close code leaves it open for a RESUME.
+
+        Parameters
+        ----------
+        shard_ids: Optional[Iterable[int]]
+            The shards to close, defaults to all of them
+        """
+        shards = self.bot.shards
+        if shard_ids is not None:
+            shards = {i: shards[i] for i in shard_ids if i in shards}
+
+        # Stop reading first so the saved sequences are final
+        for shard in shards.values():
+            low_level.stop_reading(shard)
+
+        try:
+            await self.save(shards.keys())
+        except Exception as e:
+            # Still close them, they just identify rather than resume
+            log.error(
+                "Failed to save sessions before closing shards",
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
+
+        for shard in shards.values():
+            await low_level.shard_websocket(shard).close(code=4000)
+
+    async def load(self) -> None:
+        self.bot.add_listener(self.on_shard_resumed, "on_shard_resumed")
+        self.bot.add_listener(self.on_shard_connect, "on_shard_connect")
+        self.bot.state.add_background_task(asyncio.create_task(self.push_sessions()))
+
+    async def push_sessions(self) -> None:
+        await self.bot.wait_until_ready()
+        state = self.bot.state
+        while not state.is_closing:
+            await commons.sleep_with_condition(
+                self.save_interval.total_seconds(),
+                lambda: state.is_closing,
+            )
+            if state.is_closing:
+                # graceful_shutdown saves them as the shards stop
+                break
+
+            try:
+                await self.save()
+            except Exception as e:
+                log.error(
+                    "Failed to save shard sessions",
+                    extra={"error.traceback": commons.exception_as_string(e)},
+                )
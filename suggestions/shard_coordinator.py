@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import math
+import time
+import uuid
+from typing import TYPE_CHECKING, Optional
+
+import commons
+
+from suggestions import constants
+
+if TYPE_CHECKING:
+    from suggestions import SuggestionsBot
+
+log = logging.getLogger(__name__)
+
+# Only touch a lease if we still own it
+RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class ShardCoordinator:
+    """Hands out ranges of shards to clusters via leases in Redis.
+
+    Shards are split into ranges of ``shards_per_range`` and
+    each range is owned by whoever holds its lease key. Every
+    member heartbeats into a hash so everyone can work
+    out their fair share of ranges. Members holding more
+    than that hand the extras off, those holding less pick
+    up whatever is free, which covers both clusters being
+    added and clusters dying as their leases expire.
+
+    Leases are renewed from before the bot connects, however
+    shards are only moved around once it is ready.
+
+    Handed off shards save their sessions first so the
+    new owner can resume them rather than identify.
+
+    If we cannot renew for long enough that our leases may
+    have expired, every shard is dropped before anyone else
+    can take them over rather than the two running at once.
+    """
+
+    MEMBERS_KEY = "bot:shard_coordinator:members"
+
+    def __init__(
+        self,
+        *,
+        total_shards: int,
+        shards_per_range: int,
+        lease_ttl: datetime.timedelta = datetime.timedelta(seconds=30),
+        renew_interval: datetime.timedelta = datetime.timedelta(seconds=10),
+    ):
+        self.total_shards: int = total_shards
+        self.ranges: list[range] = [
+            range(start, min(start + shards_per_range, total_shards))
+            for start in range(0, total_shards, shards_per_range)
+        ]
+        self.lease_ttl: datetime.timedelta = lease_ttl
+        self.renew_interval: datetime.timedelta = renew_interval
+        self.member_id: str = uuid.uuid4().hex
+        self.held: set[int] = set()
+        # time.monotonic() from before we last extended every lease we hold
+        self.last_renewed: float = time.monotonic()
+        self.bot: Optional[SuggestionsBot] = None
+
+    @staticmethod
+    def key_for(range_index: int) -> str:
+        return f"bot:shard_leases:{range_index}"
+
+    @property
+    def shard_ids(self) -> list[int]:
+        return sorted(
+            shard_id for index in self.held for shard_id in self.ranges[index]
+        )
+
+    @property
+    def _lease_ms(self) -> int:
+        return int(self.lease_ttl.total_seconds() * 1000)
+
+    async def heartbeat(self) -> dict[str, int]:
+        """Mark ourselves alive, returning how many ranges each live member holds."""
+        now = time.time()
+        await constants.REDIS_CLIENT.hset(
+            self.MEMBERS_KEY, self.member_id, f"{now}:{len(self.held)}"
+        )
+        raw: dict[bytes, bytes] = await constants.REDIS_CLIENT.hgetall(self.MEMBERS_KEY)
+
+        members: dict[str, int] = {}
+        dead: list[bytes] = []
+        for member_id, value in raw.items():
+            last_seen, held = value.decode().split(":")
+            if float(last_seen) < now - self.lease_ttl.total_seconds():
+                dead.append(member_id)
+                continue
+
+            members[member_id.decode()] = int(held)
+
+        if dead:
+            await constants.REDIS_CLIENT.hdel(self.MEMBERS_KEY, *dead)
+
+        return members
+
+    def fair_share(self, members: dict[str, int]) -> int:
+        return math.ceil(len(self.ranges) / len(members))
+
+    def should_hand_off(self, members: dict[str, int]) -> int:
+        """How many of our ranges we should give to other members.
+
+        Anything over our fair share always goes. Beyond that,
+        while some member holds two or more fewer ranges than
+        the busiest, the busiest member gives up a single range
+        so members don't all hand off at once.
+        """
+        held = len(self.held)
+        upper = self.fair_share(members)
+        if held > upper:
+            return held - upper
+
+        busiest = max(members.items(), key=lambda item: (item[1], item[0]))[0]
+        if busiest == self.member_id and held - min(members.values()) > 1:
+            return 1
+
+        return 0
+
+    def should_acquire(self, members: dict[str, int]) -> int:
+        """How many free ranges we should try to pick up.
+
+        Only the least loaded members take ranges, otherwise
+        whoever just handed a range off could take it back.
+        """
+        held = len(self.held)
+        if held > min(members.values()):
+            return 0
+
+        return max(0, self.fair_share(members) - held)
+
+    @property
+    def leases_expiring(self) -> bool:
+        """Whether our leases could expire before the next renewal."""
+        deadline = self.lease_ttl - self.renew_interval
+        return (
+            bool(self.held)
+            and time.monotonic() - self.last_renewed >= deadline.total_seconds()
+        )
+
+    async def try_acquire(self, range_index: int) -> bool:
+        started = time.monotonic()
+        acquired = await constants.REDIS_CLIENT.set(
+            self.key_for(range_index), self.member_id, nx=True, px=self._lease_ms
+        )
+        if acquired:
+            if not self.held:
+                # Otherwise our older leases expire first
+                self.last_renewed = started
+
+            self.held.add(range_index)
+            log.info(
+                "Acquired the lease for shards %s",
+                list(self.ranges[range_index]),
+            )
+
+        return bool(acquired)
+
+    async def acquire_free(self, limit: int) -> list[int]:
+        """Acquire up to ``limit`` unowned ranges."""
+        acquired: list[int] = []
+        for index in range(len(self.ranges)):
+            if len(acquired) >= limit:
+                break
+
+            if index not in self.held and await self.try_acquire(index):
+                acquired.append(index)
+
+        return acquired
+
+    async def renew(self) -> list[int]:
+        """Extend every lease we hold, returning any we have lost."""
+        started = time.monotonic()
+        held = sorted(self.held)
+        async with constants.REDIS_CLIENT.pipeline(transaction=False) as pipe:
+            for index in held:
+                pipe.eval(
+                    RENEW_SCRIPT, 1, self.key_for(index), self.member_id, self._lease_ms
+                )
+            results = await pipe.execute()
+
+        lost = [index for index, renewed in zip(held, results) if not renewed]
+        self.held.difference_update(lost)
+        self.last_renewed = started
+        return lost
+
+    async def release(self, range_index: int) -> None:
+        await constants.REDIS_CLIENT.eval(
+            RELEASE_SCRIPT, 1, self.key_for(range_index), self.member_id
+        )
+        self.held.discard(range_index)
+
+    async def acquire_initial(self) -> list[int]:
+        """Acquire our first ranges, returning their shard ids.
+
+        We heartbeat and then wait a renewal interval before
+        claiming anything so clusters booting together see each
+        other, otherwise the first one up would take every range.
+        If nobody else has shown up by then we only take a single
+        range, the rest are picked up by rebalancing once ready.
+
+        Members with nothing free start as standbys without any
+        shards, picking ranges up by rebalancing once one is
+        handed off or another member dies.
+        """
+        await self.heartbeat()
+        await asyncio.sleep(self.renew_interval.total_seconds())
+        members = await self.heartbeat()
+        limit = self.fair_share(members) if len(members) > 1 else 1
+        if await self.acquire_free(limit):
+            # Let everyone else know what we now hold
+            await self.heartbeat()
+        else:
+            log.info("No shard ranges are free, starting as a standby")
+
+        return self.shard_ids
+
+    async def load(self, bot: SuggestionsBot) -> None:
+        self.bot = bot
+        bot.state.add_background_task(asyncio.create_task(self.maintain_leases()))
+
+    async def drop_all(self) -> None:
+        """Stop running every shard we hold without touching the leases."""
+        shard_ids = self.shard_ids
+        self.held.clear()
+        await self.bot.drop_shards(shard_ids)
+
+    async def rebalance(self) -> None:
+        bot = self.bot
+        try:
+            lost = await self.renew()
+        except Exception:
+            if self.leases_expiring:
+                # Whoever takes them over next must not find them still running
+                log.warning(
+                    "Could not renew shard leases in time, dropping shards %s",
+                    self.shard_ids,
+                )
+                await self.drop_all()
+
+            raise
+
+        if lost:
+            # Someone else owns these now, so they must not
+            # be running here as well
+            log.warning("Lost the leases for shard ranges %s", lost)
+            await bot.drop_shards(
+                [shard_id for index in lost for shard_id in self.ranges[index]]
+            )
+
+        members = await self.heartbeat()
+        if not bot.is_ready():
+            # Leave the shards alone until we have finished starting
+            return
+
+        held = len(self.held)
+        hand_off = self.should_hand_off(members)
+        if hand_off:
+            for index in sorted(self.held, reverse=True)[:hand_off]:
+                log.info("Handing off shards %s", list(self.ranges[index]))
+                await bot.drop_shards(list(self.ranges[index]))
+                await self.release(index)
+
+        else:
+            for index in await self.acquire_free(self.should_acquire(members)):
+                await bot.add_shards(list(self.ranges[index]))
+
+        if len(self.held) != held:
+            await self.heartbeat()
+
+    async def maintain_leases(self) -> None:
+        state = self.bot.state
+        while not state.is_closing:
+            await commons.sleep_with_condition(
+                self.renew_interval.total_seconds(),
+                lambda: state.is_closing,
+            )
+            if state.is_closing:
+                # graceful_shutdown releases them once shards stop
+                break
+
+            try:
+                await self.rebalance()
+            except Exception as e:
+                log.error(
+                    "Failed to maintain shard leases",
+                    extra={"error.traceback": commons.exception_as_string(e)},
+                )
+
+    async def release_all(self) -> None:
+        """Give up every lease so another cluster can take over immediately."""
+        for index in list(self.held):
+            await self.release(index)
+
+        await constants.REDIS_CLIENT.hdel(self.MEMBERS_KEY, self.member_id)
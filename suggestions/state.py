@@ -17,6 +17,7 @@ from alaric.projections import PROJECTION, SHOW
 from commons.caching import NonExistentEntry, TimedCache
 
 from suggestions.objects import GuildConfig, UserConfig, PremiumGuildConfig
+from suggestions.user_profile_cache import UserProfileCache
 
 if TYPE_CHECKING:
     from suggestions import SuggestionsBot
@@ -51,17 +52,27 @@ class State:
             lazy_eviction=False,
             ttl_from_last_access=True,
         )
-        self.object_cache: TimedCache[int, Any] = TimedCache(
-            global_ttl=timedelta(hours=1), lazy_eviction=False
+        self.user_profiles: UserProfileCache = UserProfileCache(bot)
+        # Channels are shared between bot.get_or_fetch_channel and
+        # State.fetch_channel, these are invalidated via gateway
+        # events within PatchedConnectionState. Eviction is lazy
+        # as it is cleaned within evict_caches instead of every lookup
+        self.channel_cache: TimedCache[int, Any] = TimedCache(
+            global_ttl=timedelta(hours=1)
+        )
+        self.missing_channel_cache: TimedCache[int, disnake.NotFound] = TimedCache(
+            global_ttl=timedelta(minutes=10)
         )
 
+        # Writes are broadcast to other clusters through
+        # the InvalidationBus, so these can live a while
         self.guild_configs: TimedCache = TimedCache(
-            global_ttl=timedelta(minutes=30),
+            global_ttl=timedelta(hours=2),
             lazy_eviction=False,
             ttl_from_last_access=True,
         )
         self.user_configs: TimedCache = TimedCache(
-            global_ttl=timedelta(minutes=30),
+            global_ttl=timedelta(hours=2),
             lazy_eviction=False,
             ttl_from_last_access=True,
         )
@@ -270,7 +281,7 @@ class State:
         self.add_background_task(task_1)
 
         # Populate existing suggestion id's
-        aggregate_pipeline = self.suggestions_db._document.aggregate(
+        aggregate_results = await self.suggestions_db.aggregate(
             [
                 {
                     "$bucketAuto": {
@@ -284,13 +295,13 @@ class State:
                 },
             ]
         )
-        for thing in await aggregate_pipeline.to_list(length=None):
+        for thing in aggregate_results:
             for item in thing["ids"]:
                 self.existing_suggestion_ids.add(item)
             del thing
-        del aggregate_pipeline
+        del aggregate_results
 
-        aggregate_pipeline = self.queued_suggestions_db._document.aggregate(
+        aggregate_results = await self.queued_suggestions_db.aggregate(
             [
                 {
                     "$bucketAuto": {
@@ -304,14 +315,14 @@ class State:
                 },
             ]
         )
-        for thing in await aggregate_pipeline.to_list(length=None):
+        for thing in aggregate_results:
             for item in thing["ids"]:
                 if isinstance(item, str) and len(item) == 8:
                     self.existing_suggestion_ids.add(item)
             del thing
-        del aggregate_pipeline
+        del aggregate_results
 
-        aggregate_pipeline = self.bot.db.error_tracking._document.aggregate(
+        aggregate_results = await self.bot.db.error_tracking.aggregate(
             [
                 {
                     "$bucketAuto": {
@@ -325,27 +336,50 @@ class State:
                 },
             ]
         )
-        for thing in await aggregate_pipeline.to_list(length=None):
+        for thing in aggregate_results:
             for item in thing["ids"]:
                 self.existing_error_ids.add(item)
             del thing
-        del aggregate_pipeline
+        del aggregate_results
 
     async def fetch_channel(self, channel_id: int) -> disnake.TextChannel:
+        """Fetch a channel, using the shared channel cache where possible.
+
+        Raises
+        ------
+        disnake.NotFound
+            The channel no longer exists. This is
+            negatively cached to avoid repeated lookups.
+        """
         try:
-            return self.object_cache.get_entry(channel_id)
+            return self.channel_cache.get_entry(channel_id)  # type: ignore
         except NonExistentEntry:
-            chan = await self.bot.fetch_channel(channel_id)
-            self.object_cache.add_entry(channel_id, chan)
-            return chan  # type: ignore
+            pass
 
-    async def fetch_user(self, user_id: int) -> disnake.User:
         try:
-            return self.object_cache.get_entry(user_id)
+            error = self.missing_channel_cache.get_entry(channel_id)
         except NonExistentEntry:
-            user = await self.bot.fetch_user(user_id)
-            self.object_cache.add_entry(user_id, user)
-            return user
+            pass
+        else:
+            raise error.with_traceback(None)
+
+        try:
+            chan = await self.bot.fetch_channel(channel_id)
+        except disnake.NotFound as e:
+            self.missing_channel_cache.add_entry(channel_id, e, override=True)
+            raise
+
+        self.channel_cache.add_entry(channel_id, chan, override=True)
+        return chan  # type: ignore
+
+    def evict_channel(self, channel_id: int) -> None:
+        """Remove a channel from the channel caches.
+
+        Called on CHANNEL_UPDATE, CHANNEL_DELETE and
+        their thread equivalents so we never act on stale data.
+        """
+        self.channel_cache.delete_entry(channel_id)
+        self.missing_channel_cache.delete_entry(channel_id)
 
     async def fetch_guild(self, guild_id: int) -> disnake.Guild:
         # Need guild cache instead of object as used else where
@@ -364,6 +398,9 @@ class State:
             if len(self.autocomplete_cache) != old_length:
                 log.debug("Cleaned autocomplete caches")
 
+            self.channel_cache.force_clean()
+            self.missing_channel_cache.force_clean()
+
             # This allows for immediate task finishing rather
             # than being forced to wait the whole 10 minutes
             # between loops for if we wish to gracefully close the task
@@ -3,15 +3,20 @@ from __future__ import annotations
 import asyncio
 import datetime
 import logging
+from collections import defaultdict
 from enum import Enum
-from typing import TYPE_CHECKING, Optional, Type
+from itertools import product
+from typing import TYPE_CHECKING, Optional, Type, Any, NamedTuple
 
 import alaric
 import commons
 from alaric import Cursor, AQ
 from alaric.comparison import EQ
 from commons.caching import TimedCache
+from pymongo import UpdateOne
 
+from suggestions.gateway_events import GatewayEventCounts
+from suggestions.low_level import PatchedConnectionState
 from suggestions.objects.stats import MemberStats, MemberCommandStats
 
 if TYPE_CHECKING:
@@ -106,6 +111,29 @@ class StatsEnum(Enum):
             return None
 
 
+class RollupGranularity(Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+    def bucket_for(self, timestamp: datetime.datetime) -> datetime.datetime:
+        """The start of the bucket this timestamp falls within."""
+        bucket = timestamp.replace(minute=0, second=0, microsecond=0)
+        if self is RollupGranularity.DAY:
+            bucket = bucket.replace(hour=0)
+
+        return bucket
+
+
+class StatsRollup(NamedTuple):
+    bucket: datetime.datetime
+    count: int
+    failed: int
+
+    @property
+    def completed(self) -> int:
+        return self.count - self.failed
+
+
 class Stats:
     """Delayed stats processing for services at scale."""
 
@@ -117,6 +145,21 @@ class Stats:
         self.member_stats_cache: TimedCache = TimedCache(lazy_eviction=False)
         self.type: Type[StatsEnum] = StatsEnum
         self._inter_count: int = 0
+        self.gateway_events: GatewayEventCounts = GatewayEventCounts(
+            PatchedConnectionState.event_types()
+        )
+
+        # (member_id, guild_id, stat type) -> stats not yet written
+        self._pending_member_stats: dict[
+            tuple[int, int, StatsEnum], MemberCommandStats
+        ] = {}
+        self.member_stats_flush_interval: datetime.timedelta = datetime.timedelta(
+            seconds=15
+        )
+        self.member_stats_max_pending: int = 1000
+        # Stats from failed flushes are kept until the buffer
+        # reaches this size, beyond which they are dropped
+        self.member_stats_max_buffered: int = 10_000
 
     async def log_stats(
         self,
@@ -126,31 +169,209 @@ class Stats:
         *,
         was_success: bool = True,
     ):
-        member_stats: MemberStats = await MemberStats.from_id(
-            member_id, guild_id, self.state
-        )
-
         stat_type_str = str(stat_type.value)
-        stats_attr: MemberCommandStats = getattr(member_stats, stat_type_str, False)
-        if not stats_attr:
-            if stat_type_str not in member_stats.valid_fields:
-                log.error(
-                    "Failed to find attr '%s' on MemberStats(member_id=%s, guild_id=%s)",
-                    stat_type.value,
-                    member_id,
-                    guild_id,
-                )
-                return
+        if stat_type_str not in MemberStats.command_fields:
+            log.error(
+                "Failed to find attr '%s' on MemberStats(member_id=%s, guild_id=%s)",
+                stat_type.value,
+                member_id,
+                guild_id,
+            )
+            return
 
-            stats_attr: MemberCommandStats = MemberCommandStats(stat_type_str)
-            setattr(member_stats, stat_type_str, stats_attr)
+        # Buffered and written in bulk by push_member_stats
+        # so commands don't wait on a stats round trip
+        key = (member_id, guild_id, stat_type)
+        pending = self._pending_member_stats.get(key)
+        if pending is None:
+            pending = MemberCommandStats(stat_type_str)
+            self._pending_member_stats[key] = pending
 
         if was_success:
-            stats_attr.completed_at.append(self.state.now)
+            pending.completed_at.append(self.state.now)
         else:
-            stats_attr.failed_at.append(self.state.now)
+            pending.failed_at.append(self.state.now)
+
+    async def flush_member_stats(self) -> None:
+        """Write all buffered member stats in a single bulk write."""
+        if not self._pending_member_stats:
+            return
+
+        pending = self._pending_member_stats
+        self._pending_member_stats = {}
+
+        # Combine every command for a member into one update
+        pushes: dict[tuple[int, int], dict[str, Any]] = defaultdict(dict)
+        for (member_id, guild_id, _), command_stats in pending.items():
+            push = pushes[(member_id, guild_id)]
+            name = command_stats.command_name
+            if command_stats.completed_at:
+                push[f"commands.{name}.completed_at"] = {
+                    "$each": command_stats.completed_at
+                }
+            if command_stats.failed_at:
+                push[f"commands.{name}.failed_at"] = {"$each": command_stats.failed_at}
+
+        try:
+            await self.database.member_stats.bulk_write(
+                [
+                    UpdateOne(
+                        {"member_id": member_id, "guild_id": guild_id},
+                        {"$push": push},
+                        upsert=True,
+                    )
+                    for (member_id, guild_id), push in pushes.items()
+                ],
+                ordered=False,
+            )
+        except Exception as e:
+            log.error(
+                "Failed to flush stats for %s members, retrying next flush",
+                len(pushes),
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
+            # Rollups are left until the retry as well,
+            # otherwise they would be counted twice
+            self._requeue_member_stats(pending)
+            return
+
+        for member_id, guild_id in pushes.keys():
+            self.member_stats_cache.delete_entry(f"{member_id}|{guild_id}")
 
-        await self.state.member_stats_db.upsert(member_stats, member_stats)
+        # (granularity, bucket, scope, scope id, stat) -> [count, failed]
+        rollups: dict[
+            tuple[RollupGranularity, datetime.datetime, str, int, str], list[int]
+        ] = defaultdict(lambda: [0, 0])
+        for (_, guild_id, stat_type), command_stats in pending.items():
+            entries = [(ts, False) for ts in command_stats.completed_at]
+            entries.extend((ts, True) for ts in command_stats.failed_at)
+            scopes = (("guild_id", guild_id), ("cluster", self.bot.cluster_id))
+            for (timestamp, failed), granularity, (scope, scope_id) in product(
+                entries, RollupGranularity, scopes
+            ):
+                bucket = granularity.bucket_for(timestamp)
+                counts = rollups[
+                    (granularity, bucket, scope, scope_id, stat_type.value)
+                ]
+                counts[0] += 1
+                counts[1] += failed
+
+        await self._increment_rollups(
+            [
+                UpdateOne(
+                    {
+                        "granularity": granularity.value,
+                        "bucket": bucket,
+                        scope: scope_id,
+                        "stat": stat,
+                    },
+                    {"$inc": {"count": count, "failed": failed}},
+                    upsert=True,
+                )
+                for (granularity, bucket, scope, scope_id, stat), (
+                    count,
+                    failed,
+                ) in rollups.items()
+            ]
+        )
+
+    def _requeue_member_stats(
+        self, pending: dict[tuple[int, int, StatsEnum], MemberCommandStats]
+    ) -> None:
+        """Merge stats from a failed flush back into the buffer."""
+        dropped: int = 0
+        for key, command_stats in pending.items():
+            current = self._pending_member_stats.get(key)
+            if current is not None:
+                # Keep timestamps oldest first
+                current.completed_at[:0] = command_stats.completed_at
+                current.failed_at[:0] = command_stats.failed_at
+            elif len(self._pending_member_stats) < self.member_stats_max_buffered:
+                self._pending_member_stats[key] = command_stats
+            else:
+                dropped += 1
+
+        if dropped:
+            log.warning(
+                "Dropped stats for %s member commands as the buffer is full",
+                dropped,
+            )
+
+    async def _increment_rollups(self, requests: list[UpdateOne]) -> None:
+        try:
+            await self.database.stats_rollups.bulk_write(requests, ordered=False)
+        except Exception as e:
+            log.error(
+                "Failed to increment %s stats rollups",
+                len(requests),
+                extra={"error.traceback": commons.exception_as_string(e)},
+            )
+
+    async def fetch_rollups(
+        self,
+        stat: StatsEnum | str,
+        *,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        granularity: RollupGranularity = RollupGranularity.DAY,
+        guild_id: Optional[int] = None,
+        cluster: Optional[int] = None,
+    ) -> list[StatsRollup]:
+        """Fetch rolled up counts for a stat within a time range.
+
+        Parameters
+        ----------
+        stat: StatsEnum | str
+            The stat to fetch, interaction_create is
+            also rolled up per cluster.
+        start: datetime.datetime
+            The start of the range, inclusive.
+        end: datetime.datetime
+            The end of the range, exclusive.
+        granularity: RollupGranularity
+            Whether to return hourly or daily buckets.
+        guild_id: Optional[int]
+            Only return counts for this guild.
+        cluster: Optional[int]
+            Only return counts for this cluster.
+
+        Returns
+        -------
+        list[StatsRollup]
+            The buckets within this range, oldest first.
+            Buckets with no activity are omitted.
+        """
+        if (guild_id is None) == (cluster is None):
+            raise ValueError("Exactly one of guild_id or cluster must be provided")
+
+        query: dict[str, Any] = {
+            "granularity": granularity.value,
+            "stat": stat.value if isinstance(stat, StatsEnum) else stat,
+            "bucket": {"$gte": start, "$lt": end},
+        }
+        if guild_id is not None:
+            query["guild_id"] = guild_id
+        else:
+            query["cluster"] = cluster
+
+        data = await self.database.stats_rollups.find_many(query, try_convert=False)
+        return sorted(
+            (
+                StatsRollup(entry["bucket"], entry["count"], entry.get("failed", 0))
+                for entry in data
+            ),
+            key=lambda r: r.bucket,
+        )
+
+    async def push_member_stats(self):
+        while not self.state.is_closing:
+            await commons.sleep_with_condition(
+                self.member_stats_flush_interval.total_seconds(),
+                lambda: self.state.is_closing
+                or len(self._pending_member_stats) >= self.member_stats_max_pending,
+                interval=1,
+            )
+            await self.flush_member_stats()
 
     def refresh_member_stats(self, member_stats: MemberStats) -> None:
         self.member_stats_cache.add_entry(
@@ -166,6 +387,7 @@ class Stats:
 
     async def load(self):
         self.state.add_background_task(asyncio.create_task(self.push_inter_stats()))
+        self.state.add_background_task(asyncio.create_task(self.push_member_stats()))
 
     async def push_inter_stats(self):
         while not self.state.is_closing:
@@ -180,18 +402,31 @@ class Stats:
             if count == 0:
                 continue
 
+            now = self.state.now
             await self.bot.db.interaction_events.insert(
                 {
                     "count": count,
-                    "inserted_at": self.state.now,
+                    "inserted_at": now,
                     "cluster": self.bot.cluster_id,
                 }
             )
+            await self._increment_rollups(
+                [
+                    UpdateOne(
+                        {
+                            "granularity": granularity.value,
+                            "bucket": granularity.bucket_for(now),
+                            "cluster": self.bot.cluster_id,
+                            "stat": "interaction_create",
+                        },
+                        {"$inc": {"count": count}},
+                        upsert=True,
+                    )
+                    for granularity in RollupGranularity
+                ]
+            )
 
-    def increment_event_type(self, event_type: str):
-        # We only want interactions for now
-        event_type = event_type.lower()
-        if event_type != "interaction_create":
-            return
-
-        self._inter_count += 1
+    def increment_event_type(self, event_type: str, shard_id: int):
+        self.gateway_events.increment(shard_id, event_type)
+        if event_type == "INTERACTION_CREATE":
+            self._inter_count += 1
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+import commons
+import orjson
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from suggestions import constants
+from suggestions.cluster_registry import CLUSTERS_KEY, ClusterHeartbeat
+
+log = logging.getLogger(__name__)
+
+# Alongside the suggestions package, not wherever we were started from
+WORKER_ENTRYPOINT: Path = Path(__file__).resolve().parent.parent / "main.py"
+
+restart_counter = constants.METER.create_counter(
+    "suggestions.supervisor.restarts",
+    description="Cluster worker processes restarted by the supervisor",
+)
+
+
+class ClusterWorker:
+    """A single cluster, running ``main.py`` in its own process.
+
+    The supervisor's secrets are written to the worker's stdin
+    which are read by ``constants.load_handed_secrets`` rather
+    than the worker going to Infisical itself.
+    """
+
+    def __init__(self, cluster_id: int, secrets: bytes):
+        self.cluster_id: int = cluster_id
+        self._secrets: bytes = secrets
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.started_at: float = 0
+        self.restarts: int = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    @property
+    def uptime(self) -> float:
+        return time.monotonic() - self.started_at
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            # Match however we were started, the Dockerfile uses -O
+            *(["-O"] if sys.flags.optimize else []),
+            str(WORKER_ENTRYPOINT),
+            env={
+                **os.environ,
+                "CLUSTER": str(self.cluster_id),
+                "SUPERVISED_WORKER": "1",
+            },
+            stdin=asyncio.subprocess.PIPE,
+            # Otherwise a ctrl+c reaches the workers as well as us
+            start_new_session=True,
+        )
+        try:
+            self.process.stdin.write(self._secrets + b"\n")
+            await self.process.stdin.drain()
+            self.process.stdin.close()
+        except Exception:
+            # Otherwise it lives on waiting for secrets
+            # while we go on to start another in its place
+            self.process.kill()
+            await self.process.wait()
+            raise
+
+        self.started_at = time.monotonic()
+        log.info("Started cluster %s as pid %s", self.cluster_id, self.process.pid)
+
+    async def stop(self, timeout: datetime.timedelta) -> None:
+        """SIGTERM the worker so it shuts down gracefully, killing it after ``timeout``."""
+        if not self.is_running:
+            return
+
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout.total_seconds())
+        except asyncio.TimeoutError:
+            log.warning(
+                "Cluster %s did not shut down within %s, killing it",
+                self.cluster_id,
+                timeout,
+            )
+            self.process.kill()
+            await self.process.wait()
+
+
+class Supervisor:
+    """Runs several clusters on one host, one process each.
+
+    Workers are restarted when their process exits or once
+    they stop publishing heartbeats to the cluster registry.
+    Repeated restarts back off, up to ``max_backoff``.
+
+    Metrics from every worker's latest heartbeat are summed
+    and exported from here, so a host can be looked at as a
+    whole rather than cluster by cluster.
+    """
+
+    def __init__(
+        self,
+        cluster_ids: Iterable[int],
+        *,
+        check_interval: datetime.timedelta = datetime.timedelta(seconds=15),
+        startup_grace: datetime.timedelta = datetime.timedelta(minutes=10),
+        unhealthy_after: datetime.timedelta = datetime.timedelta(minutes=1),
+        shutdown_timeout: datetime.timedelta = datetime.timedelta(seconds=90),
+        max_backoff: datetime.timedelta = datetime.timedelta(minutes=5),
+    ):
+        secrets = orjson.dumps(constants.fetched_secrets())
+        self.workers: dict[int, ClusterWorker] = {
+            cluster_id: ClusterWorker(cluster_id, secrets) for cluster_id in cluster_ids
+        }
+        self.check_interval: datetime.timedelta = check_interval
+        self.startup_grace: datetime.timedelta = startup_grace
+        self.unhealthy_after: datetime.timedelta = unhealthy_after
+        self.shutdown_timeout: datetime.timedelta = shutdown_timeout
+        self.max_backoff: datetime.timedelta = max_backoff
+        self.is_closing: bool = False
+        # cluster_id -> latest heartbeat for our workers
+        self.heartbeats: dict[int, ClusterHeartbeat] = {}
+
+        constants.METER.create_observable_gauge(
+            "suggestions.supervisor.workers",
+            callbacks=[self._observe_workers],
+            description="Cluster worker processes currently running on this host",
+        )
+        constants.METER.create_observable_gauge(
+            "suggestions.supervisor.guilds",
+            callbacks=[self._observe_heartbeats("guild_count")],
+            description="Guilds across every cluster on this host",
+        )
+        constants.METER.create_observable_gauge(
+            "suggestions.supervisor.memory",
+            unit="By",
+            callbacks=[self._observe_heartbeats("rss")],
+            description="Resident memory across every cluster on this host",
+        )
+        constants.METER.create_observable_gauge(
+            "suggestions.supervisor.interactions",
+            unit="{interaction}/s",
+            callbacks=[self._observe_heartbeats("interactions_per_second")],
+            description="Interactions per second across every cluster on this host",
+        )
+
+    def _observe_workers(self, _: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(sum(w.is_running for w in self.workers.values()))
+
+    def _observe_heartbeats(self, field: str):
+        def callback(_: CallbackOptions) -> Iterable[Observation]:
+            yield Observation(
+                sum(
+                    getattr(heartbeat, field)
+                    for heartbeat in self.heartbeats.values()
+                    # Don't keep counting clusters which have died
+                    if heartbeat.age <= self.unhealthy_after.total_seconds()
+                )
+            )
+
+        return callback
+
+    def backoff_for(self, worker: ClusterWorker) -> float:
+        return min(5 * 2**worker.restarts, self.max_backoff.total_seconds())
+
+    async def run_worker(self, worker: ClusterWorker) -> None:
+        """Keep this worker running until we shut down."""
+        while not self.is_closing:
+            try:
+                await worker.start()
+            except Exception as e:
+                log.error(
+                    "Failed to start cluster %s",
+                    worker.cluster_id,
+                    extra={"error.traceback": commons.exception_as_string(e)},
+                )
+            else:
+                return_code = await worker.process.wait()
+                if self.is_closing:
+                    break
+
+                if worker.uptime > self.startup_grace.total_seconds():
+                    # It was healthy for a while, so this is a fresh failure
+                    worker.restarts = 0
+
+                log.error(
+                    "Cluster %s exited with code %s", worker.cluster_id, return_code
+                )
+
+            backoff = self.backoff_for(worker)
+            worker.restarts += 1
+            restart_counter.add(1, {"cluster.id": worker.cluster_id})
+            log.info("Restarting cluster %s in %ss", worker.cluster_id, backoff)
+            await commons.sleep_with_condition(
+                backoff, lambda: self.is_closing, interval=1
+            )
+
+    async def fetch_heartbeats(self) -> None:
+        raw: list[Optional[bytes]] = await constants.REDIS_CLIENT.hmget(
+            CLUSTERS_KEY, [str(cluster_id) for cluster_id in self.workers]
+        )
+        self.heartbeats = {
+            heartbeat.cluster_id: heartbeat
+            for heartbeat in (
+                ClusterHeartbeat.from_json(value) for value in raw if value is not None
+            )
+        }
+
+    async def check_health(self) -> None:
+        await self.fetch_heartbeats()
+        for cluster_id, worker in self.workers.items():
+            if (
+                not worker.is_running
+                or worker.uptime < self.startup_grace.total_seconds()
+            ):
+                continue
+
+            heartbeat = self.heartbeats.get(cluster_id)
+            # A heartbeat older than the process is from before it restarted
+            age = (
+                heartbeat.age
+                if heartbeat is not None
+                else self.unhealthy_after.total_seconds() + 1
+            )
+            if age > min(self.unhealthy_after.total_seconds(), worker.uptime):
+                log.error(
+                    "Cluster %s has not heartbeated for %.0fs, restarting it",
+                    cluster_id,
+                    age,
+                )
+                # run_worker notices the exit and starts it again
+                await worker.stop(self.shutdown_timeout)
+
+        if self.heartbeats:
+            log.debug(
+                "Clusters %s: %s guilds, %s interactions/s",
+                sorted(self.heartbeats),
+                sum(h.guild_count for h in self.heartbeats.values()),
+                round(
+                    sum(h.interactions_per_second for h in self.heartbeats.values()), 2
+                ),
+            )
+
+    async def monitor(self) -> None:
+        while not self.is_closing:
+            await commons.sleep_with_condition(
+                self.check_interval.total_seconds(),
+                lambda: self.is_closing,
+                interval=1,
+            )
+            if self.is_closing:
+                break
+
+            try:
+                await self.check_health()
+            except Exception as e:
+                log.error(
+                    "Failed to health check clusters",
+                    extra={"error.traceback": commons.exception_as_string(e)},
+                )
+
+    async def shutdown(self) -> None:
+        log.info("Shutting down clusters %s", sorted(self.workers))
+        self.is_closing = True
+        await asyncio.gather(
+            *(worker.stop(self.shutdown_timeout) for worker in self.workers.values())
+        )
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            for signame in ("SIGINT", "SIGTERM"):
+                loop.add_signal_handler(
+                    getattr(signal, signame),
+                    lambda: asyncio.ensure_future(self.shutdown()),
+                )
+        except NotImplementedError:
+            pass  # doesn't work on windows
+
+        await asyncio.gather(
+            self.monitor(),
+            *(self.run_worker(worker) for worker in self.workers.values()),
+        )
+        log.info("All clusters have stopped")
@@ -0,0 +1,181 @@
+"""
+Folds the raw completed_at / failed_at timestamp lists
+within member_stats into per day counters.
+
+python -m suggestions.telemetry.compact_member_stats --dry-run
+python -m suggestions.telemetry.compact_member_stats
+
+Progress is checkpointed after every batch, so an interrupted
+run picks up where it left off. Pass --restart to ignore
+the checkpoint and start from the beginning.
+"""
+
+import argparse
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, NamedTuple
+
+import bson
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+load_dotenv()
+
+CHECKPOINT_ID = "compact_member_stats"
+
+
+class CompactedCommand(NamedTuple):
+    inc: dict[str, int]
+    pull: dict[str, list[datetime]]
+
+
+class MigrationReport:
+    def __init__(self):
+        self.documents_scanned: int = 0
+        self.documents_compacted: int = 0
+        self.timestamps_folded: int = 0
+        self.bytes_before: int = 0
+        self.bytes_after: int = 0
+
+    def __str__(self):
+        reduction = (
+            (1 - self.bytes_after / self.bytes_before) * 100 if self.bytes_before else 0
+        )
+        return (
+            f"Scanned {self.documents_scanned} documents, "
+            f"compacting {self.documents_compacted}\n"
+            f"Folded {self.timestamps_folded} timestamps\n"
+            f"Size {self.bytes_before:,} bytes -> {self.bytes_after:,} bytes "
+            f"({reduction:.1f}% reduction)"
+        )
+
+
+def compact_command(name: str, data: dict[str, Any]) -> CompactedCommand:
+    """Build the update which folds a commands timestamps into daily counters.
+
+    Timestamps are removed with $pullAll rather than overwriting the
+    list so that anything the bot pushes mid migration is kept.
+    """
+    inc: dict[str, int] = defaultdict(int)
+    pull: dict[str, list[datetime]] = {}
+    for field, bucket_field in (
+        ("completed_at", "completed_by_day"),
+        ("failed_at", "failed_by_day"),
+    ):
+        timestamps: list[datetime] = data.get(field, [])
+        if not timestamps:
+            continue
+
+        pull[f"commands.{name}.{field}"] = timestamps
+        for timestamp in timestamps:
+            inc[f"commands.{name}.{bucket_field}.{timestamp:%Y-%m-%d}"] += 1
+
+    return CompactedCommand(dict(inc), pull)
+
+
+def compacted_document(document: dict[str, Any]) -> dict[str, Any]:
+    """What a document looks like once compacted, used to size the dry run."""
+    commands = {}
+    for name, data in document.get("commands", {}).items():
+        command = {
+            "completed_at": [],
+            "failed_at": [],
+            "completed_by_day": dict(data.get("completed_by_day", {})),
+            "failed_by_day": dict(data.get("failed_by_day", {})),
+        }
+        for key, count in compact_command(name, data).inc.items():
+            bucket_field, day = key.rsplit(".", 2)[1:]
+            command[bucket_field][day] = command[bucket_field].get(day, 0) + count
+
+        commands[name] = command
+
+    return {**document, "commands": commands}
+
+
+async def compact_member_stats(*, dry_run: bool, batch_size: int, restart: bool):
+    client = AsyncIOMotorClient(os.environ["PROD_MONGO_URL"])
+    database = client["suggestions-rewrite"]
+    member_stats = database["member_stats"]
+    checkpoints = database["migration_checkpoints"]
+
+    query: dict[str, Any] = {}
+    checkpoint = None if restart else await checkpoints.find_one({"_id": CHECKPOINT_ID})
+    if checkpoint is not None:
+        query["_id"] = {"$gt": checkpoint["last_id"]}
+        print(f"Resuming after {checkpoint['last_id']}")
+
+    report = MigrationReport()
+    requests: list[UpdateOne] = []
+    last_id = None
+
+    async def flush():
+        if requests and not dry_run:
+            await member_stats.bulk_write(requests, ordered=False)
+
+        if last_id is not None and not dry_run:
+            await checkpoints.update_one(
+                {"_id": CHECKPOINT_ID},
+                {"$set": {"last_id": last_id, "updated_at": datetime.now()}},
+                upsert=True,
+            )
+
+        requests.clear()
+
+    cursor = member_stats.find(query).sort("_id", 1).batch_size(batch_size)
+    async for document in cursor:
+        report.documents_scanned += 1
+        last_id = document["_id"]
+
+        inc: dict[str, int] = {}
+        pull: dict[str, list[datetime]] = {}
+        for name, data in document.get("commands", {}).items():
+            compacted = compact_command(name, data)
+            inc.update(compacted.inc)
+            pull.update(compacted.pull)
+
+        if not pull:
+            continue
+
+        report.documents_compacted += 1
+        report.timestamps_folded += sum(inc.values())
+        report.bytes_before += len(bson.encode(document))
+        report.bytes_after += len(bson.encode(compacted_document(document)))
+        requests.append(
+            UpdateOne({"_id": document["_id"]}, {"$inc": inc, "$pullAll": pull})
+        )
+
+        if report.documents_scanned % batch_size == 0:
+            await flush()
+            print(f"Processed {report.documents_scanned} documents")
+
+    await flush()
+    if dry_run:
+        print("Dry run, nothing was written")
+
+    print(report)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report the projected size reduction without writing anything",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore any existing checkpoint and start from the beginning",
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        compact_member_stats(
+            dry_run=args.dry_run, batch_size=args.batch_size, restart=args.restart
+        )
+    )
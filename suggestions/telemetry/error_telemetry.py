@@ -17,6 +17,25 @@ class ErrorTelemetry(NamedTuple):
     total_unhandled_errors: int
 
 
+async def attach_tracebacks(database, errors: list[Error]) -> list[Error]:
+    """Fill in tracebacks for errors which only store their fingerprint."""
+    missing = {e.fingerprint for e in errors if e.traceback is None}
+    if not missing:
+        return errors
+
+    tracebacks = {
+        item["_id"]: item["traceback"]
+        async for item in database["error_fingerprints"].find(
+            {"_id": {"$in": list(missing)}}
+        )
+    }
+    for error in errors:
+        if error.traceback is None:
+            error.traceback = tracebacks.get(error.fingerprint)
+
+    return errors
+
+
 async def error_telemetry() -> ErrorTelemetry:
     client = AsyncIOMotorClient(os.environ["PROD_MONGO_URL"])
     database = client["suggestions-rewrite"]
@@ -80,7 +99,7 @@ async def unique_unhandled_errors() -> set[Error]:
             )
         )
     )
-    return set(unhandled_errors)
+    return set(await attach_tracebacks(database, unhandled_errors))
 
 
 async def get_unique_forbidden() -> set[Error]:
@@ -95,4 +114,4 @@ async def get_unique_forbidden() -> set[Error]:
             )
         )
     )
-    return set(unhandled_errors)
+    return set(await attach_tracebacks(database, unhandled_errors))
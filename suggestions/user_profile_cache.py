@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+import disnake
+
+from suggestions import constants
+from suggestions.objects.user_profile import UserProfile
+
+if TYPE_CHECKING:
+    from suggestions import SuggestionsBot
+
+log = logging.getLogger(__name__)
+
+lookup_counter = constants.METER.create_counter(
+    "suggestions.user_profile_cache.lookups",
+    description="User profile cache lookups by result (hit, miss, collapsed)",
+)
+
+
+class UserProfileCache:
+    """A TTL and LRU bounded cache of UserProfile objects.
+
+    Embed rendering, decision notifications and the queue
+    all need the same few fields for a user. With member caching
+    disabled each of those used to be its own REST call.
+
+    Concurrent lookups for the same user share a single
+    in-flight fetch rather than each hitting the API.
+    """
+
+    def __init__(
+        self,
+        bot: SuggestionsBot,
+        *,
+        ttl: timedelta = timedelta(hours=1),
+        max_size: int = 50_000,
+    ):
+        self.bot: SuggestionsBot = bot
+        self.ttl: float = ttl.total_seconds()
+        self.max_size: int = max_size
+        self._cache: OrderedDict[int, tuple[float, UserProfile]] = OrderedDict()
+        self._in_flight: dict[int, asyncio.Future[UserProfile]] = {}
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, user_id: Any) -> bool:
+        return self._get(user_id) is not None
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _get(self, user_id: int) -> UserProfile | None:
+        try:
+            expires_at, profile = self._cache[user_id]
+        except KeyError:
+            return None
+
+        if expires_at < time.monotonic():
+            del self._cache[user_id]
+            return None
+
+        self._cache.move_to_end(user_id)
+        return profile
+
+    def add(self, profile: UserProfile) -> None:
+        self._cache[profile.user_id] = (time.monotonic() + self.ttl, profile)
+        self._cache.move_to_end(profile.user_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def add_user(self, user: disnake.User | disnake.Member) -> UserProfile:
+        """Refresh the cache from a user object we already have."""
+        profile = UserProfile.from_user(user)
+        existing = self._get(user.id)
+        if existing is not None and profile.dm_channel_id is None:
+            profile.dm_channel_id = existing.dm_channel_id
+
+        self.add(profile)
+        return profile
+
+    def evict(self, user_id: int) -> None:
+        self._cache.pop(user_id, None)
+
+    async def fetch(self, user_id: int) -> UserProfile:
+        """Fetch a users profile, only hitting the API on a cache miss."""
+        profile = self._get(user_id)
+        if profile is not None:
+            self.hits += 1
+            lookup_counter.add(1, {"result": "hit"})
+            return profile
+
+        in_flight = self._in_flight.get(user_id)
+        if in_flight is not None:
+            self.hits += 1
+            lookup_counter.add(1, {"result": "collapsed"})
+            return await asyncio.shield(in_flight)
+
+        self.misses += 1
+        lookup_counter.add(1, {"result": "miss"})
+        future: asyncio.Future[UserProfile] = asyncio.get_running_loop().create_future()
+        self._in_flight[user_id] = future
+        try:
+            user = await self.bot.fetch_user(user_id)
+            profile = self.add_user(user)
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark it retrieved so an un-awaited future doesn't log
+            future.exception()
+            raise
+        else:
+            future.set_result(profile)
+            return profile
+        finally:
+            self._in_flight.pop(user_id, None)
+
+    async def send_dm(self, user_id: int, **kwargs) -> disnake.Message:
+        """Send a DM to a user without needing a full User object.
+
+        The DM channel id is remembered on the profile so
+        subsequent messages skip opening the channel again.
+
+        Raises
+        ------
+        disnake.HTTPException
+            Sending the DM failed
+        """
+        profile = await self.fetch(user_id)
+        if profile.dm_channel_id is None:
+            data = await self.bot.http.start_private_message(user_id)
+            profile.dm_channel_id = int(data["id"])
+
+        channel = self.bot.get_partial_messageable(
+            profile.dm_channel_id, type=disnake.ChannelType.private
+        )
+        return await channel.send(**kwargs)
@@ -0,0 +1,38 @@
+"""Runs several clusters on one host, one process per cluster.
+
+Clusters ``FIRST_CLUSTER`` onwards are started, ``CLUSTERS_PER_HOST``
+of them, each handling the shards ``main.py`` would for that
+``CLUSTER``. Secrets are fetched once here and handed to the workers.
+"""
+
+import asyncio
+import logging
+import os
+
+from dotenv import load_dotenv
+
+from suggestions import constants
+from suggestions.supervisor import Supervisor
+
+load_dotenv()
+
+constants.configure_otel()
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(levelname)-8s | %(asctime)s | %(filename)19s:%(funcName)-27s | %(message)s",
+    datefmt="%d/%m/%Y %I:%M:%S %p",
+)
+logging.getLogger("suggestions").setLevel(logging.DEBUG)
+
+
+async def run_supervisor():
+    log = logging.getLogger(__name__)
+    first_cluster = int(os.environ.get("FIRST_CLUSTER", 1))
+    clusters_per_host = int(os.environ.get("CLUSTERS_PER_HOST", os.cpu_count()))
+    cluster_ids = list(range(first_cluster, first_cluster + clusters_per_host))
+
+    log.info("Supervising clusters %s", cluster_ids)
+    await Supervisor(cluster_ids).run()
+
+
+asyncio.run(run_supervisor())
@@ -1,13 +1,33 @@
+import asyncio
+import datetime
+import functools
 import os
-from unittest.mock import AsyncMock
+import time
+from typing import Optional
+from unittest.mock import AsyncMock, Mock
 
+import disnake
 import pytest
 
 from causar import Causar, InjectionMetadata
+from commons.caching import TimedCache
 
 import suggestions
-from tests.mocks import MockedSuggestionsMongoManager
+from suggestions import SuggestionsBot, constants, redis_cooldown
+from tests.helpers import STATS_NOW
+from tests.mocks import MockedSuggestionsMongoManager, MockedRedis
+from suggestions.error_recorder import ErrorRecorder
 from suggestions.interaction_handler import InteractionHandler
+from suggestions.invalidation import InvalidationBus
+from suggestions.launch_scheduler import LaunchScheduler
+from suggestions.locale_tracking import LocaleTracker
+from suggestions.objects import Suggestion
+from suggestions.redis_cooldown import RedisCooldown, SlidingWindowCooldown
+from suggestions.session_store import SessionStore
+from suggestions.shard_coordinator import ShardCoordinator
+from suggestions.stats import Stats
+from suggestions.supervisor import Supervisor
+from suggestions.low_level import guard_response
 
 
 @pytest.fixture
@@ -15,6 +35,13 @@ async def mocked_database() -> MockedSuggestionsMongoManager:
     return MockedSuggestionsMongoManager()
 
 
+@pytest.fixture
+async def redis(monkeypatch) -> MockedRedis:
+    client = MockedRedis()
+    monkeypatch.setattr(constants, "REDIS_CLIENT", client)
+    return client
+
+
 @pytest.fixture
 async def bot(monkeypatch, mocked_database):
     if "./suggestions" not in [x[0] for x in os.walk(".")]:
@@ -50,3 +77,217 @@ async def injection_metadata(causar: Causar) -> InjectionMetadata:
 @pytest.fixture
 async def interaction_handler(bot) -> InteractionHandler:
     return InteractionHandler(AsyncMock(), True, True)
+
+
+@pytest.fixture
+async def command_interaction(monkeypatch) -> Mock:
+    """An interaction whose responses take a moment, as if over HTTP.
+
+    Each response made is appended to ``responses``.
+    """
+    interaction = Mock(id=disnake.utils.time_snowflake(disnake.utils.utcnow()))
+    interaction.responses = []
+    interaction.followup.send = AsyncMock()
+
+    def responding_with(kind: str, response_type: disnake.InteractionResponseType):
+        async def respond(response, *args, **kwargs):
+            if response.is_done():
+                raise AssertionError("Interaction acknowledged twice")
+
+            await asyncio.sleep(0.01)
+            response._response_type = response_type
+            interaction.responses.append(kind)
+
+        return respond
+
+    monkeypatch.setattr(
+        disnake.InteractionResponse,
+        "defer",
+        responding_with(
+            "defer", disnake.InteractionResponseType.deferred_channel_message
+        ),
+    )
+    monkeypatch.setattr(
+        disnake.InteractionResponse,
+        "send_message",
+        responding_with("send", disnake.InteractionResponseType.channel_message),
+    )
+    interaction.response = disnake.InteractionResponse(interaction)
+    guard_response(interaction)
+    interaction.response = interaction._cs_response
+    return interaction
+
+
+@pytest.fixture
+async def locale_tracker() -> LocaleTracker:
+    bot = Mock()
+    bot.state.now = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+    bot.db.locale_usage.bulk_write = AsyncMock()
+    return LocaleTracker(bot, max_pending=3)
+
+
+@pytest.fixture
+async def error_recorder() -> ErrorRecorder:
+    bot = Mock()
+    bot.db.error_tracking.insert = AsyncMock()
+    bot.db.error_tracking.bulk_write = AsyncMock()
+    bot.db.error_fingerprints.bulk_write = AsyncMock()
+    return ErrorRecorder(bot)
+
+
+@pytest.fixture
+async def forbidden() -> disnake.Forbidden:
+    return disnake.Forbidden(Mock(status=403, reason="Forbidden"), "Missing Access")
+
+
+@pytest.fixture
+async def channel_fetching_bot(forbidden) -> Mock:
+    """A bot fetching channels for real, which it isn't allowed to see."""
+    bot = Mock()
+    bot.get_channel.return_value = None
+    bot.state.fetch_channel = AsyncMock(side_effect=forbidden)
+    bot.state.suggestions_db.delete = AsyncMock()
+    bot.suggestion_emojis.up_vote_for.return_value = "👍"
+    bot.suggestion_emojis.down_vote_for.return_value = "👎"
+    bot.get_or_fetch_channel = functools.partial(
+        SuggestionsBot.get_or_fetch_channel, bot
+    )
+    return bot
+
+
+@pytest.fixture
+async def unsaved_suggestion() -> Mock:
+    """Runs the real Suggestion methods without a stored suggestion."""
+    suggestion = Mock(suggestion_id="abc", guild_id=1)
+    suggestion.as_embed = AsyncMock(return_value=disnake.Embed())
+    suggestion.save_reaction_results = AsyncMock()
+    suggestion._fetch_log_channel = Suggestion._fetch_log_channel
+    return suggestion
+
+
+@pytest.fixture
+async def cluster_bot() -> Mock:
+    """Enough of a bot to run its Redis syncing methods."""
+    bot = Mock()
+    bot.cluster_id = 1
+    bot.guild_ids = {1, 2, 3}
+    bot.redis_guilds_key = SuggestionsBot.guilds_key_for(1)
+    bot.state.now = datetime.datetime.now(datetime.timezone.utc)
+    return bot
+
+
+@pytest.fixture
+async def gcra(redis) -> RedisCooldown:
+    def bucket(user_id: int) -> int:
+        return user_id
+
+    return RedisCooldown(2, 60, bucket, bucket)
+
+
+@pytest.fixture
+async def sliding_window(redis, monkeypatch) -> SlidingWindowCooldown:
+    # The script is registered once against whichever client is in use
+    monkeypatch.setattr(redis_cooldown, "_sliding_window_script", None)
+    return SlidingWindowCooldown(2, datetime.timedelta(minutes=1))
+
+
+@pytest.fixture
+async def invalidation_bus() -> InvalidationBus:
+    bot = Mock()
+    bot.cluster_id = 1
+    bot.state.guild_configs = TimedCache()
+    bot.state.user_configs = TimedCache()
+    bot.state.guild_configs.add_entry(10, "guild config")
+    bot.state.user_configs.add_entry(20, "user config")
+    return InvalidationBus(bot)
+
+
+@pytest.fixture
+async def shutting_down_bot() -> Mock:
+    """Enough of a bot to run graceful_shutdown against."""
+    bot = Mock()
+    bot.state.background_tasks = []
+    bot._shutdown_step = SuggestionsBot._shutdown_step
+    bot.stats.flush_member_stats = AsyncMock()
+    bot.locale_tracker.flush = AsyncMock()
+    bot.error_recorder.flush = AsyncMock()
+    bot.cluster_registry.deregister = AsyncMock()
+    bot.session_store.close_resumable = AsyncMock()
+    bot.shard_coordinator.release_all = AsyncMock()
+    bot.close = AsyncMock()
+    return bot
+
+
+def generate_shard(session_id: Optional[str], sequence: Optional[int] = 10) -> Mock:
+    shard = Mock()
+    shard._parent.ws.session_id = session_id
+    shard._parent.ws.sequence = sequence
+    shard._parent.ws.resume_gateway = "wss://gateway.discord.gg"
+    shard._parent.ws.close = AsyncMock()
+    return shard
+
+
+@pytest.fixture
+async def session_store() -> SessionStore:
+    bot = Mock()
+    bot.shards = {
+        0: generate_shard("session 0"),
+        1: generate_shard("session 1", sequence=20),
+        2: generate_shard(None, sequence=None),
+    }
+    return SessionStore(bot)
+
+
+@pytest.fixture
+async def launch_scheduler() -> LaunchScheduler:
+    bot = Mock()
+    bot.cluster_id = 1
+    bot.launch_shard = AsyncMock()
+    return LaunchScheduler(bot, identify_interval=datetime.timedelta(seconds=0.05))
+
+
+def generate_coordinator(member_id: str) -> ShardCoordinator:
+    coordinator = ShardCoordinator(
+        total_shards=40,
+        shards_per_range=10,
+        renew_interval=datetime.timedelta(seconds=0),
+    )
+    coordinator.member_id = member_id
+    return coordinator
+
+
+@pytest.fixture
+async def shard_coordinator() -> ShardCoordinator:
+    return generate_coordinator("a")
+
+
+@pytest.fixture
+async def other_coordinator() -> ShardCoordinator:
+    """Another cluster's coordinator sharing the same ranges."""
+    return generate_coordinator("b")
+
+
+@pytest.fixture
+async def cluster_supervisor() -> Supervisor:
+    """Supervises clusters 1 to 4, each started long enough ago to be healthy."""
+    supervisor = Supervisor(
+        (1, 2, 3, 4),
+        startup_grace=datetime.timedelta(seconds=30),
+        unhealthy_after=datetime.timedelta(seconds=60),
+    )
+    for worker in supervisor.workers.values():
+        worker.process = Mock(returncode=None)
+        worker.started_at = time.monotonic() - 600
+        worker.stop = AsyncMock()
+
+    return supervisor
+
+
+@pytest.fixture
+async def stats() -> Stats:
+    bot = Mock()
+    bot.cluster_id = 1
+    bot.state.now = STATS_NOW
+    bot.db.member_stats.bulk_write = AsyncMock()
+    bot.db.stats_rollups.bulk_write = AsyncMock()
+    return Stats(bot)
@@ -1,3 +1,4 @@
+import datetime
 from typing import overload, cast
 
 from alaric import Document
@@ -5,6 +6,9 @@ from causar import Causar
 
 from suggestions import SuggestionsBot
 
+# What the stats fixture's bot reports as the current time
+STATS_NOW = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+
 
 @overload
 async def assert_stats_count(
@@ -39,6 +43,7 @@ async def assert_stats_count(
     should_be_none: bool = False,
 ):
     bot: SuggestionsBot = cast(SuggestionsBot, causar.bot)
+    await bot.stats.flush_member_stats()
     db: Document = bot.db.member_stats
 
     r_1 = await db.find({"member_id": member_id, "guild_id": guild_id})
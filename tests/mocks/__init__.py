@@ -1 +1,2 @@
 from .database import MockedSuggestionsMongoManager
+from .redis import MockedRedis
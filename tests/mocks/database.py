@@ -8,6 +8,12 @@ from suggestions.objects import (
     Error,
     QueuedSuggestion,
 )
+from suggestions.database import (
+    ensure_indexes,
+    audit_indexes,
+    IndexAudit,
+    InstrumentedDocument,
+)
 from suggestions.objects.stats import MemberStats
 
 
@@ -22,27 +28,45 @@ class MockedSuggestionsMongoManager:
         self.user_blacklist = Document(self.db, "user_blacklist")
         self.guild_blacklist = Document(self.db, "guild_blacklist")
 
-        self.suggestions: Document = Document(
+        self.suggestions: Document = InstrumentedDocument(
             self.db, "suggestions", converter=Suggestion
         )
-        self.guild_configs: Document = Document(
+        self.guild_configs: Document = InstrumentedDocument(
             self.db, "guild_configs", converter=GuildConfig
         )
-        self.user_configs: Document = Document(
+        self.user_configs: Document = InstrumentedDocument(
             self.db, "user_configs", converter=UserConfig
         )
-        self.beta_links: Document = Document(self.db, "beta_links")
-        self.cluster_guild_counts: Document = Document(self.db, "cluster_guild_counts")
-        self.cluster_shutdown_requests: Document = Document(
+        self.beta_links: Document = InstrumentedDocument(self.db, "beta_links")
+        self.cluster_guild_counts: Document = InstrumentedDocument(
+            self.db, "cluster_guild_counts"
+        )
+        self.cluster_shutdown_requests: Document = InstrumentedDocument(
             self.db, "cluster_shutdown_requests"
         )
-        self.member_stats: Document = Document(
+        self.member_stats: Document = InstrumentedDocument(
             self.db, "member_stats", converter=MemberStats
         )
-        self.locale_tracking: Document = Document(self.db, "locale_tracking")
-        self.error_tracking: Document = Document(
+        self.locale_tracking: Document = InstrumentedDocument(
+            self.db, "locale_tracking"
+        )
+        self.locale_usage: Document = InstrumentedDocument(self.db, "locale_usage")
+        self.stats_rollups: Document = InstrumentedDocument(self.db, "stats_rollups")
+        self.guild_vote_emojis: Document = InstrumentedDocument(
+            self.db, "guild_vote_emojis"
+        )
+        self.error_tracking: Document = InstrumentedDocument(
             self.db, "error_tracking", converter=Error
         )
-        self.queued_suggestions: Document = Document(
+        self.error_fingerprints: Document = InstrumentedDocument(
+            self.db, "error_fingerprints"
+        )
+        self.queued_suggestions: Document = InstrumentedDocument(
             self.db, "queued_suggestions", converter=QueuedSuggestion
         )
+
+    async def ensure_indexes(self) -> None:
+        await ensure_indexes(self.db)
+
+    async def audit_indexes(self) -> list[IndexAudit]:
+        return await audit_indexes(self.db)
@@ -0,0 +1,5 @@
+from fakeredis import FakeAsyncRedis
+
+
+class MockedRedis(FakeAsyncRedis):
+    """An in memory Redis, scripts need fakeredis' lua extra."""
@@ -0,0 +1,75 @@
+import asyncio
+from unittest.mock import Mock
+
+import disnake
+import pytest
+
+from suggestions.auto_defer import (
+    AUTO_DEFER,
+    AUTO_DEFER_EPHEMERAL,
+    auto_defer,
+    auto_defer_options,
+    defer,
+)
+
+
+async def test_send_waits_for_defer_in_flight(command_interaction):
+    deferring = asyncio.create_task(defer(command_interaction))
+    await asyncio.sleep(0)
+    await command_interaction.response.send_message("Pong!", ephemeral=True)
+
+    assert await deferring
+    assert command_interaction.responses == ["defer"]
+    # So the message fills in the deferred response instead
+    command_interaction.followup.send.assert_awaited_once_with("Pong!", ephemeral=True)
+
+
+async def test_defer_waits_for_send_in_flight(command_interaction):
+    sending = asyncio.create_task(command_interaction.response.send_message("Pong!"))
+    await asyncio.sleep(0)
+
+    assert not await defer(command_interaction)
+    await sending
+    assert command_interaction.responses == ["send"]
+    command_interaction.followup.send.assert_not_awaited()
+
+
+async def test_defer_retries_after_failed_response(command_interaction, monkeypatch):
+    async def fail(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        raise ConnectionError
+
+    monkeypatch.setattr(disnake.InteractionResponse, "send_message", fail)
+    sending = asyncio.create_task(command_interaction.response.send_message("Pong!"))
+    await asyncio.sleep(0)
+
+    assert await defer(command_interaction)
+    assert command_interaction.responses == ["defer"]
+    with pytest.raises(ConnectionError):
+        await sending
+
+
+async def test_auto_defer_late_command(command_interaction):
+    command_interaction.application_command.extras = {AUTO_DEFER_EPHEMERAL: False}
+    command_interaction.data._get_chain_and_kwargs.return_value = ([], {})
+
+    async with auto_defer(command_interaction, after=0):
+        await asyncio.sleep(0.005)
+        # The command responding while the auto defer is in flight
+        await disnake.Interaction.send(command_interaction, "Pong!")
+
+    assert command_interaction.responses == ["defer"]
+    command_interaction.followup.send.assert_awaited_once()
+    assert command_interaction.followup.send.call_args.kwargs["content"] == "Pong!"
+
+
+async def test_auto_defer_options():
+    interaction = Mock()
+    interaction.application_command.extras = {}
+    interaction.data._get_chain_and_kwargs.return_value = (["sub"], {})
+    sub_command = interaction.application_command.children.get.return_value
+    sub_command.extras = {AUTO_DEFER_EPHEMERAL: False}
+    assert auto_defer_options(interaction) == {"ephemeral": False, "with_message": True}
+
+    sub_command.extras = {AUTO_DEFER: False}
+    assert auto_defer_options(interaction) is None
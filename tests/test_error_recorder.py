@@ -0,0 +1,104 @@
+import datetime
+
+from pymongo.errors import DuplicateKeyError
+
+from suggestions.objects import Error
+
+NOW = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+
+
+def generate_error(error_id: str, *, traceback: str = "Traceback", **kwargs) -> Error:
+    return Error(
+        _id=error_id,
+        traceback=traceback,
+        error="ValueError",
+        user_id=1,
+        guild_id=2,
+        command_name=kwargs.pop("command_name", "suggest"),
+        cluster_id=1,
+        shard_id=0,
+        created_at=kwargs.pop("created_at", NOW),
+        **kwargs,
+    )
+
+
+async def test_fingerprint():
+    error = generate_error("a")
+    assert error.fingerprint == generate_error("b").fingerprint
+    assert error.fingerprint == Error.build_fingerprint(
+        "ValueError", "Traceback", "suggest"
+    )
+    assert error.fingerprint != generate_error("a", traceback="Other").fingerprint
+    assert error.fingerprint != generate_error("a", command_name="approve").fingerprint
+    # Stored fingerprints are kept rather than recomputed
+    assert generate_error("a", fingerprint="stored").fingerprint == "stored"
+
+
+async def test_record_writes_error_id(error_recorder):
+    await error_recorder.record(generate_error("a"))
+    document = error_recorder.bot.db.error_tracking.insert.call_args.args[0]
+    assert document["_id"] == "a"
+    # Which is stored once per fingerprint instead
+    assert document["traceback"] is None
+
+    await error_recorder.flush()
+    error_recorder.bot.db.error_tracking.bulk_write.assert_not_awaited()
+
+
+async def test_record_retries_failed_writes(error_recorder):
+    tracking = error_recorder.bot.db.error_tracking
+    tracking.insert.side_effect = ConnectionError
+    await error_recorder.record(generate_error("a"))
+    tracking.insert.side_effect = DuplicateKeyError("a")
+    await error_recorder.record(generate_error("b"))
+    assert len(error_recorder._untracked) == 1
+
+    tracking.bulk_write.side_effect = ConnectionError
+    await error_recorder.flush()
+    assert len(error_recorder._untracked) == 1
+
+    tracking.bulk_write.side_effect = None
+    await error_recorder.flush()
+    assert [r._doc["_id"] for r in tracking.bulk_write.call_args.args[0]] == ["a"]
+    assert len(error_recorder) == 0
+
+
+async def test_flush_upserts_fingerprints(error_recorder):
+    later = NOW + datetime.timedelta(minutes=1)
+    await error_recorder.record(generate_error("a"))
+    await error_recorder.record(generate_error("b", created_at=later))
+    await error_recorder.record(generate_error("c", command_name="approve"))
+    await error_recorder.flush()
+
+    fingerprints = error_recorder.bot.db.error_fingerprints.bulk_write
+    requests = fingerprints.call_args.args[0]
+    assert len(requests) == 2
+    update = requests[0]._doc
+    assert update["$inc"] == {"count": 2}
+    assert update["$set"] == {"last_seen_at": later}
+    assert update["$setOnInsert"]["traceback"] == "Traceback"
+    assert update["$setOnInsert"]["first_seen_at"] == NOW
+
+    # Known fingerprints don't send their traceback again
+    await error_recorder.record(generate_error("d"))
+    await error_recorder.flush()
+    update = fingerprints.call_args.args[0][0]._doc
+    assert update["$inc"] == {"count": 1}
+    assert "$setOnInsert" not in update
+
+
+async def test_flush_failure_keeps_fingerprints(error_recorder):
+    fingerprints = error_recorder.bot.db.error_fingerprints.bulk_write
+    fingerprints.side_effect = ConnectionError
+    error_recorder.max_buffered = 2
+    for error_id in "abc":
+        await error_recorder.record(generate_error(error_id))
+
+    await error_recorder.flush()
+    # The oldest are dropped once too many are held
+    assert [error.id for error in error_recorder._pending] == ["b", "c"]
+
+    fingerprints.side_effect = None
+    await error_recorder.flush()
+    assert fingerprints.call_args.args[0][0]._doc["$inc"] == {"count": 2}
+    assert len(error_recorder) == 0
@@ -0,0 +1,32 @@
+import asyncio
+
+from suggestions import SuggestionsBot
+
+
+async def test_graceful_shutdown(shutting_down_bot):
+    await SuggestionsBot.graceful_shutdown(shutting_down_bot)
+    shutting_down_bot.state.notify_shutdown.assert_called_once()
+    shutting_down_bot.session_store.close_resumable.assert_awaited_once()
+    shutting_down_bot.shard_coordinator.release_all.assert_awaited_once()
+    shutting_down_bot.close.assert_awaited_once()
+
+
+async def test_graceful_shutdown_survives_failures(shutting_down_bot):
+    async def crash():
+        raise ConnectionError
+
+    shutting_down_bot.state.background_tasks = [asyncio.create_task(crash())]
+    for step in (
+        shutting_down_bot.stats.flush_member_stats,
+        shutting_down_bot.error_recorder.flush,
+        shutting_down_bot.cluster_registry.deregister,
+        shutting_down_bot.session_store.close_resumable,
+    ):
+        step.side_effect = ConnectionError
+
+    await SuggestionsBot.graceful_shutdown(shutting_down_bot)
+    # Every step still ran, most importantly releasing our shards
+    shutting_down_bot.locale_tracker.flush.assert_awaited_once()
+    shutting_down_bot.session_store.close_resumable.assert_awaited_once()
+    shutting_down_bot.shard_coordinator.release_all.assert_awaited_once()
+    shutting_down_bot.close.assert_awaited_once()
@@ -0,0 +1,71 @@
+import time
+
+from suggestions import SuggestionsBot
+from suggestions.bot import GUILD_COUNT_STALE_AFTER, GUILD_COUNTS_KEY
+
+
+async def guilds_in_redis(redis, cluster_bot) -> set[int]:
+    return {
+        int(guild_id) for guild_id in await redis.smembers(cluster_bot.redis_guilds_key)
+    }
+
+
+async def test_sync_guilds(redis, cluster_bot):
+    synced = await SuggestionsBot.sync_guilds(cluster_bot, set(), reconcile=True)
+    assert synced == {1, 2, 3}
+    assert await guilds_in_redis(redis, cluster_bot) == {1, 2, 3}
+    assert 0 < await redis.ttl(cluster_bot.redis_guilds_key) <= 15 * 60
+    assert await redis.hget(GUILD_COUNTS_KEY, "1:count") == b"3"
+
+    cluster_bot.guild_ids = {2, 3, 4}
+    synced = await SuggestionsBot.sync_guilds(cluster_bot, synced)
+    assert synced == {2, 3, 4}
+    assert await guilds_in_redis(redis, cluster_bot) == {2, 3, 4}
+
+
+async def test_sync_guilds_only_sends_changes(redis, cluster_bot):
+    synced = await SuggestionsBot.sync_guilds(cluster_bot, set(), reconcile=True)
+    # Something we didn't send, which a diff leaves alone
+    await redis.sadd(cluster_bot.redis_guilds_key, 99)
+
+    cluster_bot.guild_ids = {1, 2}
+    synced = await SuggestionsBot.sync_guilds(cluster_bot, synced)
+    assert await guilds_in_redis(redis, cluster_bot) == {1, 2, 99}
+
+    # Whereas reconciling rewrites the set
+    await SuggestionsBot.sync_guilds(cluster_bot, synced, reconcile=True)
+    assert await guilds_in_redis(redis, cluster_bot) == {1, 2}
+
+
+async def publish_count(redis, cluster_id: int, count: int, *, age: float) -> None:
+    await redis.hset(
+        GUILD_COUNTS_KEY,
+        mapping={
+            f"{cluster_id}:count": count,
+            f"{cluster_id}:updated_at": time.time() - age,
+        },
+    )
+
+
+async def test_guild_count_skips_stale_clusters(redis):
+    await publish_count(redis, 1, 10, age=1)
+    await publish_count(redis, 2, 20, age=GUILD_COUNT_STALE_AFTER.total_seconds() + 1)
+    await redis.hset(GUILD_COUNTS_KEY, "3:count", 30)
+
+    assert await SuggestionsBot.get_accurate_guild_count() == 10
+    assert await redis.hkeys(GUILD_COUNTS_KEY) == [b"1:count", b"1:updated_at"]
+
+
+async def test_guild_count_keeps_republished_clusters(redis, monkeypatch):
+    await publish_count(redis, 2, 20, age=GUILD_COUNT_STALE_AFTER.total_seconds() + 1)
+    hgetall = redis.hgetall
+
+    async def read_then_publish(key):
+        counts = await hgetall(key)
+        # Cluster 2 comes back between reading and clearing its count
+        await publish_count(redis, 2, 25, age=0)
+        return counts
+
+    monkeypatch.setattr(redis, "hgetall", read_then_publish)
+    assert await SuggestionsBot.get_accurate_guild_count() == 0
+    assert await redis.hget(GUILD_COUNTS_KEY, "2:count") == b"25"
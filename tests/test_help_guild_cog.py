@@ -1,3 +1,4 @@
+import time
 from typing import cast, NamedTuple
 
 import disnake
@@ -5,6 +6,8 @@ from causar import Causar, Injection, TransactionTypes
 from causar import transactions as t
 
 from suggestions import SuggestionsBot
+from suggestions.cluster_registry import CLUSTERS_KEY, ClusterHeartbeat
+from tests.mocks import MockedRedis
 
 
 async def test_error_code(causar: Causar):
@@ -47,7 +50,24 @@ async def test_incorrect_error_code(causar: Causar):
     assert transaction.embed == embed
 
 
-async def test_instance_info(causar: Causar):
+async def seed_clusters(redis: MockedRedis, *, total_shards: int, updated_at: float):
+    # Ten shards per cluster, starting from cluster 1
+    for cluster_id, start in enumerate(range(0, total_shards, 10), start=1):
+        shard_ids = list(range(start, min(start + 10, total_shards)))
+        heartbeat = ClusterHeartbeat(
+            cluster_id=cluster_id,
+            shard_ids=shard_ids,
+            guild_count=1,
+            shard_latencies={shard_id: 0.1 for shard_id in shard_ids},
+            loop_lag=0,
+            rss=0,
+            interactions_per_second=0,
+            updated_at=updated_at,
+        )
+        await redis.hset(CLUSTERS_KEY, str(cluster_id), heartbeat.as_json())
+
+
+async def test_instance_info(causar: Causar, redis: MockedRedis):
     class Info(NamedTuple):
         guild_id: int
         cluster_id: int
@@ -61,10 +81,12 @@ async def test_instance_info(causar: Causar):
         Info(934497725809037312, 2, 11),
         Info(500525882226769931, 3, 24),
     ]
+    causar.bot.shard_count = 53
+    await seed_clusters(redis, total_shards=53, updated_at=time.time())
 
     for info in test_guilds:
         injection: Injection = await causar.generate_injection("instance_info")
-        injection.set_kwargs(guild_id=info.guild_id)
+        injection.set_kwargs(guild_id=str(info.guild_id))
         await causar.run_command(injection)
         assert len(injection.transactions) == 1
         transaction: t.InteractionResponseSent = injection.transactions[0]
@@ -72,5 +94,24 @@ async def test_instance_info(causar: Causar):
         assert transaction.ephemeral is True
         assert (
             transaction.content == f"Guild `{info.guild_id}` should be in cluster "
-            f"`{info.cluster_id}` with the specific shard `{info.shard_id}`",
+            f"`{info.cluster_id}` with the specific shard `{info.shard_id}`"
         )
+
+
+async def test_instance_info_without_healthy_cluster(
+    causar: Causar, redis: MockedRedis
+):
+    causar.bot.shard_count = 53
+    # Stale, but not old enough to be forgotten
+    await seed_clusters(redis, total_shards=53, updated_at=time.time() - 60)
+
+    injection: Injection = await causar.generate_injection("instance_info")
+    injection.set_kwargs(guild_id="808030843078836254")
+    await causar.run_command(injection)
+    assert len(injection.transactions) == 1
+    transaction: t.InteractionResponseSent = injection.transactions[0]
+    assert transaction.ephemeral is True
+    assert (
+        transaction.content == "Guild `808030843078836254` should be on shard `44`, "
+        "however no healthy cluster currently reports running it"
+    )
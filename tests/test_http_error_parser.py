@@ -0,0 +1,90 @@
+import functools
+from unittest.mock import AsyncMock, Mock
+
+import disnake
+import pytest
+
+from suggestions import ErrorCode
+from suggestions.http_error_parser import try_parse_http_error
+from suggestions.objects import Suggestion
+
+
+async def parse_raised(coro) -> ErrorCode:
+    with pytest.raises(disnake.Forbidden) as e:
+        await coro
+
+    return try_parse_http_error(e.value)
+
+
+async def setup_initial_messages(suggestion: Mock, bot: Mock) -> None:
+    await Suggestion.setup_initial_messages(
+        suggestion,
+        guild_config=Mock(),
+        cog=Mock(),
+        guild=Mock(),
+        icon_url=None,
+        ih=Mock(bot=bot),
+    )
+
+
+async def edit_message_after_finalization(
+    suggestion: Mock, bot: Mock, *, keep_logs: bool
+) -> None:
+    await Suggestion.edit_message_after_finalization(
+        suggestion,
+        guild_config=Mock(keep_logs=keep_logs),
+        bot=bot,
+        state=bot.state,
+        interaction=Mock(),
+    )
+
+
+async def test_fetching_suggestions_channel(unsaved_suggestion, channel_fetching_bot):
+    assert (
+        await parse_raised(
+            setup_initial_messages(unsaved_suggestion, channel_fetching_bot)
+        )
+        == ErrorCode.MISSING_FETCH_PERMISSIONS_IN_SUGGESTIONS_CHANNEL
+    )
+    assert (
+        await parse_raised(
+            edit_message_after_finalization(
+                unsaved_suggestion, channel_fetching_bot, keep_logs=True
+            )
+        )
+        == ErrorCode.MISSING_FETCH_PERMISSIONS_IN_SUGGESTIONS_CHANNEL
+    )
+
+
+async def test_fetching_logs_channel(unsaved_suggestion, channel_fetching_bot):
+    assert (
+        await parse_raised(
+            edit_message_after_finalization(
+                unsaved_suggestion, channel_fetching_bot, keep_logs=False
+            )
+        )
+        == ErrorCode.MISSING_FETCH_PERMISSIONS_IN_LOGS_CHANNEL
+    )
+
+
+async def test_sending_to_suggestions_channel(
+    unsaved_suggestion, channel_fetching_bot, forbidden
+):
+    channel = Mock()
+    channel._get_channel = AsyncMock(side_effect=forbidden)
+    channel.send = functools.partial(disnake.abc.Messageable.send, channel)
+    channel_fetching_bot.get_channel.return_value = channel
+
+    assert (
+        await parse_raised(
+            setup_initial_messages(unsaved_suggestion, channel_fetching_bot)
+        )
+        == ErrorCode.MISSING_SEND_PERMISSIONS_IN_SUGGESTION_CHANNEL
+    )
+
+
+async def test_unknown_call_site(forbidden):
+    async def fetch():
+        raise forbidden
+
+    assert await parse_raised(fetch()) is None
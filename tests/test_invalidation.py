@@ -0,0 +1,47 @@
+from suggestions.invalidation import InvalidationEntity
+
+
+async def test_handle_message_evicts(invalidation_bus):
+    invalidation_bus.handle_message(b"gc:10:5:2")
+    assert 10 not in invalidation_bus.bot.state.guild_configs
+    assert 20 in invalidation_bus.bot.state.user_configs
+
+    invalidation_bus.handle_message(b"uc:20:5:2")
+    assert 20 not in invalidation_bus.bot.state.user_configs
+
+
+async def test_handle_message_ignores_written_at(invalidation_bus):
+    invalidation_bus.handle_message(b"bl:10:100:2")
+    invalidation_bus.bot.state.guild_configs.add_entry(10, "guild config")
+
+    # Another host's clock being behind must not drop the eviction
+    invalidation_bus.handle_message(b"bl:10:1:3")
+    assert 10 not in invalidation_bus.bot.state.guild_configs
+
+
+async def test_handle_message_ignores_own_cluster(invalidation_bus):
+    invalidation_bus.handle_message(b"gc:10:5:1")
+    assert 10 in invalidation_bus.bot.state.guild_configs
+
+
+async def test_handle_message_malformed(invalidation_bus):
+    for message in (b"gc:10", b"xx:10:5:2", b"gc:ten:5:2", b"gc:10:5:two"):
+        invalidation_bus.handle_message(message)
+
+    assert 10 in invalidation_bus.bot.state.guild_configs
+    assert 20 in invalidation_bus.bot.state.user_configs
+
+
+async def test_publish(redis, invalidation_bus):
+    async with redis.pubsub() as pubsub:
+        await pubsub.subscribe(invalidation_bus.CHANNEL)
+        await invalidation_bus.publish(InvalidationEntity.USER_CONFIG, 20)
+        message = None
+        while message is None:
+            # The first call only consumes the subscribe confirmation
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=1
+            )
+
+    entity, entity_id, _, cluster_id = message["data"].decode().split(":")
+    assert (entity, entity_id, cluster_id) == ("uc", "20", "1")
@@ -0,0 +1,76 @@
+from unittest.mock import AsyncMock
+
+
+async def test_bucket_for(launch_scheduler):
+    assert [launch_scheduler.bucket_for(i) for i in range(4)] == [0, 0, 0, 0]
+
+    launch_scheduler.max_concurrency = 16
+    assert launch_scheduler.bucket_for(3) == 3
+    assert launch_scheduler.bucket_for(19) == 3
+    assert launch_scheduler.bucket_for(32) == 0
+
+
+async def test_launch_groups_buckets(launch_scheduler):
+    launched: list[int] = []
+
+    async def launch_shard(gateway: str, shard_id: int, *, initial: bool):
+        assert initial is (shard_id == 10)
+        launched.append(shard_id)
+
+    launch_scheduler.bot.launch_shard = AsyncMock(side_effect=launch_shard)
+    await launch_scheduler.launch(
+        "wss://gateway", list(range(10, 20)), max_concurrency=4
+    )
+
+    assert launch_scheduler.max_concurrency == 4
+    assert sorted(launched) == list(range(10, 20))
+    # Within a bucket shards still launch in order
+    for bucket in range(4):
+        in_bucket = [i for i in launched if i % 4 == bucket]
+        assert in_bucket == sorted(in_bucket)
+
+    # Shards stay pending until they are ready
+    assert sorted(launch_scheduler._launch_started) == list(range(10, 20))
+    await launch_scheduler.on_shard_connect(10)
+    await launch_scheduler.on_shard_resumed(11)
+    assert 10 in launch_scheduler.ready_timings and 11 in launch_scheduler.ready_timings
+    assert 10 not in launch_scheduler._launch_started
+
+
+async def test_launch_keeps_max_concurrency(launch_scheduler):
+    await launch_scheduler.launch("wss://gateway", [0, 1], max_concurrency=0)
+    assert launch_scheduler.max_concurrency == 1
+
+    launch_scheduler.max_concurrency = 16
+    await launch_scheduler.launch("wss://gateway", [0, 1])
+    assert launch_scheduler.max_concurrency == 16
+
+
+async def test_reconnects_are_not_timed(launch_scheduler):
+    await launch_scheduler.on_shard_connect(5)
+    assert launch_scheduler.ready_timings == {}
+
+
+async def test_acquire_identify_slot(redis, launch_scheduler):
+    launch_scheduler.max_concurrency = 2
+
+    await launch_scheduler.acquire_identify_slot(0)
+    assert await redis.get(launch_scheduler.key_for(0)) == b"1:0"
+    # Other buckets don't wait on each other
+    await launch_scheduler.acquire_identify_slot(1)
+    assert await redis.get(launch_scheduler.key_for(1)) == b"1:1"
+
+    # Whereas shard 2 has to wait for shard 0's slot to expire
+    await launch_scheduler.acquire_identify_slot(2)
+    assert await redis.get(launch_scheduler.key_for(0)) == b"1:2"
+
+
+async def test_acquire_identify_slot_without_redis(
+    redis, monkeypatch, launch_scheduler
+):
+    monkeypatch.setattr(redis, "set", AsyncMock(side_effect=ConnectionError))
+
+    await launch_scheduler.acquire_identify_slot(0)
+    first = launch_scheduler._last_identify[0]
+    await launch_scheduler.acquire_identify_slot(1)
+    assert launch_scheduler._last_identify[0] - first >= 0.04
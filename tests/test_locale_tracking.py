@@ -0,0 +1,65 @@
+import datetime
+
+
+def written(bulk_write) -> dict:
+    return {
+        (request._filter["locale"], request._filter["guild_id"]): request._doc["$inc"][
+            "count"
+        ]
+        for request in bulk_write.call_args.args[0]
+    }
+
+
+async def test_track_aggregates(locale_tracker):
+    locale_tracker.track("en-US", 1)
+    locale_tracker.track("en-US", 1)
+    locale_tracker.track("en-US", None)
+    locale_tracker.track("pt-BR", 1)
+    assert len(locale_tracker) == 3
+
+    # Existing keys keep counting once full, new ones are dropped
+    locale_tracker.track("de", 1)
+    locale_tracker.track("en-US", 1)
+    assert locale_tracker.dropped == 1
+    assert locale_tracker._pending[("en-US", 1)] == 3
+
+
+async def test_flush(locale_tracker):
+    locale_tracker.track("en-US", 1)
+    locale_tracker.track("en-US", 1)
+    locale_tracker.track("pt-BR", None)
+    await locale_tracker.flush()
+
+    bulk_write = locale_tracker.bot.db.locale_usage.bulk_write
+    assert written(bulk_write) == {("en-US", 1): 2, ("pt-BR", None): 1}
+    request = bulk_write.call_args.args[0][0]
+    assert request._filter["day"] == datetime.datetime(
+        2024, 5, 1, tzinfo=datetime.timezone.utc
+    )
+    assert len(locale_tracker) == 0
+
+    await locale_tracker.flush()
+    bulk_write.assert_awaited_once()
+
+
+async def test_flush_failure_requeues(locale_tracker):
+    async def fail(requests, *, ordered):
+        # Tracked while the write was in flight
+        for locale in ("en-US", "de", "fr"):
+            locale_tracker.track(locale, 1)
+
+        raise ConnectionError
+
+    bulk_write = locale_tracker.bot.db.locale_usage.bulk_write
+    bulk_write.side_effect = fail
+    locale_tracker.track("en-US", 1)
+    locale_tracker.track("pt-BR", 1)
+    await locale_tracker.flush()
+
+    # Only room for the entry which was already buffered to go back
+    assert locale_tracker._pending == {("en-US", 1): 2, ("de", 1): 1, ("fr", 1): 1}
+    assert locale_tracker.dropped == 1
+
+    bulk_write.side_effect = None
+    await locale_tracker.flush()
+    assert written(bulk_write) == {("en-US", 1): 2, ("de", 1): 1, ("fr", 1): 1}
@@ -0,0 +1,138 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from cooldowns import CallableOnCooldown
+
+from suggestions.redis_cooldown import RedisCooldown, cooldown
+
+
+async def test_gcra_limits(gcra):
+    await gcra.acquire(1)
+    await gcra.acquire(1)
+    with pytest.raises(CallableOnCooldown) as e:
+        await gcra.acquire(1)
+
+    assert 0 < e.value.retry_after <= 30
+
+    # Other buckets are unaffected
+    await gcra.acquire(2)
+
+
+async def test_gcra_shared_between_instances(redis, gcra):
+    # Each cluster has its own instance, they share state through Redis
+    await RedisCooldown(1, 60, gcra._bucket, gcra._func).acquire(1)
+    gcra.limit = 1
+    with pytest.raises(CallableOnCooldown):
+        await gcra.acquire(1)
+
+    # Which is now remembered locally
+    redis.evalsha = AsyncMock()
+    with pytest.raises(CallableOnCooldown):
+        await gcra.acquire(1)
+
+    redis.evalsha.assert_not_called()
+
+
+async def test_gcra_refills(gcra):
+    gcra.time_period = 0.1
+    await gcra.acquire(1)
+    await gcra.acquire(1)
+    with pytest.raises(CallableOnCooldown) as e:
+        await gcra.acquire(1)
+
+    await asyncio.sleep(e.value.retry_after + 0.01)
+    await gcra.acquire(1)
+
+
+async def test_gcra_without_redis(redis, gcra, monkeypatch):
+    monkeypatch.setattr(redis, "evalsha", AsyncMock(side_effect=ConnectionError))
+    gcra.limit = 1
+    await gcra.acquire(1)
+    with pytest.raises(CallableOnCooldown):
+        await gcra.acquire(1)
+
+
+async def test_gcra_reserves_spare_calls(redis, gcra):
+    gcra.limit, gcra.max_reserved = 8, 2
+    await gcra.acquire(1)
+    assert gcra._reserved == {1: 2}
+
+    # Which are used without going to Redis
+    evalsha = redis.evalsha
+    redis.evalsha = AsyncMock()
+    await gcra.acquire(1)
+    await gcra.acquire(1)
+    redis.evalsha.assert_not_called()
+    assert gcra._reserved == {}
+
+    # And count against other clusters
+    redis.evalsha = evalsha
+    other = RedisCooldown(8, 60, gcra._bucket, gcra._func, max_reserved=0)
+    for _ in range(5):
+        await other.acquire(1)
+
+    with pytest.raises(CallableOnCooldown):
+        await other.acquire(1)
+
+
+async def test_gcra_when_redis_is_slow(redis, gcra, monkeypatch):
+    async def evalsha(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(redis, "evalsha", evalsha)
+    gcra.limit = 1
+    gcra.redis_timeout = 0.01
+    await asyncio.wait_for(gcra.acquire(1), 0.1)
+    with pytest.raises(CallableOnCooldown):
+        await gcra.acquire(1)
+
+
+async def test_decorator(redis):
+    calls = []
+
+    @cooldown(1, 60, lambda user_id: user_id)
+    async def command(user_id: int):
+        calls.append(user_id)
+
+    await command(1)
+    await command(2)
+    with pytest.raises(CallableOnCooldown):
+        await command(1)
+
+    assert calls == [1, 2]
+
+
+async def test_sliding_window_limits(sliding_window):
+    await sliding_window.increment("1:1")
+    await sliding_window.increment("1:1")
+    with pytest.raises(CallableOnCooldown) as e:
+        await sliding_window.increment("1:1")
+
+    # Both calls count fully until this window ends, then
+    # until they are less than half of the sliding window
+    assert 0 < e.value.retry_after <= 90
+    await sliding_window.increment("1:2")
+
+
+async def test_sliding_window_counts_previous_window(redis, sliding_window):
+    seconds, microseconds = await redis.time()
+    now = seconds * 1000 + microseconds // 1000
+    current_start = now - now % 60_000
+    # Enough calls last window that any overlap at all keeps us limited
+    await redis.hset(
+        "1:1",
+        mapping={"start": current_start - 60_000, "current": 10**6, "previous": 0},
+    )
+    with pytest.raises(CallableOnCooldown) as e:
+        await sliding_window.increment("1:1")
+
+    assert 0 < e.value.retry_after <= 60
+
+
+async def test_sliding_window_forgets_old_windows(redis, sliding_window):
+    await redis.hset("1:1", mapping={"start": 0, "current": 2, "previous": 2})
+    await sliding_window.increment("1:1")
+    assert await redis.hget("1:1", "previous") == b"0"
+    assert await redis.hget("1:1", "current") == b"1"
+    assert 0 < await redis.pttl("1:1") <= 120_000
@@ -0,0 +1,52 @@
+from unittest.mock import AsyncMock
+
+from suggestions.session_store import ShardSession
+
+
+async def test_save_and_claim(redis, session_store):
+    await session_store.save()
+    assert await redis.exists(session_store.key_for(2)) == 0
+    assert 0 < await redis.ttl(session_store.key_for(0)) <= 180
+
+    assert await session_store.claim(1) == ShardSession(
+        "session 1", 20, "wss://gateway.discord.gg"
+    )
+    # A session is only ever resumed once
+    assert await session_store.claim(1) is None
+    assert await session_store.claim(2) is None
+
+
+async def test_save_specific_shards(redis, session_store):
+    await session_store.save([1, 5])
+    assert await redis.exists(session_store.key_for(0)) == 0
+    assert await redis.exists(session_store.key_for(1)) == 1
+
+
+async def test_claim_without_redis(redis, session_store, monkeypatch):
+    monkeypatch.setattr(redis, "getdel", AsyncMock(side_effect=ConnectionError))
+    assert await session_store.claim(0) is None
+
+
+async def test_close_resumable(redis, session_store):
+    await session_store.close_resumable([0])
+
+    shard = session_store.bot.shards[0]
+    shard._parent._cancel_task.assert_called_once()
+    shard._parent.ws.close.assert_awaited_once_with(code=4000)
+    session_store.bot.shards[1]._parent.ws.close.assert_not_awaited()
+    assert (await session_store.claim(0)).session_id == "session 0"
+
+
+async def test_close_resumable_without_redis(session_store):
+    session_store.save = AsyncMock(side_effect=ConnectionError)
+    await session_store.close_resumable([0])
+    session_store.bot.shards[0]._parent.ws.close.assert_awaited_once_with(code=4000)
+
+
+async def test_resume_tracking(session_store):
+    session_store.attempting_resume(0)
+    session_store.attempting_resume(1)
+
+    await session_store.on_shard_resumed(0)
+    await session_store.on_shard_connect(1)
+    assert not session_store._resuming
@@ -0,0 +1,124 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from suggestions.shard_coordinator import ShardCoordinator
+
+
+async def test_ranges():
+    coordinator = ShardCoordinator(total_shards=25, shards_per_range=10)
+    assert coordinator.ranges == [range(0, 10), range(10, 20), range(20, 25)]
+
+    coordinator.held = {2, 0}
+    assert coordinator.shard_ids == [*range(0, 10), *range(20, 25)]
+
+
+async def test_fair_share(shard_coordinator):
+    assert shard_coordinator.fair_share({"a": 0}) == 4
+    assert shard_coordinator.fair_share({"a": 0, "b": 0}) == 2
+    assert shard_coordinator.fair_share({"a": 0, "b": 0, "c": 0}) == 2
+    assert shard_coordinator.fair_share({"a": 0, "b": 0, "c": 0, "d": 0, "e": 0}) == 1
+
+
+async def test_should_hand_off(shard_coordinator):
+    shard_coordinator.held = {0, 1, 2, 3}
+    # Over our fair share, so the extras all go at once
+    assert shard_coordinator.should_hand_off({"a": 4, "b": 0}) == 2
+
+    # Within our share but two more than someone else
+    shard_coordinator.held = {0, 1}
+    assert shard_coordinator.should_hand_off({"a": 2, "b": 1, "c": 0}) == 1
+    # Only the busiest member gives one up, ties going to the highest id
+    assert shard_coordinator.should_hand_off({"a": 2, "b": 2, "c": 0}) == 0
+
+    # Balanced
+    assert shard_coordinator.should_hand_off({"a": 2, "b": 2}) == 0
+    assert shard_coordinator.should_hand_off({"a": 2, "b": 1, "c": 1}) == 0
+
+
+async def test_should_acquire(shard_coordinator):
+    assert shard_coordinator.should_acquire({"a": 0, "b": 2}) == 2
+    assert shard_coordinator.should_acquire({"a": 0, "b": 4}) == 2
+
+    # Someone has less than us, let them take it
+    shard_coordinator.held = {0}
+    assert shard_coordinator.should_acquire({"a": 1, "b": 0, "c": 3}) == 0
+
+    shard_coordinator.held = {0, 1}
+    assert shard_coordinator.should_acquire({"a": 2, "b": 2}) == 0
+
+
+async def test_leases(redis, shard_coordinator, other_coordinator):
+    assert await shard_coordinator.acquire_free(2) == [0, 1]
+    assert await other_coordinator.acquire_free(4) == [2, 3]
+    assert await redis.get(shard_coordinator.key_for(0)) == b"a"
+
+    # Only the owner can release a lease
+    await other_coordinator.release(0)
+    assert await redis.get(shard_coordinator.key_for(0)) == b"a"
+
+    await shard_coordinator.release(0)
+    assert shard_coordinator.held == {1}
+    assert await redis.get(shard_coordinator.key_for(0)) is None
+
+    await redis.set(shard_coordinator.key_for(1), "b")
+    assert await shard_coordinator.renew() == [1]
+    assert shard_coordinator.held == set()
+
+
+async def test_heartbeat_forgets_dead_members(redis, shard_coordinator):
+    shard_coordinator.held = {0, 1}
+    await redis.hset(shard_coordinator.MEMBERS_KEY, "b", "1:3")
+
+    assert await shard_coordinator.heartbeat() == {"a": 2}
+    assert await redis.hkeys(shard_coordinator.MEMBERS_KEY) == [b"a"]
+
+
+async def test_acquire_initial_takes_one_range_when_alone(redis, shard_coordinator):
+    assert await shard_coordinator.acquire_initial() == list(range(0, 10))
+
+
+async def test_acquire_initial_takes_fair_share(
+    redis, shard_coordinator, other_coordinator
+):
+    await other_coordinator.heartbeat()
+    assert await shard_coordinator.acquire_initial() == list(range(0, 20))
+
+
+async def test_acquire_initial_standby(redis, shard_coordinator, other_coordinator):
+    await other_coordinator.acquire_free(4)
+    assert await shard_coordinator.acquire_initial() == []
+    assert await redis.hget(shard_coordinator.MEMBERS_KEY, "a") is not None
+
+
+async def test_renew_failure_drops_shards_before_leases_expire(shard_coordinator):
+    shard_coordinator.held = {0, 2}
+    shard_coordinator.bot = Mock(drop_shards=AsyncMock())
+    shard_coordinator.renew = AsyncMock(side_effect=ConnectionError)
+
+    with pytest.raises(ConnectionError):
+        await shard_coordinator.rebalance()
+    # Our leases still have plenty of time left
+    shard_coordinator.bot.drop_shards.assert_not_awaited()
+
+    shard_coordinator.last_renewed -= 30
+    with pytest.raises(ConnectionError):
+        await shard_coordinator.rebalance()
+    shard_coordinator.bot.drop_shards.assert_awaited_once_with(
+        [*range(0, 10), *range(20, 30)]
+    )
+    assert shard_coordinator.held == set()
+
+
+async def test_last_renewed(redis, shard_coordinator):
+    shard_coordinator.last_renewed = 0
+    await shard_coordinator.acquire_free(1)
+    first_acquired = shard_coordinator.last_renewed
+    assert first_acquired > 0
+
+    # Our first lease still expires first
+    await shard_coordinator.acquire_free(1)
+    assert shard_coordinator.last_renewed == first_acquired
+
+    await shard_coordinator.renew()
+    assert shard_coordinator.last_renewed > first_acquired
@@ -0,0 +1,134 @@
+import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from suggestions.stats import RollupGranularity, StatsEnum, StatsRollup
+from tests.helpers import STATS_NOW as NOW
+
+
+def written(bulk_write: AsyncMock) -> list:
+    return [request._doc for request in bulk_write.call_args.args[0]]
+
+
+async def test_log_stats_merges_per_member(stats):
+    await stats.log_stats(1, 2, StatsEnum.SUGGEST)
+    await stats.log_stats(1, 2, StatsEnum.SUGGEST, was_success=False)
+    await stats.log_stats(1, 2, StatsEnum.SUGGEST)
+    await stats.log_stats(1, 3, StatsEnum.SUGGEST)
+
+    assert len(stats._pending_member_stats) == 2
+    pending = stats._pending_member_stats[(1, 2, StatsEnum.SUGGEST)]
+    assert pending.completed_at == [NOW, NOW]
+    assert pending.failed_at == [NOW]
+
+
+async def test_flush_member_stats(stats):
+    await stats.log_stats(1, 2, StatsEnum.SUGGEST)
+    await stats.log_stats(1, 2, StatsEnum.APPROVE, was_success=False)
+    await stats.log_stats(3, 2, StatsEnum.SUGGEST)
+    await stats.flush_member_stats()
+
+    assert stats._pending_member_stats == {}
+    member_stats = stats.bot.db.member_stats.bulk_write
+    member_stats.assert_awaited_once()
+    # One update per member, whatever they ran
+    assert written(member_stats) == [
+        {
+            "$push": {
+                "commands.suggest.completed_at": {"$each": [NOW]},
+                "commands.approve.failed_at": {"$each": [NOW]},
+            }
+        },
+        {"$push": {"commands.suggest.completed_at": {"$each": [NOW]}}},
+    ]
+
+    await stats.flush_member_stats()
+    member_stats.assert_awaited_once()
+
+
+async def test_flush_failure_keeps_stats(stats):
+    stats.bot.db.member_stats.bulk_write.side_effect = ConnectionError
+    await stats.log_stats(1, 2, StatsEnum.SUGGEST)
+    await stats.flush_member_stats()
+    stats.bot.db.stats_rollups.bulk_write.assert_not_awaited()
+
+    await stats.log_stats(1, 2, StatsEnum.SUGGEST, was_success=False)
+    await stats.log_stats(5, 2, StatsEnum.SUGGEST)
+    pending = stats._pending_member_stats[(1, 2, StatsEnum.SUGGEST)]
+    assert pending.completed_at == [NOW]
+    assert pending.failed_at == [NOW]
+
+    stats.bot.db.member_stats.bulk_write.side_effect = None
+    await stats.flush_member_stats()
+    assert stats._pending_member_stats == {}
+    assert len(written(stats.bot.db.member_stats.bulk_write)) == 2
+    stats.bot.db.stats_rollups.bulk_write.assert_awaited_once()
+
+
+async def test_flush_failure_is_bounded(stats):
+    stats.member_stats_max_buffered = 2
+    stats.bot.db.member_stats.bulk_write.side_effect = ConnectionError
+    for member_id in range(3):
+        await stats.log_stats(member_id, 2, StatsEnum.SUGGEST)
+
+    await stats.flush_member_stats()
+    assert len(stats._pending_member_stats) == 2
+
+
+async def test_bucket_for():
+    timestamp = datetime.datetime(2024, 5, 1, 12, 30, 15, 10, tzinfo=NOW.tzinfo)
+    assert RollupGranularity.HOUR.bucket_for(timestamp) == datetime.datetime(
+        2024, 5, 1, 12, tzinfo=NOW.tzinfo
+    )
+    assert RollupGranularity.DAY.bucket_for(timestamp) == datetime.datetime(
+        2024, 5, 1, tzinfo=NOW.tzinfo
+    )
+
+
+async def test_flush_increments_rollups(stats):
+    await stats.log_stats(1, 2, StatsEnum.SUGGEST)
+    await stats.log_stats(3, 2, StatsEnum.SUGGEST, was_success=False)
+    stats.state.now = NOW + datetime.timedelta(hours=1)
+    await stats.log_stats(1, 2, StatsEnum.SUGGEST)
+    await stats.flush_member_stats()
+
+    rollups = {
+        (
+            request._filter["granularity"],
+            request._filter["bucket"].hour,
+            "guild_id" if "guild_id" in request._filter else "cluster",
+        ): request._doc["$inc"]
+        for request in stats.bot.db.stats_rollups.bulk_write.call_args.args[0]
+    }
+    assert rollups == {
+        ("hour", 12, "guild_id"): {"count": 2, "failed": 1},
+        ("hour", 12, "cluster"): {"count": 2, "failed": 1},
+        ("hour", 13, "guild_id"): {"count": 1, "failed": 0},
+        ("hour", 13, "cluster"): {"count": 1, "failed": 0},
+        ("day", 0, "guild_id"): {"count": 3, "failed": 1},
+        ("day", 0, "cluster"): {"count": 3, "failed": 1},
+    }
+
+
+async def test_fetch_rollups(stats):
+    day = RollupGranularity.DAY.bucket_for(NOW)
+    stats.bot.db.stats_rollups.find_many = AsyncMock(
+        return_value=[
+            {"bucket": day, "count": 5, "failed": 2},
+            {"bucket": day - datetime.timedelta(days=1), "count": 3},
+        ]
+    )
+    rollups = await stats.fetch_rollups(
+        StatsEnum.SUGGEST, start=day - datetime.timedelta(days=7), end=day, guild_id=2
+    )
+    assert rollups == [
+        StatsRollup(day - datetime.timedelta(days=1), 3, 0),
+        StatsRollup(day, 5, 2),
+    ]
+    assert rollups[1].completed == 3
+    query = stats.bot.db.stats_rollups.find_many.call_args.args[0]
+    assert query["stat"] == "suggest" and query["guild_id"] == 2
+
+    with pytest.raises(ValueError):
+        await stats.fetch_rollups(StatsEnum.SUGGEST, start=day, end=day)
@@ -0,0 +1,100 @@
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from suggestions import supervisor
+from suggestions.cluster_registry import CLUSTERS_KEY, ClusterHeartbeat
+from suggestions.supervisor import ClusterWorker
+
+
+async def heartbeat(redis, cluster_id: int, *, age: float) -> None:
+    heartbeat = ClusterHeartbeat(
+        cluster_id=cluster_id,
+        shard_ids=[],
+        guild_count=10,
+        shard_latencies={},
+        loop_lag=0,
+        rss=1024,
+        interactions_per_second=1.5,
+        updated_at=time.time() - age,
+    )
+    await redis.hset(CLUSTERS_KEY, str(cluster_id), heartbeat.as_json())
+
+
+async def test_backoff_for(cluster_supervisor):
+    worker = cluster_supervisor.workers[1]
+    assert cluster_supervisor.backoff_for(worker) == 5
+
+    worker.restarts = 3
+    assert cluster_supervisor.backoff_for(worker) == 40
+
+    worker.restarts = 20
+    assert cluster_supervisor.backoff_for(worker) == 300
+
+
+async def test_check_health(redis, cluster_supervisor):
+    await heartbeat(redis, 1, age=1)
+    await heartbeat(redis, 2, age=120)
+    # Another host's cluster which we don't look at
+    await heartbeat(redis, 5, age=120)
+    # Cluster 3 never heartbeated, cluster 4 is still starting
+    cluster_supervisor.workers[4].started_at = time.monotonic()
+
+    await cluster_supervisor.check_health()
+
+    assert sorted(cluster_supervisor.heartbeats) == [1, 2]
+    cluster_supervisor.workers[1].stop.assert_not_awaited()
+    cluster_supervisor.workers[2].stop.assert_awaited_once()
+    cluster_supervisor.workers[3].stop.assert_awaited_once()
+    cluster_supervisor.workers[4].stop.assert_not_awaited()
+
+
+async def test_check_health_ignores_heartbeats_from_before_restart(
+    redis, cluster_supervisor
+):
+    await heartbeat(redis, 1, age=45)
+    cluster_supervisor.workers[1].started_at = time.monotonic() - 40
+
+    await cluster_supervisor.check_health()
+    cluster_supervisor.workers[1].stop.assert_awaited_once()
+
+
+async def test_run_worker_backs_off(monkeypatch, cluster_supervisor):
+    worker = cluster_supervisor.workers[1]
+    worker.process.wait = AsyncMock(return_value=1)
+    starts = []
+
+    async def start():
+        starts.append(worker.restarts)
+        if len(starts) == 3:
+            cluster_supervisor.is_closing = True
+
+    async def sleep_with_condition(seconds, condition, *, interval):
+        sleeps.append(seconds)
+
+    sleeps = []
+    worker.start = AsyncMock(side_effect=start)
+    monkeypatch.setattr(
+        supervisor.commons, "sleep_with_condition", sleep_with_condition
+    )
+    # Exits straight away each time, so never counts as healthy
+    worker.started_at = time.monotonic()
+
+    await cluster_supervisor.run_worker(worker)
+    assert starts == [0, 1, 2]
+    assert sleeps == [5, 10]
+
+
+async def test_worker_killed_when_secrets_fail(monkeypatch):
+    process = Mock(returncode=None, wait=AsyncMock())
+    process.stdin.drain = AsyncMock(side_effect=BrokenPipeError)
+    create = AsyncMock(return_value=process)
+    monkeypatch.setattr(supervisor.asyncio, "create_subprocess_exec", create)
+
+    worker = ClusterWorker(1, b"{}")
+    with pytest.raises(BrokenPipeError):
+        await worker.start()
+
+    process.kill.assert_called_once()
+    assert str(supervisor.WORKER_ENTRYPOINT) in create.call_args.args
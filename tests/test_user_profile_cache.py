@@ -0,0 +1,48 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from suggestions.objects.user_profile import UserProfile
+from suggestions.user_profile_cache import UserProfileCache
+
+
+def generate_user(user_id: int) -> Mock:
+    user = Mock()
+    user.id = user_id
+    user.global_name = f"User {user_id}"
+    user.avatar.url = f"https://cdn.discordapp.com/avatars/{user_id}.png"
+    user.dm_channel = None
+    return user
+
+
+async def test_concurrent_fetches_are_collapsed():
+    bot = Mock()
+
+    async def fetch_user(user_id: int):
+        await asyncio.sleep(0.01)
+        return generate_user(user_id)
+
+    bot.fetch_user = AsyncMock(side_effect=fetch_user)
+    cache = UserProfileCache(bot)
+
+    profiles = await asyncio.gather(*[cache.fetch(1) for _ in range(5)])
+    assert bot.fetch_user.call_count == 1
+    assert all(p is profiles[0] for p in profiles)
+    assert profiles[0].display_name == "User 1"
+    assert cache.misses == 1
+    assert cache.hits == 4
+
+    await cache.fetch(1)
+    assert bot.fetch_user.call_count == 1
+
+
+async def test_lru_bound():
+    cache = UserProfileCache(Mock(), max_size=2)
+    cache.add(UserProfile(1, "One", "url"))
+    cache.add(UserProfile(2, "Two", "url"))
+    assert 1 in cache
+
+    cache.add(UserProfile(3, "Three", "url"))
+    assert len(cache) == 2
+    assert 1 in cache
+    assert 2 not in cache
+    assert 3 in cache